@@ -0,0 +1,91 @@
+"""Benchmark eager and lazy decoding of a busy event stream.
+
+The simulated consumer routes messages by appliance id and event type and
+only looks at the items of door state messages, like most consumers that
+ignore program progress notifications.
+
+Run with: python -m benchmarks.event_decoding
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import json
+import timeit
+from typing import Any
+
+from httpx_sse import ServerSentEvent
+
+from aiohomeconnect.model import EventMessage, EventType, LazyEventMessage
+
+APPLIANCES = 20
+REPEAT = 5
+NUMBER = 20
+DOOR_STATE = "BSH.Common.Status.DoorState"
+
+
+def server_sent_events() -> list[ServerSentEvent]:
+    """Return a stream of progress notifications and door state changes."""
+    events = []
+    for index in range(APPLIANCES * 50):
+        ha_id = f"SIEMENS-HCS02DWH1-{index % APPLIANCES:012d}"
+        if index % 10:
+            event_type = EventType.NOTIFY
+            items = [
+                {
+                    "key": "BSH.Common.Option.RemainingProgramTime",
+                    "value": 3600 - index,
+                    "unit": "seconds",
+                },
+                {"key": "BSH.Common.Option.ProgramProgress", "value": index % 100},
+            ]
+        else:
+            event_type = EventType.STATUS
+            items = [{"key": DOOR_STATE, "value": "BSH.Common.EnumType.DoorState.Open"}]
+        data = {
+            "items": [
+                item
+                | {
+                    "timestamp": 1733611453,
+                    "level": "hint",
+                    "handling": "none",
+                    "uri": f"/api/homeappliances/{ha_id}/status",
+                }
+                for item in items
+            ]
+        }
+        events.append(ServerSentEvent(event_type, json.dumps(data), ha_id))
+    return events
+
+
+def consume(
+    events: list[ServerSentEvent], message_cls: type[EventMessage]
+) -> list[Any]:
+    """Decode the events and read the door state values."""
+    values = []
+    for sse in events:
+        event_message = message_cls.from_server_sent_event(sse)
+        if event_message.type is EventType.STATUS:
+            values.extend(event.value for event in event_message.data.items)
+    return values
+
+
+def measure(func: Callable[[], Any]) -> float:
+    """Return the best time per call in milliseconds."""
+    return min(timeit.repeat(func, repeat=REPEAT, number=NUMBER)) / NUMBER * 1000
+
+
+def main() -> None:
+    """Run the benchmark."""
+    events = server_sent_events()
+    eager_ms = measure(lambda: consume(events, EventMessage))
+    lazy_ms = measure(lambda: consume(events, LazyEventMessage))
+    print(f"{len(events)} events from {APPLIANCES} appliances")
+    print(
+        f"eager {eager_ms:.3f} ms, lazy {lazy_ms:.3f} ms, "
+        f"speedup {eager_ms / lazy_ms:.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark the memory used by a long history of decoded events.
+
+Compare the previous Event, a dataclass with an instance dict and its own
+copy of every string, with the slotted Event that interns repeated strings.
+
+Run with: python -m benchmarks.event_memory [number of events]
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import gc
+import json
+import sys
+import tracemalloc
+from typing import Any
+
+from mashumaro import field_options
+from mashumaro.mixins.json import DataClassJSONMixin
+
+from aiohomeconnect.model import Event, EventKey
+
+EVENTS = 1_000_000
+KEYS = (
+    "BSH.Common.Option.RemainingProgramTime",
+    "BSH.Common.Option.ProgramProgress",
+    "BSH.Common.Status.DoorState",
+    "BSH.Common.Status.OperationState",
+)
+
+
+@dataclass
+class PreviousEvent(DataClassJSONMixin):
+    """Represent Event like the previous implementation."""
+
+    key: EventKey
+    raw_key: str = field(metadata=field_options(alias="key"))
+    timestamp: int
+    level: str
+    handling: str
+    value: str | int | float | bool | None
+    name: str | None = None
+    uri: str | None = None
+    display_value: str | None = field(
+        default=None, metadata=field_options(alias="displayvalue")
+    )
+    unit: str | None = None
+
+
+def raw_events(count: int) -> list[str]:
+    """Return the raw JSON of the event items."""
+    return [
+        json.dumps(
+            {
+                "key": KEYS[index % len(KEYS)],
+                "value": index % 100,
+                "timestamp": 1733611453 + index,
+                "level": "hint",
+                "handling": "none",
+            }
+        )
+        for index in range(count)
+    ]
+
+
+def measure(model: Any, raw: list[str]) -> float:
+    """Return the megabytes allocated by decoding the events into the model."""
+    gc.collect()
+    tracemalloc.start()
+    events = [model.from_dict(json.loads(item)) for item in raw]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del events
+    return size / 1024 / 1024
+
+
+def main() -> None:
+    """Run the benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else EVENTS
+    raw = raw_events(count)
+    previous_mb = measure(PreviousEvent, raw)
+    slotted_mb = measure(Event, raw)
+    print(f"{count} events")
+    print(
+        f"previous {previous_mb:.1f} MiB, slotted {slotted_mb:.1f} MiB, "
+        f"saved {1 - slotted_mb / previous_mb:.0%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark decoding of large settings and programs payloads.
+
+Compare the previous pipeline, which parsed the body with the standard
+library through httpx and indexed the envelope, with the single-parse
+pipeline using the active JSON backend.
+
+Run with: python -m benchmarks.json_pipeline
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import json
+import timeit
+from typing import Any
+
+from httpx import Response
+
+from aiohomeconnect.json_backend import get_json_backend, json_loads
+from aiohomeconnect.model import ArrayOfPrograms, ArrayOfSettings
+
+ITEMS = 500
+REPEAT = 5
+NUMBER = 20
+
+
+def settings_payload(items: int = ITEMS) -> dict[str, Any]:
+    """Return a large ArrayOfSettings envelope."""
+    return {
+        "data": {
+            "settings": [
+                {
+                    "key": f"BSH.Common.Setting.Vendor{index}",
+                    "value": index,
+                    "name": f"Setting {index}",
+                    "displayvalue": str(index),
+                    "unit": "°C",
+                    "type": "Int",
+                    "constraints": {
+                        "min": 0,
+                        "max": 100,
+                        "stepsize": 1,
+                        "access": "readWrite",
+                    },
+                }
+                for index in range(items)
+            ]
+        }
+    }
+
+
+def programs_payload(items: int = ITEMS) -> dict[str, Any]:
+    """Return a large ArrayOfPrograms envelope."""
+    return {
+        "data": {
+            "programs": [
+                {
+                    "key": f"Dishcare.Dishwasher.Program.Vendor{index}",
+                    "name": f"Program {index}",
+                    "constraints": {"available": True, "execution": "selectandstart"},
+                }
+                for index in range(items)
+            ]
+        }
+    }
+
+
+def previous_pipeline(response: Response, model: Any) -> Any:
+    """Decode like the previous pipeline did."""
+    return model.from_dict(response.json()["data"])
+
+
+def single_parse_pipeline(response: Response, model: Any) -> Any:
+    """Decode with the single-parse pipeline."""
+    return model.from_dict(json_loads(response.content)["data"])
+
+
+def measure(func: Callable[[], Any]) -> float:
+    """Return the best time per call in milliseconds."""
+    return min(timeit.repeat(func, repeat=REPEAT, number=NUMBER)) / NUMBER * 1000
+
+
+def main() -> None:
+    """Run the benchmark."""
+    print(f"JSON backend: {get_json_backend().name}")
+    for name, payload, model in (
+        ("ArrayOfSettings", settings_payload(), ArrayOfSettings),
+        ("ArrayOfPrograms", programs_payload(), ArrayOfPrograms),
+    ):
+        content = json.dumps(payload).encode()
+
+        def previous(content: bytes = content, model: Any = model) -> Any:
+            """Decode a fresh response with the previous pipeline."""
+            return previous_pipeline(Response(200, content=content), model)
+
+        def single(content: bytes = content, model: Any = model) -> Any:
+            """Decode a fresh response with the single-parse pipeline."""
+            return single_parse_pipeline(Response(200, content=content), model)
+
+        def previous_parse(content: bytes = content) -> Any:
+            """Parse a fresh response body through httpx."""
+            return Response(200, content=content).json()
+
+        def single_parse(content: bytes = content) -> Any:
+            """Parse a fresh response body with the active backend."""
+            return json_loads(Response(200, content=content).content)
+
+        print(f"{name} ({ITEMS} items, {len(content)} bytes)")
+        for stage, previous_func, single_func in (
+            ("parse", previous_parse, single_parse),
+            ("parse and decode", previous, single),
+        ):
+            previous_ms = measure(previous_func)
+            single_ms = measure(single_func)
+            print(
+                f"  {stage}: previous {previous_ms:.3f} ms, "
+                f"single-parse {single_ms:.3f} ms, "
+                f"speedup {previous_ms / single_ms:.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark the per-request overhead of Client with an in-process transport.
+
+The transport answers every request immediately, so the measured time is
+spent in the client, the auth layer and httpx.
+
+Run with: python -m benchmarks.request_overhead
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import time
+from typing import Any
+
+from httpx import AsyncClient, MockTransport, Request, Response
+
+from aiohomeconnect.client import REQUEST_HEADERS, AbstractAuth, Client
+from aiohomeconnect.model import Language, SettingKey
+
+HA_ID = "BOSCH-HCS06COM1-D70390681C2C"
+ITERATIONS = 2000
+ACCESS_TOKEN = "access-token"  # noqa: S105
+STATUS_BODY = (
+    b'{"data":{"status":[{"key":"BSH.Common.Status.DoorState",'
+    b'"value":"BSH.Common.EnumType.DoorState.Closed"}]}}'
+)
+
+
+class BenchmarkAuth(AbstractAuth):
+    """Represent an auth with a static access token."""
+
+    async def async_get_access_token(self) -> str:
+        """Return the access token."""
+        return ACCESS_TOKEN
+
+
+def handler(request: Request) -> Response:
+    """Answer every request with a status payload."""
+    if request.method == "PUT":
+        return Response(204)
+    return Response(
+        200,
+        content=STATUS_BODY,
+        headers={"content-type": "application/vnd.bsh.sdk.v1+json"},
+    )
+
+
+async def measure(func: Callable[[], Awaitable[Any]]) -> float:
+    """Return the mean time per call in microseconds."""
+    for _ in range(ITERATIONS // 10):
+        await func()
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await func()
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    async with AsyncClient(transport=MockTransport(handler)) as httpx_client:
+        auth = BenchmarkAuth(httpx_client, "https://example.com")
+        client = Client(auth)
+        language_headers = {"Accept-Language": Language.EN}
+
+        async def build_headers() -> None:
+            """Build the headers of a request, including the access token call."""
+            await auth._get_headers(language_headers, REQUEST_HEADERS)  # noqa: SLF001
+
+        async def get_status() -> None:
+            """Get the status of an appliance."""
+            await client.get_status(HA_ID)
+
+        async def set_setting() -> None:
+            """Set a setting of an appliance."""
+            await client.set_setting(
+                HA_ID,
+                setting_key=SettingKey.BSH_COMMON_POWER_STATE,
+                value="BSH.Common.EnumType.PowerState.On",
+            )
+
+        for name, func in (
+            ("headers", build_headers),
+            ("Client.get_status", get_status),
+            ("Client.set_setting", set_setting),
+        ):
+            print(f"{name}: {await measure(func):.1f} µs per call")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
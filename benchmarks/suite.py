@@ -0,0 +1,397 @@
+"""Run the benchmark suite of the client hot paths and store the results.
+
+The suite measures the per-request overhead of every Client method against
+an in-process transport, the decode throughput of the large array models
+and the event throughput of stream_all_events over a synthetic event stream.
+
+The results are written as JSON. Given a baseline file from another version,
+the results are compared and the command fails if any result regressed by
+more than the threshold.
+
+Run with: python -m benchmarks.suite [--output FILE] [--baseline FILE]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+import json
+from pathlib import Path
+import platform
+import sys
+import time
+import timeit
+from typing import Any
+
+from httpx import AsyncClient, MockTransport, Request, Response
+
+from aiohomeconnect import __version__
+from aiohomeconnect.client import Client
+from aiohomeconnect.endpoint import endpoint_template
+from aiohomeconnect.json_backend import get_json_backend, json_loads
+from aiohomeconnect.model import (
+    ArrayOfOptions,
+    ArrayOfPrograms,
+    ArrayOfSettings,
+    ArrayOfStatus,
+    CommandKey,
+    EventMessage,
+    Option,
+    OptionKey,
+    ProgramKey,
+    PutCommand,
+    PutCommands,
+    PutSetting,
+    PutSettings,
+    SettingKey,
+    StatusKey,
+)
+
+from .event_decoding import server_sent_events
+from .json_pipeline import programs_payload, settings_payload
+from .request_overhead import BenchmarkAuth
+
+HA_ID = "BOSCH-HCS06COM1-D70390681C2C"
+REQUEST_ITERATIONS = 200
+REQUEST_REPEAT = 5
+DECODE_REPEAT = 5
+DECODE_NUMBER = 10
+ITEMS = 500
+STREAM_REPEAT = 5
+DEFAULT_THRESHOLD = 0.2
+
+APPLIANCE = {
+    "haId": HA_ID,
+    "name": "Dishwasher",
+    "type": "Dishwasher",
+    "brand": "BOSCH",
+    "vib": "HCS06COM1",
+    "enumber": "SMV4HCX48E/11",
+    "connected": True,
+}
+PROGRAM = {
+    "key": ProgramKey.DISHCARE_DISHWASHER_ECO_50,
+    "options": [{"key": OptionKey.DISHCARE_DISHWASHER_HALF_LOAD, "value": False}],
+}
+OPTIONS = {"options": PROGRAM["options"]}
+OPTION = {"key": OptionKey.DISHCARE_DISHWASHER_HALF_LOAD, "value": False}
+PAYLOADS: dict[str, Any] = {
+    "/homeappliances": {"homeappliances": [APPLIANCE]},
+    "/homeappliances/{haId}": APPLIANCE,
+    "/homeappliances/{haId}/programs": {"programs": [PROGRAM]},
+    "/homeappliances/{haId}/programs/available": {"programs": [PROGRAM]},
+    "/homeappliances/{haId}/programs/available/{programKey}": {
+        "key": ProgramKey.DISHCARE_DISHWASHER_ECO_50,
+        "options": [
+            {
+                "key": OptionKey.DISHCARE_DISHWASHER_HALF_LOAD,
+                "type": "Boolean",
+                "constraints": {"default": False},
+            }
+        ],
+    },
+    "/homeappliances/{haId}/programs/active": PROGRAM,
+    "/homeappliances/{haId}/programs/active/options": OPTIONS,
+    "/homeappliances/{haId}/programs/active/options/{optionKey}": OPTION,
+    "/homeappliances/{haId}/programs/selected": PROGRAM,
+    "/homeappliances/{haId}/programs/selected/options": OPTIONS,
+    "/homeappliances/{haId}/programs/selected/options/{optionKey}": OPTION,
+    "/homeappliances/{haId}/images": {
+        "images": [
+            {
+                "key": "Cooking.Oven.Image.Camera",
+                "imagekey": "camera",
+                "timestamp": 1733611453,
+                "quality": "high",
+            }
+        ]
+    },
+    "/homeappliances/{haId}/settings": {
+        "settings": [
+            {
+                "key": SettingKey.BSH_COMMON_POWER_STATE,
+                "value": "BSH.Common.EnumType.PowerState.On",
+            }
+        ]
+    },
+    "/homeappliances/{haId}/settings/{settingKey}": {
+        "key": SettingKey.BSH_COMMON_POWER_STATE,
+        "value": "BSH.Common.EnumType.PowerState.On",
+    },
+    "/homeappliances/{haId}/status": {
+        "status": [
+            {
+                "key": StatusKey.BSH_COMMON_DOOR_STATE,
+                "value": "BSH.Common.EnumType.DoorState.Closed",
+            }
+        ]
+    },
+    "/homeappliances/{haId}/status/{statusKey}": {
+        "key": StatusKey.BSH_COMMON_DOOR_STATE,
+        "value": "BSH.Common.EnumType.DoorState.Closed",
+    },
+    "/homeappliances/{haId}/commands": {
+        "commands": [{"key": CommandKey.BSH_COMMON_PAUSE_PROGRAM}]
+    },
+}
+RESPONSES = {
+    template: json.dumps({"data": data}).encode() for template, data in PAYLOADS.items()
+}
+
+
+def handler(request: Request) -> Response:
+    """Answer a request with the canned response of its endpoint."""
+    if request.method != "GET":
+        return Response(204)
+    template = endpoint_template(request.url.path.removeprefix("/api"))
+    if template == "/homeappliances/{haId}/images/{imageKey}":
+        return Response(200, content=b"\xff\xd8\xff" * 1000)
+    return Response(200, content=RESPONSES[template])
+
+
+def client_methods(client: Client) -> dict[str, Callable[[], Awaitable[Any]]]:
+    """Return a call of each client method with a canned response."""
+    option = Option(OptionKey.DISHCARE_DISHWASHER_HALF_LOAD, value=False)
+    return {
+        "get_home_appliances": client.get_home_appliances,
+        "get_specific_appliance": lambda: client.get_specific_appliance(HA_ID),
+        "get_all_programs": lambda: client.get_all_programs(HA_ID),
+        "get_available_programs": lambda: client.get_available_programs(HA_ID),
+        "get_available_program": lambda: client.get_available_program(
+            HA_ID, program_key=ProgramKey.DISHCARE_DISHWASHER_ECO_50
+        ),
+        "get_active_program": lambda: client.get_active_program(HA_ID),
+        "start_program": lambda: client.start_program(
+            HA_ID, program_key=ProgramKey.DISHCARE_DISHWASHER_ECO_50
+        ),
+        "stop_program": lambda: client.stop_program(HA_ID),
+        "get_active_program_options": lambda: client.get_active_program_options(HA_ID),
+        "set_active_program_options": lambda: client.set_active_program_options(
+            HA_ID, array_of_options=ArrayOfOptions([option])
+        ),
+        "get_active_program_option": lambda: client.get_active_program_option(
+            HA_ID, option_key=option.key
+        ),
+        "set_active_program_option": lambda: client.set_active_program_option(
+            HA_ID, option_key=option.key, value=False
+        ),
+        "get_selected_program": lambda: client.get_selected_program(HA_ID),
+        "set_selected_program": lambda: client.set_selected_program(
+            HA_ID, program_key=ProgramKey.DISHCARE_DISHWASHER_ECO_50
+        ),
+        "get_selected_program_options": lambda: client.get_selected_program_options(
+            HA_ID
+        ),
+        "set_selected_program_options": lambda: client.set_selected_program_options(
+            HA_ID, array_of_options=ArrayOfOptions([option])
+        ),
+        "get_selected_program_option": lambda: client.get_selected_program_option(
+            HA_ID, option_key=option.key
+        ),
+        "set_selected_program_option": lambda: client.set_selected_program_option(
+            HA_ID, option_key=option.key, value=False
+        ),
+        "get_images": lambda: client.get_images(HA_ID),
+        "get_image": lambda: client.get_image(HA_ID, image_key="camera"),
+        "get_settings": lambda: client.get_settings(HA_ID),
+        "set_settings": lambda: client.set_settings(
+            HA_ID,
+            put_settings=PutSettings(
+                [PutSetting(SettingKey.BSH_COMMON_CHILD_LOCK, value=False)]
+            ),
+        ),
+        "get_setting": lambda: client.get_setting(
+            HA_ID, setting_key=SettingKey.BSH_COMMON_POWER_STATE
+        ),
+        "set_setting": lambda: client.set_setting(
+            HA_ID, setting_key=SettingKey.BSH_COMMON_CHILD_LOCK, value=False
+        ),
+        "get_status": lambda: client.get_status(HA_ID),
+        "get_status_value": lambda: client.get_status_value(
+            HA_ID, status_key=StatusKey.BSH_COMMON_DOOR_STATE
+        ),
+        "get_available_commands": lambda: client.get_available_commands(HA_ID),
+        "put_commands": lambda: client.put_commands(
+            HA_ID,
+            put_commands=PutCommands(
+                [PutCommand(CommandKey.BSH_COMMON_PAUSE_PROGRAM, value=True)]
+            ),
+        ),
+        "put_command": lambda: client.put_command(
+            HA_ID, command_key=CommandKey.BSH_COMMON_PAUSE_PROGRAM, value=True
+        ),
+    }
+
+
+async def measure_requests() -> dict[str, float]:
+    """Return the best microseconds per call of each client method.
+
+    The methods are timed in turns for several repeats, so a slow moment of
+    the machine does not hit one method in every repeat.
+    """
+    results: dict[str, float] = {}
+    async with AsyncClient(transport=MockTransport(handler)) as httpx_client:
+        client = Client(BenchmarkAuth(httpx_client, "https://example.com"))
+        methods = client_methods(client)
+        for func in methods.values():
+            for _ in range(REQUEST_ITERATIONS // 10):
+                await func()
+        for _ in range(REQUEST_REPEAT):
+            for name, func in methods.items():
+                start = time.perf_counter()
+                for _ in range(REQUEST_ITERATIONS):
+                    await func()
+                elapsed = time.perf_counter() - start
+                results[name] = min(
+                    results.get(name, float("inf")),
+                    elapsed / REQUEST_ITERATIONS * 1e6,
+                )
+    return results
+
+
+def status_payload(items: int = ITEMS) -> dict[str, Any]:
+    """Return a large ArrayOfStatus envelope."""
+    return {
+        "data": {
+            "status": [
+                {
+                    "key": f"BSH.Common.Status.Vendor{index}",
+                    "value": f"BSH.Common.EnumType.Vendor.Value{index}",
+                    "name": f"Status {index}",
+                    "displayvalue": str(index),
+                }
+                for index in range(items)
+            ]
+        }
+    }
+
+
+def measure_decoding() -> dict[str, float]:
+    """Return the decoded items per second of the large array models."""
+    results = {}
+    for model, payload, field_name in (
+        (ArrayOfSettings, settings_payload(), "settings"),
+        (ArrayOfStatus, status_payload(), "status"),
+        (ArrayOfPrograms, programs_payload(), "programs"),
+    ):
+        content = json.dumps(payload).encode()
+
+        def decode(content: bytes = content, model: Any = model) -> Any:
+            """Parse and decode the response body."""
+            return model.from_dict(json_loads(content)["data"])
+
+        best = min(timeit.repeat(decode, repeat=DECODE_REPEAT, number=DECODE_NUMBER))
+        items = len(payload["data"][field_name]) * DECODE_NUMBER
+        results[model.__name__] = items / best
+    return results
+
+
+def event_stream_content() -> bytes:
+    """Return the bytes of a synthetic event stream."""
+    return b"".join(
+        f"data: {sse.data}\nevent: {sse.event}\nid: {sse.id}\n\n".encode()
+        for sse in server_sent_events()
+    )
+
+
+async def measure_events() -> dict[str, float]:
+    """Return the events per second through the stream and the decoder."""
+    events = server_sent_events()
+    content = event_stream_content()
+
+    def stream_handler(_: Request) -> Response:
+        """Answer with the synthetic event stream."""
+        return Response(
+            200, headers={"content-type": "text/event-stream"}, content=content
+        )
+
+    def decode() -> None:
+        """Decode every server sent event."""
+        for sse in events:
+            EventMessage.from_server_sent_event(sse)
+
+    best_stream = float("inf")
+    async with AsyncClient(transport=MockTransport(stream_handler)) as httpx_client:
+        client = Client(BenchmarkAuth(httpx_client, "https://example.com"))
+        for _ in range(STREAM_REPEAT):
+            start = time.perf_counter()
+            async for _event_message in client.stream_all_events():
+                pass
+            best_stream = min(best_stream, time.perf_counter() - start)
+    best_decode = min(timeit.repeat(decode, repeat=STREAM_REPEAT, number=1))
+    return {
+        "stream_all_events": len(events) / best_stream,
+        "EventMessage.from_server_sent_event": len(events) / best_decode,
+    }
+
+
+async def run_suite() -> dict[str, Any]:
+    """Run the suite and return the results document."""
+    results: dict[str, dict[str, Any]] = {}
+    for name, value in (await measure_requests()).items():
+        results[f"request.{name}"] = {"value": value, "unit": "us/call"}
+    for name, value in measure_decoding().items():
+        results[f"decode.{name}"] = {"value": value, "unit": "items/s"}
+    for name, value in (await measure_events()).items():
+        results[f"events.{name}"] = {"value": value, "unit": "events/s"}
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "json_backend": get_json_backend().name,
+        "created": datetime.now(UTC).isoformat(),
+        "results": results,
+    }
+
+
+def compare(
+    document: dict[str, Any], baseline: dict[str, Any], threshold: float
+) -> list[str]:
+    """Print the change of each result and return the regressed names.
+
+    Lower is better for times per call and higher is better for rates.
+    """
+    regressions = []
+    print(f"Compared with {baseline['version']}:")
+    for name, result in document["results"].items():
+        if (previous := baseline["results"].get(name)) is None:
+            continue
+        change = result["value"] / previous["value"] - 1
+        if result["unit"].endswith("/call"):
+            change = -change
+        print(f"  {name}: {change:+.1%}")
+        if change < -threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> None:
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, help="write the results to a file")
+    parser.add_argument(
+        "--baseline", type=Path, help="compare with the results of a previous run"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="the relative slowdown that counts as a regression",
+    )
+    args = parser.parse_args()
+
+    document = asyncio.run(run_suite())
+    for name, result in document["results"].items():
+        print(f"{name}: {result['value']:,.1f} {result['unit']}")
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2) + "\n")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if regressions := compare(document, baseline, args.threshold):
+            print(f"Regressed: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Provide a broker that fans out one event stream to many subscribers."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator
+from contextlib import suppress
+from enum import StrEnum
+from types import TracebackType
+from typing import Self
+
+from .const import LOGGER
+from .event_filter import EventFilter
+from .model import EventMessage
+from .model.error import HomeConnectError, SlowConsumerError
+
+
+class SlowConsumerPolicy(StrEnum):
+    """Represent what to do when the queue of a subscriber is full."""
+
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    DISCONNECT = "disconnect"
+
+
+class Subscription:
+    """Represent a subscriber of an event broker with a bounded queue.
+
+    Iterate the subscription to receive the messages. The iteration ends
+    when the subscription is closed, or raises the error that closed it.
+    """
+
+    def __init__(
+        self,
+        broker: EventBroker,
+        event_filter: EventFilter | None,
+        maxsize: int,
+        policy: SlowConsumerPolicy,
+    ) -> None:
+        """Initialize the subscription."""
+        self._broker = broker
+        self.event_filter = event_filter
+        self.policy = policy
+        self.dropped = 0
+        self.closed = False
+        self._error: HomeConnectError | None = None
+        # One extra slot is reserved for the end of stream marker.
+        self._maxsize = maxsize
+        self._queue: asyncio.Queue[EventMessage | None] = asyncio.Queue(maxsize + 1)
+
+    def __aiter__(self) -> AsyncIterator[EventMessage]:
+        """Return the iterator of the messages."""
+        return self
+
+    async def __anext__(self) -> EventMessage:
+        """Return the next message."""
+        if (event_message := await self._queue.get()) is None:
+            # Keep the marker for later calls.
+            self._queue.put_nowait(None)
+            if self._error is not None:
+                raise self._error
+            raise StopAsyncIteration
+        return event_message
+
+    async def __aenter__(self) -> Self:
+        """Enter the subscription context."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the subscription."""
+        self.close()
+
+    def offer(self, event_message: EventMessage) -> None:
+        """Queue a message if it passes the filter of the subscription."""
+        if self.closed:
+            return
+        if self.event_filter is not None:
+            if (filtered := self.event_filter.apply(event_message)) is None:
+                return
+            event_message = filtered
+        if self._queue.qsize() < self._maxsize:
+            self._queue.put_nowait(event_message)
+            return
+        match self.policy:
+            case SlowConsumerPolicy.DROP_OLDEST:
+                self._queue.get_nowait()
+                self._queue.put_nowait(event_message)
+                self.dropped += 1
+            case SlowConsumerPolicy.DROP_NEWEST:
+                self.dropped += 1
+            case SlowConsumerPolicy.DISCONNECT:
+                LOGGER.warning("Disconnecting slow event subscriber")
+                self.close(SlowConsumerError("Subscriber queue is full"))
+
+    def close(self, error: HomeConnectError | None = None) -> None:
+        """Close the subscription.
+
+        Queued messages are still delivered before the iteration ends.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self._error = error
+        self._queue.put_nowait(None)
+        self._broker.unsubscribe(self)
+
+
+class EventBroker:
+    """Fan out the messages of one event stream to many subscribers.
+
+    The source is usually a SupervisedEventStream of a client, so all
+    subscribers share one upstream connection.
+    """
+
+    def __init__(self, source: AsyncIterable[EventMessage]) -> None:
+        """Initialize the broker."""
+        self._source = source
+        self._subscriptions: list[Subscription] = []
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def subscriptions(self) -> tuple[Subscription, ...]:
+        """Return the open subscriptions."""
+        return tuple(self._subscriptions)
+
+    def subscribe(
+        self,
+        event_filter: EventFilter | None = None,
+        *,
+        maxsize: int = 100,
+        policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST,
+    ) -> Subscription:
+        """Add a subscriber with a bounded queue."""
+        subscription = Subscription(self, event_filter, maxsize, policy)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscriber."""
+        with suppress(ValueError):
+            self._subscriptions.remove(subscription)
+
+    def publish(self, event_message: EventMessage) -> None:
+        """Offer a message to all subscribers."""
+        for subscription in self.subscriptions:
+            subscription.offer(event_message)
+
+    def start(self) -> None:
+        """Start consuming the source in a task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop consuming the source and close all subscriptions."""
+        if (task := self._task) is not None:
+            self._task = None
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        for subscription in self.subscriptions:
+            subscription.close()
+
+    async def __aenter__(self) -> Self:
+        """Start the broker."""
+        self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop the broker."""
+        await self.stop()
+
+    async def _run(self) -> None:
+        """Publish the messages of the source.
+
+        Subscriptions are always closed when the source ends. Errors that
+        end the source close them with the error, and errors other than
+        HomeConnectError are wrapped in a HomeConnectError.
+        """
+        error: HomeConnectError | None = None
+        try:
+            async for event_message in self._source:
+                self.publish(event_message)
+        except HomeConnectError as err:
+            LOGGER.warning("Event broker source failed: %s", err)
+            error = err
+        except Exception as err:  # noqa: BLE001
+            LOGGER.exception("Event broker source failed unexpectedly")
+            error = HomeConnectError(f"{type(err).__name__}: {err}")
+            error.__cause__ = err
+        finally:
+            for subscription in self.subscriptions:
+                subscription.close(error)
@@ -0,0 +1,179 @@
+"""Provide fetching the resources of many appliances at once."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any
+
+from .const import LOGGER
+from .model import (
+    ArrayOfAvailablePrograms,
+    ArrayOfCommands,
+    ArrayOfSettings,
+    ArrayOfStatus,
+    HomeAppliance,
+    Language,
+    Program,
+)
+from .model.error import HomeConnectError, NoProgramActiveError, NoProgramSelectedError
+
+if TYPE_CHECKING:
+    from .client import Client
+
+DEFAULT_MAX_CONCURRENCY = 10
+
+
+class BulkResource(StrEnum):
+    """Represent a resource that can be fetched for many appliances."""
+
+    STATUS = "status"
+    SETTINGS = "settings"
+    ACTIVE_PROGRAM = "active_program"
+    SELECTED_PROGRAM = "selected_program"
+    AVAILABLE_PROGRAMS = "available_programs"
+    COMMANDS = "commands"
+
+
+DEFAULT_RESOURCES = (BulkResource.STATUS, BulkResource.SETTINGS)
+
+# An appliance without an active or selected program is not an error.
+NO_PROGRAM_ERRORS = (NoProgramActiveError, NoProgramSelectedError)
+
+
+@dataclass
+class ApplianceResult:
+    """Represent the fetched resources of an appliance.
+
+    A resource that was not requested, failed or has no program is None.
+    The errors are mapped from the resource that failed. Unexpected errors,
+    like a response that cannot be decoded, are wrapped in a
+    HomeConnectError.
+    """
+
+    appliance: HomeAppliance
+    status: ArrayOfStatus | None = None
+    settings: ArrayOfSettings | None = None
+    active_program: Program | None = None
+    selected_program: Program | None = None
+    available_programs: ArrayOfAvailablePrograms | None = None
+    commands: ArrayOfCommands | None = None
+    errors: dict[BulkResource, HomeConnectError] = field(default_factory=dict)
+
+    @property
+    def ha_id(self) -> str:
+        """Return the appliance id."""
+        return self.appliance.ha_id
+
+
+@dataclass
+class BulkResult:
+    """Represent the results of fetching the resources of many appliances.
+
+    Disconnected appliances are skipped without making any request.
+    """
+
+    appliances: dict[str, ApplianceResult] = field(default_factory=dict)
+    skipped: list[HomeAppliance] = field(default_factory=list)
+
+    @property
+    def errors(self) -> dict[str, dict[BulkResource, HomeConnectError]]:
+        """Return the errors of the appliances with failed resources."""
+        return {
+            ha_id: result.errors
+            for ha_id, result in self.appliances.items()
+            if result.errors
+        }
+
+
+async def fetch_appliances(
+    client: Client,
+    appliances: Iterable[HomeAppliance] | None = None,
+    resources: Iterable[BulkResource] = DEFAULT_RESOURCES,
+    *,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    accept_language: Language | None = Language.EN,
+) -> BulkResult:
+    """Fetch resources of many appliances with bounded concurrency.
+
+    All paired appliances are fetched if no appliances are given. At most
+    max_concurrency requests are in flight and a failed request only marks
+    its resource as failed instead of failing the whole batch.
+    """
+    if appliances is None:
+        appliances = (await client.get_home_appliances()).homeappliances
+    resources = tuple(dict.fromkeys(resources))
+    semaphore = asyncio.Semaphore(max_concurrency)
+    result = BulkResult()
+    fetches = []
+    for appliance in appliances:
+        if not appliance.connected:
+            result.skipped.append(appliance)
+            continue
+        appliance_result = result.appliances[appliance.ha_id] = ApplianceResult(
+            appliance
+        )
+        fetches.extend(
+            _fetch_resource(
+                semaphore,
+                appliance_result,
+                resource,
+                _get_fetcher(client, resource),
+                accept_language,
+            )
+            for resource in resources
+        )
+    await asyncio.gather(*fetches)
+    return result
+
+
+def _get_fetcher(
+    client: Client, resource: BulkResource
+) -> Callable[..., Awaitable[Any]]:
+    """Return the client method that fetches a resource."""
+    match resource:
+        case BulkResource.STATUS:
+            return client.get_status
+        case BulkResource.SETTINGS:
+            return client.get_settings
+        case BulkResource.ACTIVE_PROGRAM:
+            return client.get_active_program
+        case BulkResource.SELECTED_PROGRAM:
+            return client.get_selected_program
+        case BulkResource.AVAILABLE_PROGRAMS:
+            return client.get_available_programs
+        case BulkResource.COMMANDS:
+            return client.get_available_commands
+
+
+async def _fetch_resource(
+    semaphore: asyncio.Semaphore,
+    appliance_result: ApplianceResult,
+    resource: BulkResource,
+    fetcher: Callable[..., Awaitable[Any]],
+    accept_language: Language | None,
+) -> None:
+    """Fetch a resource of an appliance and store the value or the error."""
+    async with semaphore:
+        try:
+            value = await fetcher(
+                appliance_result.ha_id, accept_language=accept_language
+            )
+        except NO_PROGRAM_ERRORS:
+            return
+        except HomeConnectError as err:
+            appliance_result.errors[resource] = err
+            return
+        except Exception as err:  # noqa: BLE001
+            LOGGER.exception(
+                "Unexpected error fetching the %s of %s",
+                resource,
+                appliance_result.ha_id,
+            )
+            error = HomeConnectError(f"{type(err).__name__}: {err}")
+            error.__cause__ = err
+            appliance_result.errors[resource] = error
+            return
+    setattr(appliance_result, resource.value, value)
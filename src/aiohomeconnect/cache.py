@@ -0,0 +1,228 @@
+"""Provide a response cache for slow changing Home Connect API endpoints."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+import time
+from typing import Any
+
+from httpx_sse import ServerSentEvent
+
+from .endpoint import get_ha_id
+from .event_filter import EventFilter
+from .model import EventKey, EventMessage, EventType, Language
+
+HOME_APPLIANCES = "/homeappliances"
+ALL_PROGRAMS = "/homeappliances/{haId}/programs"
+AVAILABLE_PROGRAM = "/homeappliances/{haId}/programs/available/{programKey}"
+AVAILABLE_COMMANDS = "/homeappliances/{haId}/commands"
+IMAGES = "/homeappliances/{haId}/images"
+
+DEFAULT_TTLS: Mapping[str, float] = {
+    HOME_APPLIANCES: 300,
+    ALL_PROGRAMS: 3600,
+    AVAILABLE_PROGRAM: 86400,
+    AVAILABLE_COMMANDS: 3600,
+    IMAGES: 60,
+}
+
+# Endpoints of an appliance that are invalidated when an event key is received.
+EVENT_KEY_INVALIDATIONS: Mapping[EventKey, frozenset[str]] = {
+    EventKey.BSH_COMMON_ROOT_ACTIVE_PROGRAM: frozenset({ALL_PROGRAMS}),
+    EventKey.BSH_COMMON_ROOT_SELECTED_PROGRAM: frozenset({ALL_PROGRAMS}),
+    EventKey.BSH_COMMON_STATUS_OPERATION_STATE: frozenset({AVAILABLE_COMMANDS}),
+}
+CONNECTION_EVENT_TYPES = frozenset(
+    {EventType.CONNECTED, EventType.DISCONNECTED, EventType.PAIRED, EventType.DEPAIRED}
+)
+INVALIDATION_EVENT_FILTER = EventFilter(event_keys=frozenset(EVENT_KEY_INVALIDATIONS))
+
+
+@dataclass
+class CacheStats:
+    """Represent the hit and miss counters of a cache."""
+
+    hits: Counter[str] = field(default_factory=Counter)
+    misses: Counter[str] = field(default_factory=Counter)
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def total_hits(self) -> int:
+        """Return the number of hits of all endpoints."""
+        return self.hits.total()
+
+    @property
+    def total_misses(self) -> int:
+        """Return the number of misses of all endpoints."""
+        return self.misses.total()
+
+
+class ResponseCache(ABC):
+    """Represent a cache of decoded responses.
+
+    Entries are keyed by path and language and belong to the endpoint
+    template of the path, e.g. /homeappliances/{haId}/programs.
+
+    The generation is increased by every invalidation. A value fetched
+    before an invalidation is stale, so set discards it if the generation
+    read before the fetch is given and no longer current.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self.stats = CacheStats()
+        self.generation = 0
+
+    @abstractmethod
+    def get(self, endpoint: str, path: str, language: Language | None) -> Any | None:
+        """Return the cached value or None."""
+
+    @abstractmethod
+    def set(
+        self,
+        endpoint: str,
+        path: str,
+        language: Language | None,
+        value: Any,
+        *,
+        generation: int | None = None,
+    ) -> None:
+        """Store a value if the endpoint is cacheable and the value is fresh."""
+
+    @abstractmethod
+    def invalidate(
+        self,
+        *,
+        ha_id: str | None = None,
+        endpoints: frozenset[str] | None = None,
+    ) -> None:
+        """Remove the entries of an appliance and/or endpoints.
+
+        Without arguments all entries are removed. The generation must be
+        increased.
+        """
+
+    def wants_server_sent_event(self, sse: ServerSentEvent) -> bool:
+        """Return True if a server sent event may invalidate entries."""
+        return (
+            sse.event in CONNECTION_EVENT_TYPES
+            or INVALIDATION_EVENT_FILTER.matches_server_sent_event(sse)
+        )
+
+    def handle_event(self, event_message: EventMessage) -> None:
+        """Invalidate the entries made stale by an event."""
+        ha_id = event_message.ha_id
+        match event_message.type:
+            case EventType.PAIRED | EventType.DEPAIRED:
+                self.invalidate(endpoints=frozenset({HOME_APPLIANCES}))
+                self.invalidate(ha_id=ha_id)
+            case EventType.CONNECTED | EventType.DISCONNECTED:
+                self.invalidate(endpoints=frozenset({HOME_APPLIANCES}))
+                self.invalidate(
+                    ha_id=ha_id, endpoints=frozenset({ALL_PROGRAMS, AVAILABLE_COMMANDS})
+                )
+            case _:
+                for event in event_message.data.items:
+                    if endpoints := EVENT_KEY_INVALIDATIONS.get(event.key):
+                        self.invalidate(ha_id=ha_id, endpoints=endpoints)
+
+
+@dataclass
+class _CacheEntry:
+    """Represent a cached value."""
+
+    endpoint: str
+    ha_id: str | None
+    expires_at: float
+    value: Any
+
+
+class TTLResponseCache(ResponseCache):
+    """Cache responses per endpoint for a time to live with LRU eviction.
+
+    Only endpoints with a time to live are cached.
+    """
+
+    def __init__(
+        self,
+        ttls: Mapping[str, float] = DEFAULT_TTLS,
+        *,
+        max_size: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the cache."""
+        super().__init__()
+        self.ttls = ttls
+        self.max_size = max_size
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, Language | None], _CacheEntry] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return len(self._entries)
+
+    def get(self, endpoint: str, path: str, language: Language | None) -> Any | None:
+        """Return the cached value or None."""
+        if endpoint not in self.ttls:
+            return None
+        key = (path, language)
+        if (entry := self._entries.get(key)) is None:
+            self.stats.misses[endpoint] += 1
+            return None
+        if entry.expires_at <= self._clock():
+            del self._entries[key]
+            self.stats.misses[endpoint] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits[endpoint] += 1
+        return entry.value
+
+    def set(
+        self,
+        endpoint: str,
+        path: str,
+        language: Language | None,
+        value: Any,
+        *,
+        generation: int | None = None,
+    ) -> None:
+        """Store a value if the endpoint is cacheable and the value is fresh."""
+        if (ttl := self.ttls.get(endpoint)) is None:
+            return
+        if generation is not None and generation != self.generation:
+            return
+        key = (path, language)
+        self._entries[key] = _CacheEntry(
+            endpoint, get_ha_id(path), self._clock() + ttl, value
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(
+        self,
+        *,
+        ha_id: str | None = None,
+        endpoints: frozenset[str] | None = None,
+    ) -> None:
+        """Remove the entries of an appliance and/or endpoints.
+
+        Without arguments all entries are removed.
+        """
+        self.generation += 1
+        stale = [
+            key
+            for key, entry in self._entries.items()
+            if (ha_id is None or entry.ha_id == ha_id)
+            and (endpoints is None or entry.endpoint in endpoints)
+        ]
+        for key in stale:
+            del self._entries[key]
+        self.stats.invalidations += len(stale)
@@ -2,10 +2,13 @@
 
 import asyncio
 import logging
+from pathlib import Path
 from typing import Any
 
 from fastapi import FastAPI, HTTPException
+from mashumaro.exceptions import MissingField
 from rich.console import Console
+from rich.table import Table
 import typer
 import uvicorn
 
@@ -15,6 +18,8 @@ from aiohomeconnect.model.error import (
     HomeConnectApiError,
     HomeConnectRequestError,
 )
+from aiohomeconnect.stats import StatsSnapshot
+from aiohomeconnect.stream import SupervisedEventStream
 
 from .client import CLIClient, TokenManager
 
@@ -95,14 +100,46 @@ async def _get_appliances(
 ) -> None:
     """Get the appliances."""
     try:
-        client = CLIClient(client_id, client_secret)
-        console.log(await client.get_home_appliances())
+        async with CLIClient(client_id, client_secret) as client:
+            console.log(await client.get_home_appliances())
     except HomeConnectApiError as e:
         error_console.log(f"{type(e).__name__}: {e}")
     except HomeConnectRequestError as e:
         error_console.log(f"{type(e).__name__}: {e}")
 
 
+@cli.command()
+def get_stats(path: Path) -> None:
+    """Show the request statistics dumped by a long-running client.
+
+    The dump is the JSON of Client.stats_snapshot(), so no request is spent
+    on the statistics. The quota only counts the requests of that client.
+    """
+    try:
+        snapshot = StatsSnapshot.from_json(path.read_bytes())
+    except (OSError, MissingField, ValueError) as e:
+        error_console.log(f"{type(e).__name__}: {e}")
+        return
+
+    table = Table("Endpoint", "Requests", "429", "p50 ms", "p90 ms", "p99 ms", "Max ms")
+    for endpoint, stats in sorted(snapshot.endpoints.items()):
+        table.add_row(
+            endpoint,
+            str(stats.requests),
+            str(stats.too_many_requests),
+            *(
+                f"{latency * 1000:.1f}"
+                for latency in (stats.p50, stats.p90, stats.p99, stats.max)
+            ),
+        )
+    console.print(table)
+    quota = snapshot.quota
+    console.print(
+        f"Daily quota: {quota.used} of {quota.limit} requests used "
+        f"({quota.usage:.1%}), {quota.remaining} remaining"
+    )
+
+
 @cli.command()
 def get_operation_state(client_id: str, client_secret: str, ha_id: str) -> None:
     """Get the operation state of the device."""
@@ -112,12 +149,12 @@ def get_operation_state(client_id: str, client_secret: str, ha_id: str) -> None:
 async def _get_operation_state(client_id: str, client_secret: str, ha_id: str) -> None:
     """Get the operation state of the device."""
     try:
-        client = CLIClient(client_id, client_secret)
-        console.log(
-            await client.get_status_value(
-                ha_id, status_key=StatusKey.BSH_COMMON_OPERATION_STATE
+        async with CLIClient(client_id, client_secret) as client:
+            console.log(
+                await client.get_status_value(
+                    ha_id, status_key=StatusKey.BSH_COMMON_OPERATION_STATE
+                )
             )
-        )
     except HomeConnectApiError as e:
         error_console.log(f"{type(e).__name__}: {e}")
     except HomeConnectRequestError as e:
@@ -163,10 +200,10 @@ async def _set_selected_program_option(
 ) -> None:
     """Set an option of a program on an appliance."""
     try:
-        client = CLIClient(client_id, client_secret)
-        await client.set_selected_program_option(
-            ha_id, option_key=option_key, value=value
-        )
+        async with CLIClient(client_id, client_secret) as client:
+            await client.set_selected_program_option(
+                ha_id, option_key=option_key, value=value
+            )
     except HomeConnectApiError as e:
         error_console.log(f"{type(e).__name__}: {e}")
     except HomeConnectRequestError as e:
@@ -181,19 +218,12 @@ def subscribe_all_appliances_events(client_id: str, client_secret: str) -> None:
 
 async def _subscribe_all_appliances_events(client_id: str, client_secret: str) -> None:
     """Subscribe and print events from all the appliances."""
-    client = CLIClient(client_id, client_secret)
-    while True:
+    async with CLIClient(client_id, client_secret) as client:
         try:
-            async for event in client.stream_all_events():
+            async for event in SupervisedEventStream(client):
                 console.log(event)
-        except EventStreamInterruptedError as e:
-            warning_console.log(f"{type(e).__name__}: {e} continuing...")
         except HomeConnectApiError as e:
             error_console.log(f"{type(e).__name__}: {e}")
-            break
-        except HomeConnectRequestError as e:
-            error_console.log(f"{type(e).__name__}: {e}")
-            break
 
 
 @cli.command()
@@ -206,19 +236,19 @@ async def _subscribe_appliance_events(
     client_id: str, client_secret: str, ha_id: str
 ) -> None:
     """Subscribe and print events from one appliance."""
-    client = CLIClient(client_id, client_secret)
-    while True:
-        try:
-            async for event in client.stream_events(ha_id):
-                console.log(event)
-        except EventStreamInterruptedError as e:
-            warning_console.log(f"{type(e).__name__}: {e} continuing...")
-        except HomeConnectApiError as e:
-            error_console.log(f"{type(e).__name__}: {e}")
-            break
-        except HomeConnectRequestError as e:
-            error_console.log(f"{type(e).__name__}: {e}")
-            break
+    async with CLIClient(client_id, client_secret) as client:
+        while True:
+            try:
+                async for event in client.stream_events(ha_id):
+                    console.log(event)
+            except EventStreamInterruptedError as e:
+                warning_console.log(f"{type(e).__name__}: {e} continuing...")
+            except HomeConnectApiError as e:
+                error_console.log(f"{type(e).__name__}: {e}")
+                break
+            except HomeConnectRequestError as e:
+                error_console.log(f"{type(e).__name__}: {e}")
+                break
 
 
 if __name__ == "__main__":
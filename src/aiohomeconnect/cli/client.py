@@ -7,16 +7,22 @@ import contextlib
 import json
 from pathlib import Path
 import time
-from typing import Any
+from types import TracebackType
+from typing import Any, Self
 
 from authlib.integrations.httpx_client import AsyncOAuth2Client
 from httpx import AsyncClient
 
 from aiohomeconnect.client import AbstractAuth, Client
-from aiohomeconnect.const import API_ENDPOINT, OAUTH2_AUTHORIZE, OAUTH2_TOKEN
+from aiohomeconnect.connection import ConnectionConfig, create_httpx_client
+from aiohomeconnect.const import API_ENDPOINT, LOGGER, OAUTH2_AUTHORIZE, OAUTH2_TOKEN
 
 TOKEN_FILE = "token.json"  # noqa: S105
 TOKEN_EXPIRES_MARGIN = 20
+TOKEN_REFRESH_AHEAD = 300
+# Wait before retrying a failed background refresh, doubled per failure.
+TOKEN_REFRESH_BACKOFF = 10
+TOKEN_REFRESH_MAX_BACKOFF = 300
 
 
 class CLIClient(Client):
@@ -28,20 +34,38 @@ class CLIClient(Client):
         client_secret: str,
         redirect_uri: str | None = None,
         scope: str | None = None,
+        connection_config: ConnectionConfig | None = None,
     ) -> None:
         """Initialize the client."""
-        super().__init__(
-            Auth(
-                AsyncClient(),
-                API_ENDPOINT,
-                TokenManager(
-                    client_id=client_id,
-                    client_secret=client_secret,
-                    redirect_uri=redirect_uri,
-                    scope=scope,
-                ),
+        self.auth = Auth(
+            create_httpx_client(connection_config),
+            API_ENDPOINT,
+            TokenManager(
+                client_id=client_id,
+                client_secret=client_secret,
+                redirect_uri=redirect_uri,
+                scope=scope,
             ),
         )
+        super().__init__(self.auth)
+
+    async def aclose(self) -> None:
+        """Stop the background token refresh and close the connections."""
+        await self.auth.aclose()
+        await self.auth.client.aclose()
+
+    async def __aenter__(self) -> Self:
+        """Return the client."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the client."""
+        await self.aclose()
 
 
 class Auth(AbstractAuth):
@@ -56,21 +80,68 @@ class Auth(AbstractAuth):
         """Initialize the auth."""
         super().__init__(httpx_client, host)
         self.token_manager = token_manager
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._refresh_failures = 0
 
     async def async_get_access_token(self) -> str:
-        """Return a valid access token."""
+        """Return a valid access token.
+
+        The token is refreshed in the background before it expires,
+        so a refresh on the request path is only needed if that failed.
+        """
         if self.token_manager.access_token is None:
             await self.token_manager.load_access_token()
         if self.token_manager.access_token is None:
             raise ValueError("No access token available")
-        if self.token_manager.is_token_valid():
-            return self.token_manager.access_token
-
-        await self.token_manager.refresh_access_token()
-        await self.token_manager.save_access_token()
+        if not self.token_manager.is_token_valid():
+            await self._refresh_access_token(TOKEN_EXPIRES_MARGIN)
+        self._schedule_refresh()
 
         return self.token_manager.access_token
 
+    async def _refresh_access_token(self, margin: float) -> None:
+        """Refresh and save the access token unless valid for margin seconds."""
+        async with self._refresh_lock:
+            if self.token_manager.is_token_valid(margin):
+                return
+            await self.token_manager.refresh_access_token()
+            await self.token_manager.save_access_token()
+
+    async def aclose(self) -> None:
+        """Cancel the background token refresh."""
+        if (task := self._refresh_task) is not None:
+            self._refresh_task = None
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    def _schedule_refresh(self) -> None:
+        """Schedule a background refresh ahead of the token expiry."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(self._refresh_ahead())
+
+    async def _refresh_ahead(self) -> None:
+        """Refresh the access token ahead of its expiry.
+
+        After a failed refresh, the next one waits for a backoff that is
+        doubled per failure, so requests do not retry it immediately.
+        """
+        margin = min(TOKEN_REFRESH_AHEAD, self.token_manager.expires_in / 2)
+        delay = self.token_manager.expires_at - margin - time.time()
+        if self._refresh_failures:
+            backoff = TOKEN_REFRESH_BACKOFF * 2 ** (self._refresh_failures - 1)
+            delay = max(delay, min(backoff, TOKEN_REFRESH_MAX_BACKOFF))
+        await asyncio.sleep(max(delay, 0))
+        try:
+            await self._refresh_access_token(margin)
+        except Exception:  # noqa: BLE001
+            self._refresh_failures += 1
+            LOGGER.warning("Background access token refresh failed", exc_info=True)
+        else:
+            self._refresh_failures = 0
+
 
 class TokenManager:
     """Manage the tokens for authentication."""
@@ -101,9 +172,19 @@ class TokenManager:
         )
         return uri
 
-    def is_token_valid(self) -> bool:
-        """Check if the token is valid."""
-        return self._token["expires_at"] > time.time() + TOKEN_EXPIRES_MARGIN
+    @property
+    def expires_at(self) -> float:
+        """Return the time when the access token expires."""
+        return self._token["expires_at"]
+
+    @property
+    def expires_in(self) -> float:
+        """Return the lifetime of the access token in seconds."""
+        return self._token["expires_in"]
+
+    def is_token_valid(self, margin: float = TOKEN_EXPIRES_MARGIN) -> bool:
+        """Check if the token is valid for at least margin seconds."""
+        return self.expires_at > time.time() + margin
 
     async def fetch_access_token(self, code: str) -> dict[str, Any]:
         """Fetch the access token."""
@@ -3,9 +3,20 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from collections.abc import AsyncGenerator, AsyncIterator
-from contextlib import asynccontextmanager
-from typing import Any
+import asyncio
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Mapping,
+)
+from contextlib import AsyncExitStack, aclosing, asynccontextmanager
+from functools import partial
+from os import PathLike
+from pathlib import Path
+import time
+from typing import Any, BinaryIO, NoReturn, cast
 
 from httpx import (
     AsyncClient,
@@ -16,11 +27,19 @@ from httpx import (
     Timeout,
     codes,
 )
-from httpx_sse import EventSource, aconnect_sse
+from httpx_sse import EventSource, ServerSentEvent, aconnect_sse
+from mashumaro.mixins.dict import DataClassDictMixin
 
-from aiohomeconnect.model import EventMessage, EventType
+from aiohomeconnect.model import EventMessage, EventType, LazyEventMessage
 
+from .cache import ResponseCache
+from .connectivity import ConnectivityGate
 from .const import LOGGER
+from .diagnostics import RequestLogger
+from .endpoint import endpoint_template, get_ha_id
+from .event_filter import EventFilter
+from .instrumentation import Instrumentation, RequestRecord
+from .json_backend import json_dumps, json_loads
 from .model import (
     ArrayOfAvailablePrograms,
     ArrayOfCommands,
@@ -54,6 +73,7 @@ from .model.error import (
     EventStreamInterruptedError,
     ForbiddenError,
     HomeConnectApiError,
+    HomeConnectError,
     HomeConnectRequestError,
     InternalServerError,
     NoProgramActiveError,
@@ -68,89 +88,278 @@ from .model.error import (
     UnsupportedMediaTypeError,
     WrongOperationStateError,
 )
-
-
-def _raise_generic_error(response: Response) -> None:
-    """Raise a generic error if the response is an error."""
-    if response.is_error:
-        raise (
-            HomeConnectApiError.from_dict(error)
-            if response.content and (error := response.json().get("error"))
-            else HomeConnectApiError(
-                "unknown",
-                f"Unknown HTTP error (Status code: {response.status_code})",
-            )
+from .program_cache import ApplianceModel, ProgramDefinitionCache
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .single_flight import SingleFlight
+from .stats import ClientStats, StatsSnapshot
+from .write_queue import WriteQueue
+
+SDK_CONTENT_TYPE = "application/vnd.bsh.sdk.v1+json"
+REQUEST_HEADERS = (("accept", SDK_CONTENT_TYPE),)
+REQUEST_BODY_HEADERS = (
+    ("accept", SDK_CONTENT_TYPE),
+    ("content-type", SDK_CONTENT_TYPE),
+)
+IMAGE_CHUNK_SIZE = 64 * 1024
+
+API_ERRORS: dict[int, type[HomeConnectApiError]] = {
+    codes.UNAUTHORIZED: UnauthorizedError,
+    codes.FORBIDDEN: ForbiddenError,
+    codes.NOT_ACCEPTABLE: NotAcceptableError,
+    codes.REQUEST_TIMEOUT: RequestTimeoutError,
+    codes.UNSUPPORTED_MEDIA_TYPE: UnsupportedMediaTypeError,
+    codes.TOO_MANY_REQUESTS: TooManyRequestsError,
+    codes.INTERNAL_SERVER_ERROR: InternalServerError,
+}
+
+
+def _raise_error(
+    response: Response,
+    errors: Mapping[int, type[HomeConnectApiError]] | None = None,
+) -> NoReturn:
+    """Raise the error described by an error response.
+
+    The body is decoded once and the error class is picked from the
+    given errors, falling back to the errors shared by all endpoints.
+    """
+    status_code = response.status_code
+    try:
+        body = json_loads(response.content) if response.content else None
+    except ValueError:
+        body = None
+    if not isinstance(body, dict) or not (error := body.get("error")):
+        raise HomeConnectApiError(
+            "unknown",
+            f"Unknown HTTP error (Status code: {status_code})",
         )
+    error_cls = (errors or {}).get(status_code) or API_ERRORS.get(
+        status_code, HomeConnectApiError
+    )
+    err = error_cls.from_dict(error)
+    if isinstance(err, TooManyRequestsError):
+        retry_after = response.headers.get("Retry-After")
+        err.retry_after = float(retry_after) if retry_after else None
+    raise err
 
 
 class AbstractAuth(ABC):
     """Abstract class to make authenticated requests."""
 
-    def __init__(self, httpx_client: AsyncClient, host: str) -> None:
-        """Initialize the auth."""
+    def __init__(
+        self,
+        httpx_client: AsyncClient,
+        host: str,
+        *,
+        request_logger: RequestLogger | None = None,
+        rate_limiter: RateLimiter | None = None,
+        instrumentation: Instrumentation | None = None,
+        stats: ClientStats | None = None,
+    ) -> None:
+        """Initialize the auth.
+
+        If an instrumentation is given, it is called with measurements of
+        the requests, the access token and the event streams.
+
+        The latency, quota use and rate limiting of the responses are always
+        recorded in the stats, which are created if not given.
+        """
         self.client = httpx_client
         self.host = host
+        self.request_logger = request_logger or RequestLogger()
+        self.rate_limiter = rate_limiter
+        self.instrumentation = instrumentation
+        self.stats = stats or ClientStats()
+        self._access_token: str | None = None
+        self._access_token_flight: SingleFlight[None, str] = SingleFlight()
 
     @abstractmethod
     async def async_get_access_token(self) -> str:
         """Return a valid access token."""
 
-    async def _get_headers(self, headers: dict[str, str] | None) -> dict[str, str]:
-        """Return the headers for the request."""
-        headers = {} if headers is None else dict(headers)
-        headers = {key: val for key, val in headers.items() if val is not None}
+    async def _get_access_token(self) -> str:
+        """Return a valid access token.
+
+        Concurrent callers share a single in-flight call to
+        async_get_access_token, so an expired token is refreshed once.
+        """
+        return await self._access_token_flight.run(None, self._fetch_access_token)
 
-        access_token = await self.async_get_access_token()
-        headers["authorization"] = f"Bearer {access_token}"
-        return headers
+    async def _fetch_access_token(self) -> str:
+        """Return a valid access token and report when it changes."""
+        if (instrumentation := self.instrumentation) is None:
+            return await self.async_get_access_token()
+        start = time.perf_counter()
+        try:
+            access_token = await self.async_get_access_token()
+        except Exception as err:
+            instrumentation.token_refresh(time.perf_counter() - start, err)
+            raise
+        if access_token != self._access_token:
+            self._access_token = access_token
+            instrumentation.token_refresh(time.perf_counter() - start, None)
+        return access_token
+
+    async def _get_headers(
+        self,
+        headers: Mapping[str, str | None] | None,
+        base_headers: tuple[tuple[str, str], ...] = (),
+    ) -> dict[str, str]:
+        """Return the headers for the request.
+
+        Caller headers without a value are left out.
+        """
+        access_token = await self._get_access_token()
+        built = (
+            {key: val for key, val in headers.items() if val is not None}
+            if headers
+            else {}
+        )
+        built.update(base_headers)
+        built["authorization"] = f"Bearer {access_token}"
+        return built
 
     async def request(self, method: str, url: str, **kwargs: Any) -> Response:
         """Make a request.
 
         The url parameter must start with a slash.
         """
-        headers = await self._get_headers(kwargs.pop("headers", None))
-        headers["accept"] = "application/vnd.bsh.sdk.v1+json"
+        if (instrumentation := self.instrumentation) is None:
+            response = await self._send_request(method, url, **kwargs)
+        else:
+            response = await self._send_instrumented_request(
+                instrumentation, method, url, **kwargs
+            )
+
+        self._check_api_error(response)
+        return response
+
+    def _check_api_error(self, response: Response) -> None:
+        """Raise the errors shared by all endpoints.
+
+        The rate limiter is paused for the time the API asks to wait.
+        """
+        if response.status_code in API_ERRORS:
+            try:
+                _raise_error(response)
+            except TooManyRequestsError as err:
+                if self.rate_limiter is not None and err.retry_after:
+                    self.rate_limiter.pause(err.retry_after)
+                raise
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        **kwargs: Any,
+    ) -> AsyncGenerator[Response]:
+        """Make a request and yield the response before its body is read.
+
+        The body of an error response is read and the errors shared by all
+        endpoints are raised. The url parameter must start with a slash.
+        """
+        headers = await self._get_headers(kwargs.pop("headers", None), REQUEST_HEADERS)
+        self.request_logger.log_request(method, url, None)
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(method, url)
+
+        async with AsyncExitStack() as stack:
+            record: RequestRecord | None = None
+            if (instrumentation := self.instrumentation) is not None:
+                record = await stack.enter_async_context(
+                    _measure_request(instrumentation, method, url)
+                )
+            response = await stack.enter_async_context(
+                self._open_stream(method, url, headers, **kwargs)
+            )
+            if record is not None:
+                record.status_code = response.status_code
+                record.request_bytes = len(response.request.content)
+            try:
+                if response.is_error:
+                    await response.aread()
+                    self.request_logger.log_response(response)
+                    self._check_api_error(response)
+                else:
+                    self.request_logger.log_streamed_response(response)
+                yield response
+            finally:
+                if record is not None:
+                    record.response_bytes = response.num_bytes_downloaded
+
+    @asynccontextmanager
+    async def _open_stream(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        **kwargs: Any,
+    ) -> AsyncGenerator[Response]:
+        """Open a streamed response and record it in the stats."""
+        start = time.perf_counter()
+        try:
+            async with self.client.stream(
+                method,
+                f"{self.host}/api{url}",
+                **kwargs,
+                headers=headers,
+                timeout=Timeout(5, read=30),
+            ) as response:
+                self.stats.record(
+                    endpoint_template(url),
+                    response.status_code,
+                    time.perf_counter() - start,
+                )
+                yield response
+        except RequestError as e:
+            raise HomeConnectRequestError(f"{type(e).__name__}: {e}") from e
+
+    async def _send_instrumented_request(
+        self,
+        instrumentation: Instrumentation,
+        method: str,
+        url: str,
+        **kwargs: Any,
+    ) -> Response:
+        """Send a request and pass its measurements to the instrumentation."""
+        async with _measure_request(instrumentation, method, url) as record:
+            response = await self._send_request(method, url, **kwargs)
+            record.status_code = response.status_code
+            record.request_bytes = len(response.request.content)
+            record.response_bytes = len(response.content)
+        return response
+
+    async def _send_request(self, method: str, url: str, **kwargs: Any) -> Response:
+        """Send a request and return the response without checking the status."""
         data = kwargs.pop("data", None)
-        if data is not None:
-            headers["content-type"] = "application/vnd.bsh.sdk.v1+json"
+        headers = await self._get_headers(
+            kwargs.pop("headers", None),
+            REQUEST_HEADERS if data is None else REQUEST_BODY_HEADERS,
+        )
 
-        LOGGER.debug("Request: %s %s | Data: %s", method, url, data)
+        self.request_logger.log_request(method, url, data)
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(method, url)
 
+        start = time.perf_counter()
         try:
             response = await self.client.request(
                 method,
                 f"{self.host}/api{url}",
                 **kwargs,
                 headers=headers,
-                json={"data": data} if data is not None else None,
+                content=json_dumps({"data": data}) if data is not None else None,
                 timeout=Timeout(5, read=30),
             )
         except RequestError as e:
             raise HomeConnectRequestError(f"{type(e).__name__}: {e}") from e
+        self.stats.record(
+            endpoint_template(url), response.status_code, time.perf_counter() - start
+        )
 
-        LOGGER.debug("Response: \n%s", response.text)
-
-        match response.status_code:
-            case codes.UNAUTHORIZED:
-                raise UnauthorizedError.from_dict(response.json()["error"])
-            case codes.FORBIDDEN:
-                raise ForbiddenError.from_dict(response.json()["error"])
-            case codes.NOT_ACCEPTABLE:
-                raise NotAcceptableError.from_dict(response.json()["error"])
-            case codes.REQUEST_TIMEOUT:
-                raise RequestTimeoutError.from_dict(response.json()["error"])
-            case codes.UNSUPPORTED_MEDIA_TYPE:
-                raise UnsupportedMediaTypeError.from_dict(response.json()["error"])
-            case codes.TOO_MANY_REQUESTS:
-                err = TooManyRequestsError.from_dict(response.json()["error"])
-                retry_after = response.headers.get("Retry-After")
-                err.retry_after = float(retry_after) if retry_after else None
-                raise err
-            case codes.INTERNAL_SERVER_ERROR:
-                raise InternalServerError.from_dict(response.json()["error"])
-            case _:
-                return response
+        self.request_logger.log_response(response)
+        return response
 
     @asynccontextmanager
     async def connect_sse(
@@ -161,7 +370,14 @@ class AbstractAuth(ABC):
     ) -> AsyncIterator[EventSource]:
         """Create a SSE connection."""
         headers = await self._get_headers(kwargs.pop("headers", None))
-
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(method, url)
+
+        instrumentation = self.instrumentation
+        connected_at: float | None = None
+        context = None
+        error: BaseException | None = None
+        start = time.perf_counter()
         try:
             async with aconnect_sse(
                 self.client,
@@ -170,19 +386,257 @@ class AbstractAuth(ABC):
                 **kwargs,
                 headers=headers,
             ) as event_source:
+                self.stats.record(
+                    endpoint_template(url),
+                    event_source.response.status_code,
+                    time.perf_counter() - start,
+                )
+                if instrumentation is not None:
+                    context = instrumentation.stream_connect(endpoint_template(url))
+                    connected_at = time.perf_counter()
                 yield event_source
         except (ReadTimeout, RemoteProtocolError) as e:
-            raise EventStreamInterruptedError(f"{type(e).__name__}: {e}") from e
+            error = EventStreamInterruptedError(f"{type(e).__name__}: {e}")
+            raise error from e
         except RequestError as e:
-            raise HomeConnectRequestError(f"{type(e).__name__}: {e}") from e
+            error = HomeConnectRequestError(f"{type(e).__name__}: {e}")
+            raise error from e
+        finally:
+            if instrumentation is not None and connected_at is not None:
+                instrumentation.stream_disconnect(
+                    endpoint_template(url),
+                    time.perf_counter() - connected_at,
+                    error,
+                    context,
+                )
 
 
 class Client:
     """Represent a client for the Home Connect API."""
 
-    def __init__(self, auth: AbstractAuth) -> None:
-        """Initialize the client."""
+    def __init__(
+        self,
+        auth: AbstractAuth,
+        *,
+        retry_policy: RetryPolicy | None = None,
+        coalesce_requests: bool = False,
+        cache: ResponseCache | None = None,
+        program_definition_cache: ProgramDefinitionCache | None = None,
+        connectivity_gate: ConnectivityGate | None = None,
+        serialize_writes: bool = False,
+    ) -> None:
+        """Initialize the client.
+
+        If coalesce_requests is set, concurrent identical GET requests share
+        one round trip and the callers receive the same decoded model instance.
+
+        If a cache is given, responses of cacheable endpoints are served from it
+        and the events received from the event streams invalidate its entries.
+
+        If a program definition cache is given, the definitions of available
+        programs are stored per appliance model and language. The model of an
+        appliance is learned when the appliance is fetched.
+
+        If a connectivity gate is given, requests to appliances known to be
+        disconnected raise ApplianceOfflineError without a round trip. The
+        connection state is learned from fetched appliances and the events
+        received from the event streams.
+
+        If serialize_writes is set, writes to an appliance are sent one at a
+        time in order, and a pending write of a setting or an option is merged
+        with a newer write of the same key. Writes to different appliances
+        are still sent in parallel.
+        """
         self._auth = auth
+        self._retry_policy = retry_policy
+        self.cache = cache
+        self.program_definition_cache = program_definition_cache
+        self.connectivity_gate = connectivity_gate
+        self.write_queue = WriteQueue() if serialize_writes else None
+        self._appliance_models: dict[str, ApplianceModel] = {}
+        self._get_flight: SingleFlight[tuple[str, Language | None], Any] | None = (
+            SingleFlight() if coalesce_requests else None
+        )
+
+    @property
+    def stats(self) -> ClientStats:
+        """Return the request statistics of the auth."""
+        return self._auth.stats
+
+    def stats_snapshot(self) -> StatsSnapshot:
+        """Return the latency per endpoint, quota use and rate limited requests.
+
+        The daily quota is counted over a rolling window of 24 hours, which
+        tells how much room is left before polling has to be throttled.
+        """
+        return self.stats.snapshot()
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        *,
+        accept_language: Language | None = None,
+        data: dict[str, Any] | None = None,
+        errors: Mapping[int, type[HomeConnectApiError]] | None = None,
+    ) -> Response:
+        """Make a request and raise if the response is an error.
+
+        Failed requests are retried according to the retry policy.
+        """
+        if self.connectivity_gate is not None:
+            self.connectivity_gate.check(path)
+        attempt = 0
+        while True:
+            try:
+                response = await self._auth.request(
+                    method,
+                    path,
+                    headers={"Accept-Language": accept_language},
+                    data=data,
+                )
+                if response.is_error:
+                    _raise_error(response, errors)
+            except HomeConnectError as err:
+                retry_policy = self._retry_policy
+                if retry_policy is None or not retry_policy.should_retry(
+                    method, err, attempt
+                ):
+                    raise
+                delay = retry_policy.delay(err, attempt)
+                if (instrumentation := self._auth.instrumentation) is not None:
+                    instrumentation.request_retry(
+                        RequestRecord(method, endpoint_template(path), error=err),
+                        attempt,
+                        delay,
+                    )
+                LOGGER.debug(
+                    "Retrying %s %s in %.2fs after %s: %s",
+                    method,
+                    path,
+                    delay,
+                    type(err).__name__,
+                    err,
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+            else:
+                return response
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        accept_language: Language | None = None,
+        data: dict[str, Any] | None = None,
+        errors: Mapping[int, type[HomeConnectApiError]] | None = None,
+    ) -> Any:
+        """Make a request and return the decoded response envelope.
+
+        Writes to an appliance go through the write queue if there is one.
+        """
+        if (
+            self.write_queue is not None
+            and method != "GET"
+            and (ha_id := get_ha_id(path)) is not None
+        ):
+            return await self.write_queue.submit(
+                ha_id,
+                method,
+                path,
+                partial(
+                    self._request_now,
+                    method,
+                    path,
+                    accept_language=accept_language,
+                    data=data,
+                    errors=errors,
+                ),
+            )
+        return await self._request_now(
+            method,
+            path,
+            accept_language=accept_language,
+            data=data,
+            errors=errors,
+        )
+
+    async def _request_now(
+        self,
+        method: str,
+        path: str,
+        *,
+        accept_language: Language | None = None,
+        data: dict[str, Any] | None = None,
+        errors: Mapping[int, type[HomeConnectApiError]] | None = None,
+    ) -> Any:
+        """Make a request and return the decoded response envelope.
+
+        The response body is parsed exactly once.
+        """
+        response = await self._send(
+            method,
+            path,
+            accept_language=accept_language,
+            data=data,
+            errors=errors,
+        )
+        return json_loads(response.content) if response.content else None
+
+    async def _get[ModelT: DataClassDictMixin](
+        self,
+        model: type[ModelT],
+        path: str,
+        *,
+        accept_language: Language | None = None,
+        errors: Mapping[int, type[HomeConnectApiError]] | None = None,
+        on_fetched: Callable[[ModelT], None] | None = None,
+    ) -> ModelT:
+        """Get a resource and decode the data of the response into the model.
+
+        If on_fetched is given, it is called with each value received from
+        the API, but not with values served from the cache.
+        """
+
+        async def get() -> ModelT:
+            """Get and decode the resource."""
+            body = await self._request(
+                "GET",
+                path,
+                accept_language=accept_language,
+                errors=errors,
+            )
+            value = model.from_dict(body["data"])
+            if on_fetched is not None:
+                on_fetched(value)
+            return value
+
+        async def fetch() -> ModelT:
+            """Get the resource or join an identical in-flight request."""
+            if self._get_flight is None:
+                return await get()
+            return await self._get_flight.run((path, accept_language), get)
+
+        if (cache := self.cache) is None:
+            return await fetch()
+        endpoint = endpoint_template(path)
+        if (cached := cache.get(endpoint, path, accept_language)) is not None:
+            return cached
+        generation = cache.generation
+        result = await fetch()
+        cache.set(endpoint, path, accept_language, result, generation=generation)
+        return result
+
+    def _handle_appliances(self, appliances: Iterable[HomeAppliance]) -> None:
+        """Learn the models and connection states of fetched appliances."""
+        appliances = tuple(appliances)
+        for appliance in appliances:
+            self._appliance_models[appliance.ha_id] = ApplianceModel.from_appliance(
+                appliance
+            )
+        if self.connectivity_gate is not None:
+            self.connectivity_gate.update_appliances(appliances)
 
     async def get_home_appliances(self) -> ArrayOfHomeAppliances:
         """Get all home appliances which are paired with the logged-in user account.
@@ -194,13 +648,13 @@ class Client:
         The haId is the primary access key for further API access to a specific
         home appliance.
         """
-        response = await self._auth.request(
-            "GET",
+        return await self._get(
+            ArrayOfHomeAppliances,
             "/homeappliances",
-            headers=None,
+            on_fetched=lambda appliances: self._handle_appliances(
+                appliances.homeappliances
+            ),
         )
-        _raise_generic_error(response)
-        return ArrayOfHomeAppliances.from_dict(response.json()["data"])
 
     async def get_specific_appliance(
         self,
@@ -215,13 +669,11 @@ class Client:
         The haId is the primary access key for further API access to a specific
         home appliance.
         """
-        response = await self._auth.request(
-            "GET",
+        return await self._get(
+            HomeAppliance,
             f"/homeappliances/{ha_id}",
-            headers=None,
+            on_fetched=lambda appliance: self._handle_appliances((appliance,)),
         )
-        _raise_generic_error(response)
-        return HomeAppliance.from_dict(response.json()["data"])
 
     async def get_all_programs(
         self,
@@ -230,17 +682,12 @@ class Client:
         accept_language: Language | None = Language.EN,
     ) -> ArrayOfPrograms:
         """Get all programs of a given home appliance."""
-        response = await self._auth.request(
-            "GET",
+        return await self._get(
+            ArrayOfPrograms,
             f"/homeappliances/{ha_id}/programs",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
+            errors={codes.CONFLICT: Conflict},
         )
-        match response.status_code:
-            case codes.CONFLICT:
-                raise Conflict.from_dict(response.json()["error"])
-            case _:
-                _raise_generic_error(response)
-        return ArrayOfPrograms.from_dict(response.json()["data"])
 
     async def get_available_programs(
         self,
@@ -249,17 +696,12 @@ class Client:
         accept_language: Language | None = Language.EN,
     ) -> ArrayOfAvailablePrograms:
         """Get all currently available programs on the given home appliance."""
-        response = await self._auth.request(
-            "GET",
+        return await self._get(
+            ArrayOfAvailablePrograms,
             f"/homeappliances/{ha_id}/programs/available",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
+            errors={codes.CONFLICT: WrongOperationStateError},
         )
-        match response.status_code:
-            case codes.CONFLICT:
-                raise WrongOperationStateError.from_dict(response.json()["error"])
-            case _:
-                _raise_generic_error(response)
-        return ArrayOfAvailablePrograms.from_dict(response.json()["data"])
 
     async def get_available_program(
         self,
@@ -269,17 +711,26 @@ class Client:
         accept_language: Language | None = Language.EN,
     ) -> ProgramDefinition:
         """Get a specific available program."""
-        response = await self._auth.request(
-            "GET",
-            f"/homeappliances/{ha_id}/programs/available/{program_key}",
-            headers={"Accept-Language": accept_language},
-        )
-        match response.status_code:
-            case codes.CONFLICT:
-                raise ProgramNotAvailableError.from_dict(response.json()["error"])
-            case _:
-                _raise_generic_error(response)
-        return ProgramDefinition.from_dict(response.json()["data"])
+        path = f"/homeappliances/{ha_id}/programs/available/{program_key}"
+        errors: Mapping[int, type[HomeConnectApiError]] = {
+            codes.CONFLICT: ProgramNotAvailableError
+        }
+        definitions = self.program_definition_cache
+        if definitions is None or (model := self._appliance_models.get(ha_id)) is None:
+            return await self._get(
+                ProgramDefinition,
+                path,
+                accept_language=accept_language,
+                errors=errors,
+            )
+        data = await definitions.get(model, accept_language, program_key)
+        if data is None:
+            body = await self._request(
+                "GET", path, accept_language=accept_language, errors=errors
+            )
+            data = body["data"]
+            await definitions.set(model, accept_language, program_key, data)
+        return ProgramDefinition.from_dict(data)
 
     async def get_active_program(
         self,
@@ -288,19 +739,15 @@ class Client:
         accept_language: Language | None = Language.EN,
     ) -> Program:
         """Get the active program."""
-        response = await self._auth.request(
-            "GET",
+        return await self._get(
+            Program,
             f"/homeappliances/{ha_id}/programs/active",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
+            errors={
+                codes.NOT_FOUND: NoProgramActiveError,
+                codes.CONFLICT: ConflictError,
+            },
         )
-        match response.status_code:
-            case codes.NOT_FOUND:
-                raise NoProgramActiveError.from_dict(response.json()["error"])
-            case codes.CONFLICT:
-                raise ConflictError.from_dict(response.json()["error"])
-            case _:
-                _raise_generic_error(response)
-        return Program.from_dict(response.json()["data"])
 
     async def start_program(
         self,
@@ -348,17 +795,13 @@ class Client:
         refrigerators and wine coolers.
         """
         program = Program(key=program_key, name=name, options=options)
-        response = await self._auth.request(
+        await self._request(
             "PUT",
             f"/homeappliances/{ha_id}/programs/active",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
             data=program.to_dict(),
+            errors={codes.CONFLICT: ConflictError},
         )
-        match response.status_code:
-            case codes.CONFLICT:
-                raise ConflictError.from_dict(response.json()["error"])
-            case _:
-                _raise_generic_error(response)
 
     async def stop_program(
         self,
@@ -367,16 +810,12 @@ class Client:
         accept_language: Language | None = Language.EN,
     ) -> None:
         """Stop the active program."""
-        response = await self._auth.request(
+        await self._request(
             "DELETE",
             f"/homeappliances/{ha_id}/programs/active",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
+            errors={codes.CONFLICT: WrongOperationStateError},
         )
-        match response.status_code:
-            case codes.CONFLICT:
-                raise WrongOperationStateError.from_dict(response.json()["error"])
-            case _:
-                _raise_generic_error(response)
 
     async def get_active_program_options(
         self,
@@ -402,17 +841,12 @@ class Client:
         * [Washer](https://api-docs.home-connect.com/programs-and-options?#washer)
         * [Washer Dryer](https://api-docs.home-connect.com/programs-and-options?#washer-dryer)
         """
-        response = await self._auth.request(
-            "GET",
+        return await self._get(
+            ArrayOfOptions,
             f"/homeappliances/{ha_id}/programs/active/options",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
+            errors={codes.NOT_FOUND: NoProgramActiveError},
         )
-        match response.status_code:
-            case codes.NOT_FOUND:
-                raise NoProgramActiveError.from_dict(response.json()["error"])
-            case _:
-                _raise_generic_error(response)
-        return ArrayOfOptions.from_dict(response.json()["data"])
 
     async def set_active_program_options(
         self,
@@ -431,17 +865,13 @@ class Client:
         Please note that changing options of the running program is currently only
         supported by ovens.
         """
-        response = await self._auth.request(
+        await self._request(
             "PUT",
             f"/homeappliances/{ha_id}/programs/active/options",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
             data=array_of_options.to_dict(),
+            errors={codes.CONFLICT: ActiveProgramNotSetError},
         )
-        match response.status_code:
-            case codes.CONFLICT:
-                raise ActiveProgramNotSetError.from_dict(response.json()["error"])
-            case _:
-                _raise_generic_error(response)
 
     async def get_active_program_option(
         self,
@@ -451,17 +881,12 @@ class Client:
         accept_language: Language | None = Language.EN,
     ) -> Option:
         """Get a specific option of the active program."""
-        response = await self._auth.request(
-            "GET",
+        return await self._get(
+            Option,
             f"/homeappliances/{ha_id}/programs/active/options/{option_key}",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
+            errors={codes.NOT_FOUND: NoProgramActiveError},
         )
-        match response.status_code:
-            case codes.NOT_FOUND:
-                raise NoProgramActiveError.from_dict(response.json()["error"])
-            case _:
-                _raise_generic_error(response)
-        return Option.from_dict(response.json()["data"])
 
     async def set_active_program_option(
         self,
@@ -490,17 +915,13 @@ class Client:
             display_value=display_value,
             unit=unit,
         )
-        response = await self._auth.request(
+        await self._request(
             "PUT",
             f"/homeappliances/{ha_id}/programs/active/options/{option_key}",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
             data=option.to_dict(),
+            errors={codes.CONFLICT: ActiveProgramNotSetError},
         )
-        match response.status_code:
-            case codes.CONFLICT:
-                raise ActiveProgramNotSetError.from_dict(response.json()["error"])
-            case _:
-                _raise_generic_error(response)
 
     async def get_selected_program(
         self,
@@ -514,17 +935,12 @@ class Client:
         shown on the display of the home appliance. This program can then be
         manually adjusted or started on the home appliance itself.
         """
-        response = await self._auth.request(
-            "GET",
+        return await self._get(
+            Program,
             f"/homeappliances/{ha_id}/programs/selected",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
+            errors={codes.NOT_FOUND: NoProgramSelectedError},
         )
-        match response.status_code:
-            case codes.NOT_FOUND:
-                raise NoProgramSelectedError.from_dict(response.json()["error"])
-            case _:
-                _raise_generic_error(response)
-        return Program.from_dict(response.json()["data"])
 
     async def set_selected_program(
         self,
@@ -550,17 +966,13 @@ class Client:
         due to the state of the appliance is only reflected in the selected program.
         """
         program = Program(key=program_key, name=name, options=options)
-        response = await self._auth.request(
+        await self._request(
             "PUT",
             f"/homeappliances/{ha_id}/programs/selected",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
             data=program.to_dict(),
+            errors={codes.CONFLICT: ConflictError},
         )
-        match response.status_code:
-            case codes.CONFLICT:
-                raise ConflictError.from_dict(response.json()["error"])
-            case _:
-                _raise_generic_error(response)
 
     async def get_selected_program_options(
         self,
@@ -569,17 +981,12 @@ class Client:
         accept_language: Language | None = Language.EN,
     ) -> ArrayOfOptions:
         """Get all options of the selected program."""
-        response = await self._auth.request(
-            "GET",
+        return await self._get(
+            ArrayOfOptions,
             f"/homeappliances/{ha_id}/programs/selected/options",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
+            errors={codes.NOT_FOUND: NoProgramSelectedError},
         )
-        match response.status_code:
-            case codes.NOT_FOUND:
-                raise NoProgramSelectedError.from_dict(response.json()["error"])
-            case _:
-                _raise_generic_error(response)
-        return ArrayOfOptions.from_dict(response.json()["data"])
 
     async def set_selected_program_options(
         self,
@@ -589,17 +996,13 @@ class Client:
         accept_language: Language | None = Language.EN,
     ) -> None:
         """Set all options of the selected program."""
-        response = await self._auth.request(
+        await self._request(
             "PUT",
             f"/homeappliances/{ha_id}/programs/selected/options",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
             data=array_of_options.to_dict(),
+            errors={codes.CONFLICT: SelectedProgramNotSetError},
         )
-        match response.status_code:
-            case codes.CONFLICT:
-                raise SelectedProgramNotSetError.from_dict(response.json()["error"])
-            case _:
-                _raise_generic_error(response)
 
     async def get_selected_program_option(
         self,
@@ -609,17 +1012,12 @@ class Client:
         accept_language: Language | None = Language.EN,
     ) -> Option:
         """Get a specific option of the selected program."""
-        response = await self._auth.request(
-            "GET",
+        return await self._get(
+            Option,
             f"/homeappliances/{ha_id}/programs/selected/options/{option_key}",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
+            errors={codes.NOT_FOUND: NoProgramSelectedError},
         )
-        match response.status_code:
-            case codes.NOT_FOUND:
-                raise NoProgramSelectedError.from_dict(response.json()["error"])
-            case _:
-                _raise_generic_error(response)
-        return Option.from_dict(response.json()["data"])
 
     async def set_selected_program_option(
         self,
@@ -640,17 +1038,13 @@ class Client:
             display_value=display_value,
             unit=unit,
         )
-        response = await self._auth.request(
+        await self._request(
             "PUT",
             f"/homeappliances/{ha_id}/programs/selected/options/{option_key}",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
             data=option.to_dict(),
+            errors={codes.CONFLICT: SelectedProgramNotSetError},
         )
-        match response.status_code:
-            case codes.CONFLICT:
-                raise SelectedProgramNotSetError.from_dict(response.json()["error"])
-            case _:
-                _raise_generic_error(response)
 
     async def get_images(
         self,
@@ -659,13 +1053,11 @@ class Client:
         accept_language: Language | None = Language.EN,
     ) -> ArrayOfImages:
         """Get a list of available images."""
-        response = await self._auth.request(
-            "GET",
+        return await self._get(
+            ArrayOfImages,
             f"/homeappliances/{ha_id}/images",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
         )
-        _raise_generic_error(response)
-        return ArrayOfImages.from_dict(response.json()["data"])
 
     async def get_image(
         self,
@@ -674,18 +1066,70 @@ class Client:
         image_key: str,
     ) -> bytes:
         """Get a specific image."""
-        response = await self._auth.request(
+        response = await self._send(
             "GET",
             f"/homeappliances/{ha_id}/images/{image_key}",
-            headers=None,
+            errors={codes.NOT_FOUND: NotFoundError},
         )
-        match response.status_code:
-            case codes.NOT_FOUND:
-                raise NotFoundError.from_dict(response.json()["error"])
-            case _:
-                _raise_generic_error(response)
         return response.content
 
+    async def stream_image(
+        self,
+        ha_id: str,
+        *,
+        image_key: str,
+        chunk_size: int = IMAGE_CHUNK_SIZE,
+    ) -> AsyncGenerator[bytes]:
+        """Get a specific image as chunks of at most chunk_size bytes.
+
+        The image is never held in memory as a whole. The request is not
+        retried, since chunks may already have been consumed.
+        """
+        path = f"/homeappliances/{ha_id}/images/{image_key}"
+        if self.connectivity_gate is not None:
+            self.connectivity_gate.check(path)
+        async with self._auth.stream("GET", path) as response:
+            if response.is_error:
+                _raise_error(response, {codes.NOT_FOUND: NotFoundError})
+            async for chunk in response.aiter_bytes(chunk_size):
+                yield chunk
+
+    async def download_image(
+        self,
+        ha_id: str,
+        *,
+        image_key: str,
+        destination: str | PathLike[str] | BinaryIO,
+        chunk_size: int = IMAGE_CHUNK_SIZE,
+    ) -> int:
+        """Write a specific image to a path or a binary file object.
+
+        Return the number of bytes written. A file at a path is written from
+        a worker thread and removed again if the download fails.
+        """
+        size = 0
+        async with aclosing(
+            self.stream_image(ha_id, image_key=image_key, chunk_size=chunk_size)
+        ) as chunks:
+            if not isinstance(destination, (str, PathLike)):
+                async for chunk in chunks:
+                    destination.write(chunk)
+                    size += len(chunk)
+                return size
+
+            path = Path(destination)
+            file = cast("BinaryIO", await asyncio.to_thread(path.open, "wb"))
+            try:
+                async for chunk in chunks:
+                    await asyncio.to_thread(file.write, chunk)
+                    size += len(chunk)
+            except BaseException:
+                await asyncio.to_thread(file.close)
+                await asyncio.to_thread(path.unlink, missing_ok=True)
+                raise
+            await asyncio.to_thread(file.close)
+        return size
+
     async def get_settings(
         self,
         ha_id: str,
@@ -699,13 +1143,11 @@ class Client:
         Further documentation
         can be found [here](https://api-docs.home-connect.com/settings).
         """
-        response = await self._auth.request(
-            "GET",
+        return await self._get(
+            ArrayOfSettings,
             f"/homeappliances/{ha_id}/settings",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
         )
-        _raise_generic_error(response)
-        return ArrayOfSettings.from_dict(response.json()["data"])
 
     async def set_settings(
         self,
@@ -715,17 +1157,13 @@ class Client:
         accept_language: Language | None = Language.EN,
     ) -> None:
         """Set multiple settings."""
-        response = await self._auth.request(
+        await self._request(
             "PUT",
             f"/homeappliances/{ha_id}/settings",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
             data=put_settings.to_dict(),
+            errors={codes.CONFLICT: ConflictError},
         )
-        match response.status_code:
-            case codes.CONFLICT:
-                raise ConflictError.from_dict(response.json()["error"])
-            case _:
-                _raise_generic_error(response)
 
     async def get_setting(
         self,
@@ -735,19 +1173,12 @@ class Client:
         accept_language: Language | None = Language.EN,
     ) -> GetSetting:
         """Get a specific setting."""
-        response = await self._auth.request(
-            "GET",
+        return await self._get(
+            GetSetting,
             f"/homeappliances/{ha_id}/settings/{setting_key}",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
+            errors={codes.NOT_FOUND: NotFoundError, codes.CONFLICT: ConflictError},
         )
-        match response.status_code:
-            case codes.NOT_FOUND:
-                raise NotFoundError.from_dict(response.json()["error"])
-            case codes.CONFLICT:
-                raise ConflictError.from_dict(response.json()["error"])
-            case _:
-                _raise_generic_error(response)
-        return GetSetting.from_dict(response.json()["data"])
 
     async def set_setting(
         self,
@@ -759,19 +1190,13 @@ class Client:
     ) -> None:
         """Set a specific setting."""
         put_setting = PutSetting(key=setting_key, value=value)
-        response = await self._auth.request(
+        await self._request(
             "PUT",
             f"/homeappliances/{ha_id}/settings/{setting_key}",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
             data=put_setting.to_dict(),
+            errors={codes.NOT_FOUND: NotFoundError, codes.CONFLICT: ConflictError},
         )
-        match response.status_code:
-            case codes.NOT_FOUND:
-                raise NotFoundError.from_dict(response.json()["error"])
-            case codes.CONFLICT:
-                raise ConflictError.from_dict(response.json()["error"])
-            case _:
-                _raise_generic_error(response)
 
     async def get_status(
         self,
@@ -784,17 +1209,12 @@ class Client:
         A detailed description of the available status
         can be found [here](https://api-docs.home-connect.com/states).
         """
-        response = await self._auth.request(
-            "GET",
+        return await self._get(
+            ArrayOfStatus,
             f"/homeappliances/{ha_id}/status",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
+            errors={codes.CONFLICT: ConflictError},
         )
-        match response.status_code:
-            case codes.CONFLICT:
-                raise ConflictError.from_dict(response.json()["error"])
-            case _:
-                _raise_generic_error(response)
-        return ArrayOfStatus.from_dict(response.json()["data"])
 
     async def get_status_value(
         self,
@@ -808,19 +1228,12 @@ class Client:
         A detailed description of the available status
         can be found [here](https://api-docs.home-connect.com/states).
         """
-        response = await self._auth.request(
-            "GET",
+        return await self._get(
+            Status,
             f"/homeappliances/{ha_id}/status/{status_key}",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
+            errors={codes.NOT_FOUND: NotFoundError, codes.CONFLICT: ConflictError},
         )
-        match response.status_code:
-            case codes.NOT_FOUND:
-                raise NotFoundError.from_dict(response.json()["error"])
-            case codes.CONFLICT:
-                raise ConflictError.from_dict(response.json()["error"])
-            case _:
-                _raise_generic_error(response)
-        return Status.from_dict(response.json()["data"])
 
     async def get_available_commands(
         self,
@@ -829,13 +1242,11 @@ class Client:
         accept_language: Language | None = Language.EN,
     ) -> ArrayOfCommands:
         """Get a list of available and writable commands."""
-        response = await self._auth.request(
-            "GET",
+        return await self._get(
+            ArrayOfCommands,
             f"/homeappliances/{ha_id}/commands",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
         )
-        _raise_generic_error(response)
-        return ArrayOfCommands.from_dict(response.json()["data"])
 
     async def put_commands(
         self,
@@ -845,13 +1256,12 @@ class Client:
         accept_language: Language | None = Language.EN,
     ) -> None:
         """Execute multiple commands."""
-        response = await self._auth.request(
+        await self._request(
             "PUT",
             f"/homeappliances/{ha_id}/commands",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
             data=put_commands.to_dict(),
         )
-        _raise_generic_error(response)
 
     async def put_command(
         self,
@@ -863,18 +1273,19 @@ class Client:
     ) -> None:
         """Execute a specific command."""
         put_command = PutCommand(key=command_key, value=value)
-        response = await self._auth.request(
+        await self._request(
             "PUT",
             f"/homeappliances/{ha_id}/commands/{command_key}",
-            headers={"Accept-Language": accept_language},
+            accept_language=accept_language,
             data=put_command.to_dict(),
         )
-        _raise_generic_error(response)
 
     async def stream_all_events(
         self,
         *,
         accept_language: Language | None = Language.EN,
+        event_filter: EventFilter | None = None,
+        lazy: bool = False,
     ) -> AsyncGenerator[EventMessage]:
         """Get stream of events for all appliances.
 
@@ -902,6 +1313,10 @@ class Client:
         * [Option changes](https://api-docs.home-connect.com/events#option-changes)
         * [Program progress changes](https://api-docs.home-connect.com/events#program-progress-changes)
         * [Home appliance state changes](https://api-docs.home-connect.com/events#home-appliance-state-changes)
+
+        If an event filter is given, events that do not match are dropped
+        before they are decoded. If lazy is set, LazyEventMessage instances
+        are yielded, which decode their items on first access.
         """
         # We use 60 seconds timeout because at least every 55 seconds a KEEP-ALIVE event
         # will be sent. See https://api-docs.home-connect.com/events/#availability-matrix
@@ -916,37 +1331,20 @@ class Client:
             response = event_source.response
             if response.is_error:
                 await response.aread()
-                match event_source.response.status_code:
-                    case codes.UNAUTHORIZED:
-                        raise UnauthorizedError.from_dict(response.json()["error"])
-                    case codes.FORBIDDEN:
-                        raise ForbiddenError.from_dict(response.json()["error"])
-                    case codes.NOT_ACCEPTABLE:
-                        raise NotAcceptableError.from_dict(response.json()["error"])
-                    case codes.TOO_MANY_REQUESTS:
-                        raise TooManyRequestsError.from_dict(response.json()["error"])
-                    case codes.INTERNAL_SERVER_ERROR:
-                        raise InternalServerError.from_dict(response.json()["error"])
-                    case _:
-                        _raise_generic_error(response)
-
-            async for sse in event_source.aiter_sse():
-                LOGGER.debug("Event: %s", sse)
-
-                if (
-                    # _value2member_map_ is required for Python 3.11,
-                    # remove after dropping support for it.
-                    sse.event not in EventType._value2member_map_
-                    or sse.event == EventType.KEEP_ALIVE
-                ):
-                    continue
-                yield EventMessage.from_server_sent_event(sse)
+                _raise_error(response)
+
+            async for event_message in self._iter_event_messages(
+                event_source, event_filter, lazy=lazy
+            ):
+                yield event_message
 
     async def stream_events(
         self,
         ha_id: str,
         *,
         accept_language: Language | None = Language.EN,
+        event_filter: EventFilter | None = None,
+        lazy: bool = False,
     ) -> AsyncGenerator[EventMessage]:
         """Get stream of events for one appliance.
 
@@ -981,6 +1379,10 @@ class Client:
         * [Option changes](https://api-docs.home-connect.com/events#option-changes)
         * [Program progress changes](https://api-docs.home-connect.com/events#program-progress-changes)
         * [Home appliance state changes](https://api-docs.home-connect.com/events#home-appliance-state-changes)
+
+        If an event filter is given, events that do not match are dropped
+        before they are decoded. If lazy is set, LazyEventMessage instances
+        are yielded, which decode their items on first access.
         """
         # We use 60 seconds timeout because at least every 55 seconds a KEEP-ALIVE event
         # will be sent. See https://api-docs.home-connect.com/events/#availability-matrix
@@ -995,26 +1397,101 @@ class Client:
             response = event_source.response
             if response.is_error:
                 await response.aread()
-                match event_source.response.status_code:
-                    case codes.UNAUTHORIZED:
-                        raise UnauthorizedError.from_dict(response.json()["error"])
-                    case codes.FORBIDDEN:
-                        raise ForbiddenError.from_dict(response.json()["error"])
-                    case codes.NOT_ACCEPTABLE:
-                        raise NotAcceptableError.from_dict(response.json()["error"])
-                    case codes.TOO_MANY_REQUESTS:
-                        raise TooManyRequestsError.from_dict(response.json()["error"])
-                    case codes.INTERNAL_SERVER_ERROR:
-                        raise InternalServerError.from_dict(response.json()["error"])
-                    case _:
-                        _raise_generic_error(response)
-
-            async for sse in event_source.aiter_sse():
-                if (
-                    # _value2member_map_ is required for Python 3.11,
-                    # remove after dropping support for it.
-                    sse.event not in EventType._value2member_map_
-                    or sse.event == EventType.KEEP_ALIVE
-                ):
+                _raise_error(response)
+
+            async for event_message in self._iter_event_messages(
+                event_source, event_filter, lazy=lazy
+            ):
+                yield event_message
+
+    async def _iter_event_messages(
+        self,
+        event_source: EventSource,
+        event_filter: EventFilter | None,
+        *,
+        lazy: bool,
+    ) -> AsyncGenerator[EventMessage]:
+        """Decode the server sent events that are wanted or invalidate the cache."""
+        cache = self.cache
+        connectivity_gate = self.connectivity_gate
+        instrumentation = self._auth.instrumentation
+        message_cls = LazyEventMessage if lazy else EventMessage
+        decode = message_cls.from_server_sent_event
+        server_sent_events = event_source.aiter_sse()
+        if instrumentation is not None:
+            decode = _timed_decoder(decode, instrumentation)
+            server_sent_events = _counted_events(server_sent_events, instrumentation)
+        async for sse in server_sent_events:
+            LOGGER.debug("Event: %s", sse)
+
+            if (
+                # _value2member_map_ is required for Python 3.11,
+                # remove after dropping support for it.
+                sse.event not in EventType._value2member_map_
+                or sse.event == EventType.KEEP_ALIVE
+            ):
+                continue
+            if connectivity_gate is not None:
+                connectivity_gate.handle_server_sent_event(sse)
+            wanted = event_filter is None or event_filter.matches_server_sent_event(sse)
+            invalidates = cache is not None and cache.wants_server_sent_event(sse)
+            if not wanted and not invalidates:
+                continue
+            event_message = decode(sse)
+            if cache is not None and invalidates:
+                cache.handle_event(event_message)
+            if not wanted:
+                continue
+            if event_filter is not None:
+                filtered = event_filter.apply(event_message)
+                if filtered is None:
                     continue
-                yield EventMessage.from_server_sent_event(sse)
+                event_message = filtered
+            yield event_message
+
+
+@asynccontextmanager
+async def _measure_request(
+    instrumentation: Instrumentation, method: str, url: str
+) -> AsyncGenerator[RequestRecord]:
+    """Yield the record of a request and pass it to the instrumentation.
+
+    The record receives the duration and the error that ended the request.
+    """
+    record = RequestRecord(method, endpoint_template(url))
+    context = instrumentation.request_start(record)
+    start = time.perf_counter()
+    try:
+        yield record
+    except Exception as err:
+        record.error = err
+        raise
+    finally:
+        record.duration = time.perf_counter() - start
+        instrumentation.request_end(record, context)
+
+
+async def _counted_events(
+    server_sent_events: AsyncIterator[ServerSentEvent],
+    instrumentation: Instrumentation,
+) -> AsyncGenerator[ServerSentEvent]:
+    """Yield the server sent events and pass each to the instrumentation."""
+    async for sse in server_sent_events:
+        instrumentation.event_received(sse.id, sse.event)
+        yield sse
+
+
+def _timed_decoder(
+    decode: Callable[[ServerSentEvent], EventMessage],
+    instrumentation: Instrumentation,
+) -> Callable[[ServerSentEvent], EventMessage]:
+    """Return a decoder that passes the decode time to the instrumentation."""
+
+    def timed_decode(sse: ServerSentEvent) -> EventMessage:
+        """Decode a server sent event and measure the time it takes."""
+        start = time.perf_counter()
+        event_message = decode(sse)
+        instrumentation.event_decoded(sse.event, time.perf_counter() - start)
+        return event_message
+
+    return timed_decode
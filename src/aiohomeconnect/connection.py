@@ -0,0 +1,76 @@
+"""Provide a HTTP client tuned for the Home Connect API."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cache
+import importlib.util
+import ssl
+
+from httpx import AsyncClient, AsyncHTTPTransport, Limits, create_ssl_context
+
+from .const import LOGGER
+
+
+@dataclass(frozen=True)
+class ConnectionConfig:
+    """Represent the connection settings for the API host.
+
+    All requests go to a single host, so a small pool of long lived
+    connections is enough to serve many concurrent requests.
+    """
+
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 120.0
+    http2: bool = False
+    connect_retries: int = 1
+    ssl_context: ssl.SSLContext | None = None
+
+    @property
+    def limits(self) -> Limits:
+        """Return the connection pool limits."""
+        return Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+@cache
+def shared_ssl_context() -> ssl.SSLContext:
+    """Return the SSL context shared by all clients.
+
+    Loading the trust store is expensive, so the context is created once
+    and reused by every client created by this module.
+    """
+    return create_ssl_context()
+
+
+def http2_available() -> bool:
+    """Return True if the HTTP/2 dependencies are installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def create_httpx_client(config: ConnectionConfig | None = None) -> AsyncClient:
+    """Return a HTTP client tuned for the Home Connect API."""
+    config = config or ConnectionConfig()
+    http2 = config.http2
+    if http2 and not http2_available():
+        LOGGER.warning(
+            "HTTP/2 requested but the h2 package is not installed, using HTTP/1.1"
+        )
+        http2 = False
+    ssl_context = config.ssl_context or shared_ssl_context()
+    transport = AsyncHTTPTransport(
+        verify=ssl_context,
+        http2=http2,
+        limits=config.limits,
+        retries=config.connect_retries,
+    )
+    return AsyncClient(
+        transport=transport,
+        verify=ssl_context,
+        http2=http2,
+        limits=config.limits,
+    )
@@ -0,0 +1,77 @@
+"""Provide a gate that fails requests to disconnected appliances locally."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from httpx_sse import ServerSentEvent
+
+from .endpoint import endpoint_template, get_ha_id
+from .model import EventMessage, EventType, HomeAppliance
+from .model.error import ApplianceOfflineError
+
+APPLIANCE_ENDPOINT = "/homeappliances/{haId}"
+
+
+class ConnectivityGate:
+    """Track the connection state of the appliances and gate requests to them.
+
+    The state is learned from fetched appliances and from the connection
+    events of the event streams. Appliances with an unknown state are
+    assumed to be connected.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the gate."""
+        self._connected: dict[str, bool] = {}
+
+    def is_connected(self, ha_id: str) -> bool:
+        """Return False if the appliance is known to be disconnected."""
+        return self._connected.get(ha_id, True)
+
+    @property
+    def offline(self) -> frozenset[str]:
+        """Return the ids of the appliances known to be disconnected."""
+        return frozenset(
+            ha_id for ha_id, connected in self._connected.items() if not connected
+        )
+
+    def update_appliances(self, appliances: Iterable[HomeAppliance]) -> None:
+        """Update the state from fetched appliances."""
+        for appliance in appliances:
+            self._connected[appliance.ha_id] = appliance.connected
+
+    def set_connected(self, ha_id: str, *, connected: bool) -> None:
+        """Set the connection state of an appliance."""
+        self._connected[ha_id] = connected
+
+    def handle_event(self, event_message: EventMessage) -> None:
+        """Update the state from an event message."""
+        self._handle_event_type(event_message.ha_id, event_message.type)
+
+    def handle_server_sent_event(self, sse: ServerSentEvent) -> None:
+        """Update the state from a server sent event without decoding it."""
+        self._handle_event_type(sse.id, sse.event)
+
+    def _handle_event_type(self, ha_id: str, event_type: str) -> None:
+        """Update the state of an appliance from the type of an event."""
+        match event_type:
+            case EventType.CONNECTED | EventType.PAIRED:
+                self._connected[ha_id] = True
+            case EventType.DISCONNECTED:
+                self._connected[ha_id] = False
+            case EventType.DEPAIRED:
+                self._connected.pop(ha_id, None)
+
+    def check(self, path: str) -> None:
+        """Raise if a request path targets a disconnected appliance.
+
+        The appliance itself can still be fetched, since that is how its
+        connection state is read.
+        """
+        if (
+            (ha_id := get_ha_id(path)) is not None
+            and not self.is_connected(ha_id)
+            and endpoint_template(path) != APPLIANCE_ENDPOINT
+        ):
+            raise ApplianceOfflineError(ha_id)
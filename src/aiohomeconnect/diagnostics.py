@@ -0,0 +1,141 @@
+"""Provide request and response logging for Home Connect API."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from enum import StrEnum
+import json
+import logging
+import random
+from typing import Any
+
+from httpx import Response
+
+from .const import LOGGER
+from .endpoint import endpoint_template
+
+REDACTED = "**REDACTED**"
+DEFAULT_REDACT_KEYS = frozenset(
+    {
+        "access_token",
+        "enumber",
+        "haId",
+        "id_token",
+        "refresh_token",
+        "vib",
+    }
+)
+TEXT_CONTENT_TYPES = ("json", "text", "xml")
+APPLIANCES_PATH = "/homeappliances"
+
+
+class BodyLogMode(StrEnum):
+    """Represent how request and response bodies are logged."""
+
+    FULL = "full"
+    TRUNCATED = "truncated"
+    REDACTED = "redacted"
+    SAMPLED = "sampled"
+    NONE = "none"
+
+
+@dataclass
+class RequestLogger:
+    """Log requests and responses.
+
+    Nothing is formatted or decoded unless the logger is enabled for debug.
+    In redacted mode, paths are logged as their endpoint template, so the
+    appliance id is not logged.
+    """
+
+    mode: BodyLogMode = BodyLogMode.FULL
+    max_body_length: int = 1024
+    sample_rate: float = 0.1
+    redact_keys: frozenset[str] = DEFAULT_REDACT_KEYS
+    logger: logging.Logger = field(default=LOGGER, repr=False)
+
+    def log_request(self, method: str, url: str, data: Any) -> None:
+        """Log a request."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        if data is not None and self.mode is BodyLogMode.REDACTED:
+            data = redact(data, self.redact_keys)
+        elif self.mode is BodyLogMode.NONE:
+            data = None
+        self.logger.debug(
+            "Request: %s %s | Data: %s", method, self.format_path(url), data
+        )
+
+    def log_response(self, response: Response) -> None:
+        """Log a response."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        self.logger.debug(
+            "Response: %s %s\n%s",
+            response.status_code,
+            self.format_path(response.request.url.path),
+            self.format_body(response),
+        )
+
+    def log_streamed_response(self, response: Response) -> None:
+        """Log a response whose body is streamed and never logged."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        self.logger.debug(
+            "Response: %s %s\n<streamed %s>",
+            response.status_code,
+            self.format_path(response.request.url.path),
+            response.headers.get("content-type") or "unknown content",
+        )
+
+    def format_path(self, path: str) -> str:
+        """Return the path formatted according to the log mode."""
+        if self.mode is not BodyLogMode.REDACTED:
+            return path
+        prefix, appliances, rest = path.partition(APPLIANCES_PATH)
+        if not appliances:
+            return path
+        return f"{prefix}{endpoint_template(appliances + rest)}"
+
+    def format_body(self, response: Response) -> str:
+        """Return the response body formatted according to the log mode."""
+        content_type = response.headers.get("content-type", "")
+        size = len(response.content)
+        if size and not any(kind in content_type for kind in TEXT_CONTENT_TYPES):
+            return f"<{size} bytes of {content_type or 'unknown content'}>"
+
+        match self.mode:
+            case BodyLogMode.NONE:
+                return f"<{size} bytes>"
+            case BodyLogMode.SAMPLED if random.random() >= self.sample_rate:  # noqa: S311
+                return f"<{size} bytes, not sampled>"
+            case BodyLogMode.TRUNCATED if size > self.max_body_length:
+                text = response.content[: self.max_body_length].decode(
+                    response.encoding or "utf-8", errors="replace"
+                )
+                return f"{text}... <truncated, {size} bytes>"
+            case BodyLogMode.REDACTED if size:
+                return self._format_redacted(response.content)
+            case _:
+                return response.text
+
+    def _format_redacted(self, content: bytes) -> str:
+        """Return the JSON content with sensitive values redacted."""
+        try:
+            body = json.loads(content)
+        except ValueError:
+            return f"<{len(content)} bytes, not JSON>"
+        return json.dumps(redact(body, self.redact_keys))
+
+
+def redact(data: Any, keys: frozenset[str]) -> Any:
+    """Return a copy of the data with the values of the given keys redacted."""
+    if isinstance(data, Mapping):
+        return {
+            key: REDACTED if key in keys else redact(value, keys)
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [redact(item, keys) for item in data]
+    return data
@@ -0,0 +1,38 @@
+"""Provide helpers to identify Home Connect API endpoints."""
+
+from __future__ import annotations
+
+# Map a path segment to the placeholder of the key that follows it.
+KEY_PLACEHOLDERS = {
+    "available": "{programKey}",
+    "commands": "{commandKey}",
+    "images": "{imageKey}",
+    "options": "{optionKey}",
+    "settings": "{settingKey}",
+    "status": "{statusKey}",
+}
+
+
+def split_path(path: str) -> list[str]:
+    """Return the segments of a path below the api prefix."""
+    return path.split("?", 1)[0].strip("/").split("/")
+
+
+def get_ha_id(path: str) -> str | None:
+    """Return the appliance id of a path or None if it targets no appliance."""
+    parts = split_path(path)
+    return parts[1] if len(parts) > 1 and parts[1] != "events" else None
+
+
+def endpoint_template(path: str) -> str:
+    """Return the endpoint template of a path.
+
+    For example /homeappliances/{haId}/status/{statusKey}.
+    """
+    parts = split_path(path)
+    if len(parts) > 1 and parts[1] != "events":
+        parts[1] = "{haId}"
+    for index in range(3, len(parts)):
+        if placeholder := KEY_PLACEHOLDERS.get(parts[index - 1]):
+            parts[index] = placeholder
+    return "/" + "/".join(parts)
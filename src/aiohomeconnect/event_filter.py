@@ -0,0 +1,105 @@
+"""Provide a filter of event messages."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from httpx_sse import ServerSentEvent
+
+from .model import ArrayOfEvents, EventKey, EventMessage, EventType, LazyEventMessage
+from .model.event import RAW_KEY_PATTERN
+
+
+@dataclass(frozen=True)
+class EventFilter:
+    """Represent which event messages and event items to keep.
+
+    A criterion that is None matches everything. An event item matches if
+    its key is one of the event keys or starts with one of the key prefixes.
+    Keys only apply to messages with items, so connection messages are kept
+    by a key filter.
+    """
+
+    ha_ids: frozenset[str] | None = None
+    event_types: frozenset[EventType] | None = None
+    event_keys: frozenset[EventKey] | None = None
+    key_prefixes: tuple[str, ...] | None = None
+
+    @classmethod
+    def create(
+        cls,
+        *,
+        ha_ids: Iterable[str] | None = None,
+        event_types: Iterable[EventType] | None = None,
+        event_keys: Iterable[EventKey] | None = None,
+        key_prefixes: Iterable[str] | None = None,
+    ) -> EventFilter:
+        """Create a filter from iterables.
+
+        Key prefixes may end with a wildcard, e.g. BSH.Common.Option.*.
+        """
+        return cls(
+            None if ha_ids is None else frozenset(ha_ids),
+            None if event_types is None else frozenset(event_types),
+            None if event_keys is None else frozenset(event_keys),
+            None
+            if key_prefixes is None
+            else tuple(prefix.removesuffix("*") for prefix in key_prefixes),
+        )
+
+    @property
+    def filters_keys(self) -> bool:
+        """Return True if the filter has a key criterion."""
+        return self.event_keys is not None or self.key_prefixes is not None
+
+    def matches_key(self, raw_key: str) -> bool:
+        """Return True if an event item key matches."""
+        return (self.event_keys is not None and raw_key in self.event_keys) or (
+            self.key_prefixes is not None and raw_key.startswith(self.key_prefixes)
+        )
+
+    def matches_server_sent_event(self, sse: ServerSentEvent) -> bool:
+        """Return True if a server sent event may match before decoding it.
+
+        The keys are found in the raw data, so no JSON or model decoding
+        is done for events that are dropped.
+        """
+        if self.ha_ids is not None and sse.id not in self.ha_ids:
+            return False
+        if self.event_types is not None and sse.event not in self.event_types:
+            return False
+        if not self.filters_keys or not sse.data:
+            return True
+        raw_keys = RAW_KEY_PATTERN.findall(sse.data)
+        return not raw_keys or any(self.matches_key(key) for key in raw_keys)
+
+    def apply(self, event_message: EventMessage) -> EventMessage | None:
+        """Return the message with the matching items or None if filtered out."""
+        if (self.ha_ids is not None and event_message.ha_id not in self.ha_ids) or (
+            self.event_types is not None and event_message.type not in self.event_types
+        ):
+            return None
+        if not self.filters_keys:
+            return event_message
+        if isinstance(event_message, LazyEventMessage) and not event_message.is_decoded:
+            # Avoid decoding if all or none of the items match.
+            matches = [self.matches_key(key) for key in event_message.raw_keys]
+            if all(matches):
+                return event_message
+            if not any(matches):
+                return None
+        return self._filter_items(event_message)
+
+    def _filter_items(self, event_message: EventMessage) -> EventMessage | None:
+        """Return the message with the matching items or None if none match."""
+        if not (items := event_message.data.items):
+            return event_message
+        matching = [event for event in items if self.matches_key(event.raw_key)]
+        if not matching:
+            return None
+        if len(matching) == len(items):
+            return event_message
+        return EventMessage(
+            event_message.ha_id, event_message.type, ArrayOfEvents(matching)
+        )
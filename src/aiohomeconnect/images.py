@@ -0,0 +1,104 @@
+"""Provide downloading all images of an appliance at once."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from os import PathLike
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .client import IMAGE_CHUNK_SIZE
+from .model.error import HomeConnectError
+from .model.image import Image
+from .program_cache import UNSAFE_FILENAME_CHARS
+
+if TYPE_CHECKING:
+    from .client import Client
+
+DEFAULT_MAX_CONCURRENCY = 4
+# The API serves the images of appliance cameras as JPEG.
+IMAGE_SUFFIX = ".jpg"
+
+
+@dataclass
+class ImageDownloadResult:
+    """Represent the results of downloading the images of an appliance.
+
+    Paths and errors are mapped from the image key. An error is either an
+    API error or an OSError from writing the file.
+    """
+
+    paths: dict[str, Path] = field(default_factory=dict)
+    errors: dict[str, HomeConnectError | OSError] = field(default_factory=dict)
+
+
+async def download_images(
+    client: Client,
+    ha_id: str,
+    directory: str | PathLike[str],
+    images: Iterable[Image] | None = None,
+    *,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    chunk_size: int = IMAGE_CHUNK_SIZE,
+) -> ImageDownloadResult:
+    """Download images of an appliance into a directory.
+
+    All available images are downloaded if no images are given. Each image
+    is streamed to a file named after its sanitized image key, at most
+    max_concurrency images are downloaded at a time and a failed download
+    only marks its image as failed instead of failing the whole batch.
+    """
+    if images is None:
+        images = (await client.get_images(ha_id)).images
+    directory = Path(directory)
+    await asyncio.to_thread(directory.mkdir, parents=True, exist_ok=True)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    result = ImageDownloadResult()
+    await asyncio.gather(
+        *(
+            _download_image(
+                client,
+                semaphore,
+                result,
+                ha_id=ha_id,
+                image_key=image.image_key,
+                path=_get_path(directory, image.image_key),
+                chunk_size=chunk_size,
+            )
+            for image in images
+        )
+    )
+    return result
+
+
+def _get_path(directory: Path, image_key: str) -> Path:
+    """Return the path of the file of an image inside the directory.
+
+    The image key comes from the API, so characters that could leave the
+    directory are replaced.
+    """
+    return directory / f"{UNSAFE_FILENAME_CHARS.sub('_', image_key)}{IMAGE_SUFFIX}"
+
+
+async def _download_image(
+    client: Client,
+    semaphore: asyncio.Semaphore,
+    result: ImageDownloadResult,
+    *,
+    ha_id: str,
+    image_key: str,
+    path: Path,
+    chunk_size: int,
+) -> None:
+    """Download an image and store its path or the error."""
+    async with semaphore:
+        try:
+            await client.download_image(
+                ha_id, image_key=image_key, destination=path, chunk_size=chunk_size
+            )
+        except (HomeConnectError, OSError) as err:
+            result.errors[image_key] = err
+            return
+    result.paths[image_key] = path
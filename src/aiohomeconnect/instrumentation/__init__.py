@@ -0,0 +1,134 @@
+"""Provide hooks to measure requests and event streams.
+
+Adapters for Prometheus and OpenTelemetry are found in the prometheus and
+opentelemetry modules, which need the respective optional dependency.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any, override
+
+
+@dataclass(slots=True)
+class RequestRecord:
+    """Represent a request to the API.
+
+    The endpoint is the endpoint template, e.g. /homeappliances/{haId}/status,
+    and the duration is in seconds. The status code is None if no response
+    was received.
+    """
+
+    method: str
+    endpoint: str
+    status_code: int | None = None
+    duration: float = 0.0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    error: BaseException | None = None
+
+
+class Instrumentation:
+    """Receive measurements of requests and event streams.
+
+    Subclass and override the hooks of interest. The hooks are called
+    synchronously from the event loop and must not block. Nothing is
+    measured unless an instrumentation is set on the auth.
+    """
+
+    def request_start(self, record: RequestRecord) -> Any:
+        """Handle the start of a request.
+
+        The return value is passed to request_end, e.g. a span.
+        """
+
+    def request_end(self, record: RequestRecord, context: Any) -> None:
+        """Handle the end of a request."""
+
+    def request_retry(self, record: RequestRecord, attempt: int, delay: float) -> None:
+        """Handle a failed request that is retried after delay seconds."""
+
+    def token_refresh(self, duration: float, error: BaseException | None) -> None:
+        """Handle a new access token or a failure to get one."""
+
+    def stream_connect(self, endpoint: str) -> Any:
+        """Handle a connected event stream.
+
+        The return value is passed to stream_disconnect.
+        """
+
+    def stream_disconnect(
+        self,
+        endpoint: str,
+        duration: float,
+        error: BaseException | None,
+        context: Any,
+    ) -> None:
+        """Handle a closed event stream that was connected for duration seconds."""
+
+    def event_received(self, ha_id: str, event_type: str) -> None:
+        """Handle a received server sent event, including keep-alive events."""
+
+    def event_decoded(self, event_type: str, duration: float) -> None:
+        """Handle an event decoded into an event message in duration seconds."""
+
+
+class InstrumentationGroup(Instrumentation):
+    """Pass the measurements to several instrumentations."""
+
+    def __init__(self, instrumentations: Iterable[Instrumentation] = ()) -> None:
+        """Initialize the group."""
+        self.instrumentations = list(instrumentations)
+
+    @override
+    def request_start(self, record: RequestRecord) -> list[Any]:
+        """Handle the start of a request."""
+        return [item.request_start(record) for item in self.instrumentations]
+
+    @override
+    def request_end(self, record: RequestRecord, context: list[Any]) -> None:
+        """Handle the end of a request."""
+        for item, item_context in zip(self.instrumentations, context, strict=True):
+            item.request_end(record, item_context)
+
+    @override
+    def request_retry(self, record: RequestRecord, attempt: int, delay: float) -> None:
+        """Handle a failed request that is retried."""
+        for item in self.instrumentations:
+            item.request_retry(record, attempt, delay)
+
+    @override
+    def token_refresh(self, duration: float, error: BaseException | None) -> None:
+        """Handle a new access token or a failure to get one."""
+        for item in self.instrumentations:
+            item.token_refresh(duration, error)
+
+    @override
+    def stream_connect(self, endpoint: str) -> list[Any]:
+        """Handle a connected event stream."""
+        return [item.stream_connect(endpoint) for item in self.instrumentations]
+
+    @override
+    def stream_disconnect(
+        self,
+        endpoint: str,
+        duration: float,
+        error: BaseException | None,
+        context: list[Any],
+    ) -> None:
+        """Handle a closed event stream."""
+        for item, item_context in zip(self.instrumentations, context, strict=True):
+            item.stream_disconnect(endpoint, duration, error, item_context)
+
+    @override
+    def event_received(self, ha_id: str, event_type: str) -> None:
+        """Handle a received server sent event."""
+        for item in self.instrumentations:
+            item.event_received(ha_id, event_type)
+
+    @override
+    def event_decoded(self, event_type: str, duration: float) -> None:
+        """Handle a decoded event."""
+        for item in self.instrumentations:
+            item.event_decoded(event_type, duration)
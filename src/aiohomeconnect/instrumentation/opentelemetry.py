@@ -0,0 +1,102 @@
+"""Provide OpenTelemetry spans of requests and event streams.
+
+This needs the opentelemetry-api package, e.g. from the opentelemetry extra.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, override
+
+from opentelemetry import trace
+from opentelemetry.trace import Span, SpanKind, Status, StatusCode, Tracer
+
+from . import Instrumentation, RequestRecord
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """Trace requests, event stream connections and access token refreshes.
+
+    A request span is named after the method and the endpoint template and
+    an event stream span lasts as long as the connection. Retries are added
+    as span events to the current span.
+    """
+
+    def __init__(self, tracer: Tracer | None = None) -> None:
+        """Initialize the instrumentation."""
+        self._tracer = tracer or trace.get_tracer("aiohomeconnect")
+
+    @override
+    def request_start(self, record: RequestRecord) -> Span:
+        """Start the span of a request."""
+        return self._tracer.start_span(
+            f"{record.method} {record.endpoint}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "http.request.method": record.method,
+                "url.template": record.endpoint,
+            },
+        )
+
+    @override
+    def request_end(self, record: RequestRecord, context: Span) -> None:
+        """End the span of a request."""
+        if record.status_code is not None:
+            context.set_attribute("http.response.status_code", record.status_code)
+            context.set_attribute("http.request.body.size", record.request_bytes)
+            context.set_attribute("http.response.body.size", record.response_bytes)
+        if record.error is not None:
+            context.record_exception(record.error)
+            context.set_status(Status(StatusCode.ERROR, str(record.error)))
+        elif record.status_code is not None and record.status_code >= 400:
+            context.set_status(Status(StatusCode.ERROR))
+        context.end()
+
+    @override
+    def request_retry(self, record: RequestRecord, attempt: int, delay: float) -> None:
+        """Add the retry to the current span."""
+        trace.get_current_span().add_event(
+            "retry",
+            {
+                "http.request.method": record.method,
+                "url.template": record.endpoint,
+                "attempt": attempt + 1,
+                "delay": delay,
+                "error": type(record.error).__name__,
+            },
+        )
+
+    @override
+    def token_refresh(self, duration: float, error: BaseException | None) -> None:
+        """Record a span of the access token refresh."""
+        end = time.time_ns()
+        span = self._tracer.start_span(
+            "access token refresh", start_time=end - int(duration * 1e9)
+        )
+        if error is not None:
+            span.record_exception(error)
+            span.set_status(Status(StatusCode.ERROR, str(error)))
+        span.end(end_time=end)
+
+    @override
+    def stream_connect(self, endpoint: str) -> Span:
+        """Start the span of an event stream connection."""
+        return self._tracer.start_span(
+            f"GET {endpoint}",
+            kind=SpanKind.CLIENT,
+            attributes={"http.request.method": "GET", "url.template": endpoint},
+        )
+
+    @override
+    def stream_disconnect(
+        self,
+        endpoint: str,
+        duration: float,
+        error: BaseException | None,
+        context: Any,
+    ) -> None:
+        """End the span of an event stream connection."""
+        if error is not None:
+            context.record_exception(error)
+            context.set_status(Status(StatusCode.ERROR, str(error)))
+        context.end()
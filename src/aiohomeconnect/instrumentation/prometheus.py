@@ -0,0 +1,125 @@
+"""Provide Prometheus metrics of requests and event streams.
+
+This needs the prometheus-client package, e.g. from the prometheus extra.
+"""
+
+from __future__ import annotations
+
+from typing import Any, override
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram
+
+from . import Instrumentation, RequestRecord
+
+DECODE_BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 1e-2)
+
+
+class PrometheusInstrumentation(Instrumentation):
+    """Count requests and events and observe their durations.
+
+    Requests are labeled by method and endpoint template, so appliance ids
+    do not create new time series.
+    """
+
+    def __init__(
+        self,
+        registry: CollectorRegistry = REGISTRY,
+        namespace: str = "aiohomeconnect",
+    ) -> None:
+        """Initialize the metrics in the registry."""
+        options: dict[str, Any] = {"namespace": namespace, "registry": registry}
+        self.requests = Counter(
+            "requests",
+            "Requests by method, endpoint and status.",
+            ["method", "endpoint", "status"],
+            **options,
+        )
+        self.request_duration = Histogram(
+            "request_duration_seconds",
+            "Request duration.",
+            ["method", "endpoint"],
+            **options,
+        )
+        self.request_bytes = Counter(
+            "request_bytes", "Bytes sent in request bodies.", **options
+        )
+        self.response_bytes = Counter(
+            "response_bytes", "Bytes received in response bodies.", **options
+        )
+        self.retries = Counter(
+            "retries",
+            "Retried requests by method and endpoint.",
+            ["method", "endpoint"],
+            **options,
+        )
+        self.token_refreshes = Counter(
+            "token_refreshes",
+            "Access token refreshes by result.",
+            ["result"],
+            **options,
+        )
+        self.streams = Gauge("event_streams", "Connected event streams.", **options)
+        self.stream_duration = Histogram(
+            "event_stream_duration_seconds",
+            "Duration of closed event stream connections.",
+            ["result"],
+            buckets=(1, 10, 60, 300, 900, 3600, 4 * 3600, 24 * 3600),
+            **options,
+        )
+        self.events = Counter("events", "Received events by type.", ["type"], **options)
+        self.event_decode_duration = Histogram(
+            "event_decode_duration_seconds",
+            "Event decode duration.",
+            buckets=DECODE_BUCKETS,
+            **options,
+        )
+
+    @override
+    def request_end(self, record: RequestRecord, context: Any) -> None:
+        """Count the request and observe its duration."""
+        status = "error" if record.status_code is None else str(record.status_code)
+        self.requests.labels(record.method, record.endpoint, status).inc()
+        self.request_duration.labels(record.method, record.endpoint).observe(
+            record.duration
+        )
+        self.request_bytes.inc(record.request_bytes)
+        self.response_bytes.inc(record.response_bytes)
+
+    @override
+    def request_retry(self, record: RequestRecord, attempt: int, delay: float) -> None:
+        """Count the retry."""
+        self.retries.labels(record.method, record.endpoint).inc()
+
+    @override
+    def token_refresh(self, duration: float, error: BaseException | None) -> None:
+        """Count the refresh."""
+        self.token_refreshes.labels("success" if error is None else "error").inc()
+
+    @override
+    def stream_connect(self, endpoint: str) -> None:
+        """Count the connected stream."""
+        self.streams.inc()
+
+    @override
+    def stream_disconnect(
+        self,
+        endpoint: str,
+        duration: float,
+        error: BaseException | None,
+        context: Any,
+    ) -> None:
+        """Count the closed stream and observe how long it was connected."""
+        self.streams.dec()
+        self.stream_duration.labels("closed" if error is None else "error").observe(
+            duration
+        )
+
+    @override
+    def event_received(self, ha_id: str, event_type: str) -> None:
+        """Count the event."""
+        self.events.labels(event_type).inc()
+
+    @override
+    def event_decoded(self, event_type: str, duration: float) -> None:
+        """Observe the decode duration."""
+        self.event_decode_duration.observe(duration)
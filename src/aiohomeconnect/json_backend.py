@@ -0,0 +1,102 @@
+"""Provide a pluggable JSON backend for Home Connect API payloads."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+import importlib
+import json
+from typing import Any
+
+from .const import LOGGER
+
+
+@dataclass(frozen=True)
+class JsonBackend:
+    """Represent a JSON backend.
+
+    The loads function must raise ValueError on invalid input.
+    """
+
+    name: str
+    loads: Callable[[bytes | str], Any]
+    dumps: Callable[[Any], bytes]
+
+
+def _stdlib_backend() -> JsonBackend:
+    """Return the standard library backend."""
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize to compact JSON bytes."""
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    return JsonBackend("json", json.loads, dumps)
+
+
+def _orjson_backend() -> JsonBackend:
+    """Return the orjson backend."""
+    orjson = importlib.import_module("orjson")
+    return JsonBackend("orjson", orjson.loads, orjson.dumps)
+
+
+def _msgspec_backend() -> JsonBackend:
+    """Return the msgspec backend."""
+    msgspec = importlib.import_module("msgspec")
+
+    def loads(data: bytes | str) -> Any:
+        """Deserialize JSON and raise ValueError on invalid input."""
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as err:
+            raise ValueError(str(err)) from err
+
+    return JsonBackend("msgspec", loads, msgspec.json.encode)
+
+
+BACKEND_FACTORIES: dict[str, Callable[[], JsonBackend]] = {
+    "orjson": _orjson_backend,
+    "msgspec": _msgspec_backend,
+    "json": _stdlib_backend,
+}
+
+
+def _load_backend(name: str | None = None) -> JsonBackend:
+    """Load the named backend or the fastest one installed."""
+    if name is not None:
+        return BACKEND_FACTORIES[name]()
+    for factory in BACKEND_FACTORIES.values():
+        try:
+            return factory()
+        except ImportError:
+            continue
+    raise RuntimeError("No JSON backend available")
+
+
+_backend = _load_backend()
+LOGGER.debug("Using JSON backend: %s", _backend.name)
+
+
+def get_json_backend() -> JsonBackend:
+    """Return the active JSON backend."""
+    return _backend
+
+
+def set_json_backend(backend: JsonBackend | str | None = None) -> JsonBackend:
+    """Set the active JSON backend.
+
+    Pass a backend, the name of a bundled backend
+    ("orjson", "msgspec" or "json") or None to select the fastest one installed.
+    """
+    global _backend  # noqa: PLW0603
+    _backend = backend if isinstance(backend, JsonBackend) else _load_backend(backend)
+    return _backend
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Deserialize JSON with the active backend."""
+    return _backend.loads(data)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize JSON with the active backend."""
+    return _backend.dumps(obj)
@@ -0,0 +1,15 @@
+"""Provide an in-process stand-in for the Home Connect API.
+
+The transport is passed to httpx.AsyncClient, so a Client can be load and
+soak tested against many virtual appliances without any network.
+"""
+
+from .appliance import ProgramScript, VirtualAppliance
+from .transport import FaultInjection, MockHomeConnect
+
+__all__ = [
+    "FaultInjection",
+    "MockHomeConnect",
+    "ProgramScript",
+    "VirtualAppliance",
+]
@@ -0,0 +1,122 @@
+"""Provide the virtual appliances of the mock Home Connect API."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohomeconnect.model import (
+    CommandKey,
+    OptionKey,
+    ProgramKey,
+    SettingKey,
+    StatusKey,
+)
+
+
+@dataclass(frozen=True)
+class ProgramScript:
+    """Represent how a started program runs on a virtual appliance.
+
+    The program sends a progress notification per step, interval seconds
+    apart, and finishes after the last step. The duration is the remaining
+    program time reported when the program starts.
+    """
+
+    steps: int = 10
+    interval: float = 0.0
+    duration: int = 3600
+
+
+@dataclass
+class VirtualAppliance:
+    """Represent the state of a virtual appliance.
+
+    Status, settings and program options are mapped from the raw key to the
+    value. Images are mapped from the image key to the image content.
+    """
+
+    ha_id: str
+    name: str = "Dishwasher"
+    type: str = "Dishwasher"
+    brand: str = "BOSCH"
+    vib: str = "HCS06COM1"
+    e_number: str = "SMV4HCX48E/11"
+    connected: bool = True
+    programs: list[str] = field(
+        default_factory=lambda: [
+            ProgramKey.DISHCARE_DISHWASHER_ECO_50,
+            ProgramKey.DISHCARE_DISHWASHER_AUTO_2,
+            ProgramKey.DISHCARE_DISHWASHER_QUICK_45,
+        ]
+    )
+    program_options: dict[str, Any] = field(
+        default_factory=lambda: {
+            OptionKey.BSH_COMMON_START_IN_RELATIVE: 0,
+            OptionKey.DISHCARE_DISHWASHER_HALF_LOAD: False,
+        }
+    )
+    status: dict[str, Any] = field(
+        default_factory=lambda: {
+            StatusKey.BSH_COMMON_DOOR_STATE: "BSH.Common.EnumType.DoorState.Closed",
+            StatusKey.BSH_COMMON_OPERATION_STATE: (
+                "BSH.Common.EnumType.OperationState.Ready"
+            ),
+            StatusKey.BSH_COMMON_REMOTE_CONTROL_START_ALLOWED: True,
+        }
+    )
+    settings: dict[str, Any] = field(
+        default_factory=lambda: {
+            SettingKey.BSH_COMMON_POWER_STATE: "BSH.Common.EnumType.PowerState.On",
+            SettingKey.BSH_COMMON_CHILD_LOCK: False,
+        }
+    )
+    commands: list[str] = field(
+        default_factory=lambda: [
+            CommandKey.BSH_COMMON_PAUSE_PROGRAM,
+            CommandKey.BSH_COMMON_RESUME_PROGRAM,
+        ]
+    )
+    images: dict[str, bytes] = field(default_factory=dict)
+    script: ProgramScript = field(default_factory=ProgramScript)
+    active_program: str | None = None
+    active_options: dict[str, Any] = field(default_factory=dict)
+    selected_program: str | None = None
+    selected_options: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the appliance as returned by the API."""
+        return {
+            "haId": self.ha_id,
+            "name": self.name,
+            "type": self.type,
+            "brand": self.brand,
+            "vib": self.vib,
+            "enumber": self.e_number,
+            "connected": self.connected,
+        }
+
+    def program_definition(self, program_key: str) -> dict[str, Any]:
+        """Return the definition of an available program."""
+        return {
+            "key": program_key,
+            "options": [
+                {
+                    "key": key,
+                    "type": _value_type(value),
+                    "constraints": {"default": value},
+                }
+                for key, value in self.program_options.items()
+            ],
+        }
+
+
+def _value_type(value: Any) -> str:
+    """Return the API type name of a value."""
+    if isinstance(value, bool):
+        return "Boolean"
+    if isinstance(value, int):
+        return "Int"
+    if isinstance(value, float):
+        return "Double"
+    return "String"
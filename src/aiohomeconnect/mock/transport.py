@@ -0,0 +1,646 @@
+"""Provide an in-process transport that simulates the Home Connect API."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable, Iterable
+from dataclasses import dataclass
+import json
+import random
+import time
+from typing import Any
+
+from httpx import AsyncBaseTransport, AsyncByteStream, Request, Response
+
+from aiohomeconnect.connectivity import APPLIANCE_ENDPOINT
+from aiohomeconnect.endpoint import endpoint_template, get_ha_id, split_path
+from aiohomeconnect.model import EventKey, EventType, StatusKey
+
+from .appliance import VirtualAppliance
+
+JSON_HEADERS = {"content-type": "application/vnd.bsh.sdk.v1+json"}
+SSE_HEADERS = {"content-type": "text/event-stream"}
+KEEP_ALIVE_FRAME = b"event: KEEP-ALIVE\ndata: \n\n"
+OPERATION_STATE = "BSH.Common.EnumType.OperationState."
+
+type Handler = Callable[[VirtualAppliance, list[str], Any], Response]
+
+
+@dataclass(frozen=True)
+class FaultInjection:
+    """Represent the share of requests that fail with an injected error.
+
+    Rate limited responses carry a Retry-After header of retry_after seconds.
+    """
+
+    rate_limit_rate: float = 0.0
+    server_error_rate: float = 0.0
+    retry_after: int = 1
+
+
+class _EventStream(AsyncByteStream):
+    """Represent the byte stream of an event stream connection."""
+
+    def __init__(
+        self, transport: MockHomeConnect, ha_id: str | None, keep_alive: float
+    ) -> None:
+        """Initialize the stream."""
+        self.ha_id = ha_id
+        self.queue: asyncio.Queue[bytes | None] = asyncio.Queue()
+        self._transport = transport
+        self._keep_alive = keep_alive
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """Yield the event frames until the stream is closed."""
+        while True:
+            try:
+                frame = await asyncio.wait_for(self.queue.get(), self._keep_alive)
+            except TimeoutError:
+                frame = KEEP_ALIVE_FRAME
+            if frame is None:
+                return
+            yield frame
+
+    async def aclose(self) -> None:
+        """Stop receiving events."""
+        self._transport.streams.discard(self)
+
+
+class MockHomeConnect(AsyncBaseTransport):
+    """Simulate the Home Connect API for a set of virtual appliances.
+
+    Every endpoint used by Client is served from the state of the virtual
+    appliances, and both event endpoints stream the events caused by writes,
+    program runs and connection changes. Each request waits latency seconds
+    plus a random jitter and may fail according to the fault injection.
+    """
+
+    def __init__(
+        self,
+        appliances: Iterable[VirtualAppliance] = (),
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        faults: FaultInjection | None = None,
+        keep_alive: float = 55.0,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the transport."""
+        self.appliances = {appliance.ha_id: appliance for appliance in appliances}
+        self.latency = latency
+        self.jitter = jitter
+        self.faults = faults or FaultInjection()
+        self.keep_alive = keep_alive
+        self.streams: set[_EventStream] = set()
+        self._stream_connected = asyncio.Event()
+        self.request_count = 0
+        self.fault_count = 0
+        self._random = random.Random(seed)  # noqa: S311
+        self._program_tasks: dict[str, asyncio.Task[None]] = {}
+        self._handlers: dict[tuple[str, str], Handler] = {
+            ("GET", "/homeappliances/{haId}"): self._get_appliance,
+            ("GET", "/homeappliances/{haId}/programs"): self._get_programs,
+            ("GET", "/homeappliances/{haId}/programs/available"): (
+                self._get_available_programs
+            ),
+            ("GET", "/homeappliances/{haId}/programs/available/{programKey}"): (
+                self._get_available_program
+            ),
+            ("GET", "/homeappliances/{haId}/programs/active"): self._get_program,
+            ("PUT", "/homeappliances/{haId}/programs/active"): self._start_program,
+            ("DELETE", "/homeappliances/{haId}/programs/active"): self._stop_program,
+            ("GET", "/homeappliances/{haId}/programs/selected"): self._get_program,
+            ("PUT", "/homeappliances/{haId}/programs/selected"): (self._select_program),
+            ("GET", "/homeappliances/{haId}/programs/active/options"): (
+                self._get_options
+            ),
+            ("PUT", "/homeappliances/{haId}/programs/active/options"): (
+                self._set_options
+            ),
+            ("GET", "/homeappliances/{haId}/programs/active/options/{optionKey}"): (
+                self._get_option
+            ),
+            ("PUT", "/homeappliances/{haId}/programs/active/options/{optionKey}"): (
+                self._set_option
+            ),
+            ("GET", "/homeappliances/{haId}/programs/selected/options"): (
+                self._get_options
+            ),
+            ("PUT", "/homeappliances/{haId}/programs/selected/options"): (
+                self._set_options
+            ),
+            ("GET", "/homeappliances/{haId}/programs/selected/options/{optionKey}"): (
+                self._get_option
+            ),
+            ("PUT", "/homeappliances/{haId}/programs/selected/options/{optionKey}"): (
+                self._set_option
+            ),
+            ("GET", "/homeappliances/{haId}/images"): self._get_images,
+            ("GET", "/homeappliances/{haId}/images/{imageKey}"): self._get_image,
+            ("GET", "/homeappliances/{haId}/settings"): self._get_settings,
+            ("PUT", "/homeappliances/{haId}/settings"): self._set_settings,
+            ("GET", "/homeappliances/{haId}/settings/{settingKey}"): (
+                self._get_setting
+            ),
+            ("PUT", "/homeappliances/{haId}/settings/{settingKey}"): (
+                self._set_setting
+            ),
+            ("GET", "/homeappliances/{haId}/status"): self._get_status,
+            (
+                "GET",
+                "/homeappliances/{haId}/status/{statusKey}",
+            ): self._get_status_value,
+            ("GET", "/homeappliances/{haId}/commands"): self._get_commands,
+            ("PUT", "/homeappliances/{haId}/commands"): self._put_commands,
+            ("PUT", "/homeappliances/{haId}/commands/{commandKey}"): (
+                self._put_command
+            ),
+        }
+
+    @classmethod
+    def create(cls, count: int, **kwargs: Any) -> MockHomeConnect:
+        """Create a transport with a number of default virtual appliances."""
+        return cls(
+            (
+                VirtualAppliance(f"BOSCH-HCS06COM1-{index:012X}")
+                for index in range(count)
+            ),
+            **kwargs,
+        )
+
+    async def handle_async_request(self, request: Request) -> Response:
+        """Answer a request like the Home Connect API."""
+        self.request_count += 1
+        if delay := self.latency + self._random.uniform(0, self.jitter):
+            await asyncio.sleep(delay)
+        if "authorization" not in request.headers:
+            return _error(401, "invalid_token", "Missing access token")
+        if (fault := self._inject_fault()) is not None:
+            return fault
+        return self._route(request)
+
+    def _route(self, request: Request) -> Response:
+        """Answer a request from the state of the virtual appliances."""
+        path = request.url.path.removeprefix("/api")
+        parts = split_path(path)
+        if parts[-1] == "events" and request.method == "GET":
+            return self._connect_events(get_ha_id(path))
+        if parts == ["homeappliances"] and request.method == "GET":
+            return _data(
+                {
+                    "homeappliances": [
+                        appliance.to_dict() for appliance in self.appliances.values()
+                    ]
+                }
+            )
+        template = endpoint_template(path)
+        if (handler := self._handlers.get((request.method, template))) is None:
+            return _error(404, "SDK.Error.ResourceNotFound", "Resource not found")
+        if (appliance := self.appliances.get(parts[1])) is None:
+            return _error(404, "SDK.Error.HomeAppliance.NotFound", "Unknown appliance")
+        if not appliance.connected and template != APPLIANCE_ENDPOINT:
+            return _error(
+                409,
+                "SDK.Error.HomeAppliance.Connection.Initialization.Failed",
+                "The home appliance is offline",
+            )
+        body = json.loads(request.content)["data"] if request.content else None
+        return handler(appliance, parts, body)
+
+    async def aclose(self) -> None:
+        """Stop the running programs and close the event streams."""
+        for task in self._program_tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._program_tasks.values(), return_exceptions=True)
+        for stream in self.streams:
+            stream.queue.put_nowait(None)
+
+    def emit(
+        self,
+        ha_id: str,
+        event_type: EventType,
+        items: dict[str, Any] | None = None,
+    ) -> None:
+        """Send an event to the event streams of an appliance.
+
+        The items are mapped from the event key to the value.
+        """
+        if items is None:
+            data = ""
+        else:
+            timestamp = int(time.time())
+            data = json.dumps(
+                {
+                    "items": [
+                        {
+                            "key": key,
+                            "value": value,
+                            "timestamp": timestamp,
+                            "level": "hint",
+                            "handling": "none",
+                            "uri": f"/api/homeappliances/{ha_id}",
+                        }
+                        for key, value in items.items()
+                    ]
+                }
+            )
+        frame = f"data: {data}\nevent: {event_type}\nid: {ha_id}\n\n".encode()
+        for stream in self.streams:
+            if stream.ha_id in (None, ha_id):
+                stream.queue.put_nowait(frame)
+
+    def set_connected(self, ha_id: str, *, connected: bool) -> None:
+        """Connect or disconnect an appliance."""
+        self.appliances[ha_id].connected = connected
+        self.emit(ha_id, EventType.CONNECTED if connected else EventType.DISCONNECTED)
+
+    def pair(self, appliance: VirtualAppliance) -> None:
+        """Pair an appliance with the account."""
+        self.appliances[appliance.ha_id] = appliance
+        self.emit(appliance.ha_id, EventType.PAIRED)
+
+    def depair(self, ha_id: str) -> None:
+        """Remove an appliance from the account."""
+        if (task := self._program_tasks.pop(ha_id, None)) is not None:
+            task.cancel()
+        del self.appliances[ha_id]
+        self.emit(ha_id, EventType.DEPAIRED)
+
+    async def wait_streams(self, count: int = 1) -> None:
+        """Wait until at least count event streams are connected."""
+        while len(self.streams) < count:
+            self._stream_connected.clear()
+            await self._stream_connected.wait()
+
+    async def wait_programs(self) -> None:
+        """Wait for the running programs to finish."""
+        await asyncio.gather(*self._program_tasks.values())
+
+    def _inject_fault(self) -> Response | None:
+        """Return an injected error response or None."""
+        faults = self.faults
+        roll = self._random.random()
+        if roll < faults.rate_limit_rate:
+            self.fault_count += 1
+            return _error(
+                429,
+                "429",
+                "The rate limit has been reached",
+                {"Retry-After": str(faults.retry_after)},
+            )
+        if roll < faults.rate_limit_rate + faults.server_error_rate:
+            self.fault_count += 1
+            return _error(500, "500", "Internal server error")
+        return None
+
+    def _connect_events(self, ha_id: str | None) -> Response:
+        """Open an event stream of an appliance or of all appliances."""
+        stream = _EventStream(self, ha_id, self.keep_alive)
+        self.streams.add(stream)
+        self._stream_connected.set()
+        return Response(200, headers=SSE_HEADERS, stream=stream)
+
+    def _get_appliance(
+        self, appliance: VirtualAppliance, _: list[str], __: Any
+    ) -> Response:
+        """Return an appliance."""
+        return _data(appliance.to_dict())
+
+    def _get_programs(
+        self, appliance: VirtualAppliance, _: list[str], __: Any
+    ) -> Response:
+        """Return all programs."""
+        return _data(
+            {
+                "programs": [
+                    {
+                        "key": key,
+                        "constraints": {
+                            "available": True,
+                            "execution": "selectandstart",
+                        },
+                    }
+                    for key in appliance.programs
+                ]
+            }
+        )
+
+    def _get_available_programs(
+        self, appliance: VirtualAppliance, _: list[str], __: Any
+    ) -> Response:
+        """Return the available programs."""
+        if appliance.active_program is not None:
+            return _data({"programs": []})
+        return _data(
+            {
+                "programs": [
+                    {"key": key, "constraints": {"execution": "selectandstart"}}
+                    for key in appliance.programs
+                ]
+            }
+        )
+
+    def _get_available_program(
+        self, appliance: VirtualAppliance, parts: list[str], _: Any
+    ) -> Response:
+        """Return the definition of an available program."""
+        program_key = parts[-1]
+        if program_key not in appliance.programs:
+            return _error(404, "SDK.Error.UnsupportedProgram", "Unknown program")
+        return _data(appliance.program_definition(program_key))
+
+    def _get_program(
+        self, appliance: VirtualAppliance, parts: list[str], _: Any
+    ) -> Response:
+        """Return the active or the selected program."""
+        if parts[3] == "active":
+            key, options = appliance.active_program, appliance.active_options
+            error_key = "SDK.Error.NoProgramActive"
+        else:
+            key, options = appliance.selected_program, appliance.selected_options
+            error_key = "SDK.Error.NoProgramSelected"
+        if key is None:
+            return _error(404, error_key, "There is no such program")
+        return _data({"key": key, "options": _items(options)})
+
+    def _start_program(
+        self, appliance: VirtualAppliance, _: list[str], body: Any
+    ) -> Response:
+        """Start a program and run its script."""
+        if appliance.active_program is not None:
+            return _error(409, "SDK.Error.WrongOperationState", "A program is active")
+        if body["key"] not in appliance.programs:
+            return _error(409, "SDK.Error.UnsupportedProgram", "Unknown program")
+        appliance.active_program = body["key"]
+        appliance.active_options = appliance.program_options | {
+            option["key"]: option["value"] for option in body.get("options") or ()
+        }
+        self._program_tasks[appliance.ha_id] = asyncio.create_task(
+            self._run_program(appliance)
+        )
+        return Response(204)
+
+    def _stop_program(
+        self, appliance: VirtualAppliance, _: list[str], __: Any
+    ) -> Response:
+        """Stop the active program."""
+        if (task := self._program_tasks.pop(appliance.ha_id, None)) is None:
+            return _error(409, "SDK.Error.WrongOperationState", "No program is active")
+        task.cancel()
+        self._end_program(appliance, "Ready")
+        return Response(204)
+
+    def _select_program(
+        self, appliance: VirtualAppliance, _: list[str], body: Any
+    ) -> Response:
+        """Select a program."""
+        if body["key"] not in appliance.programs:
+            return _error(409, "SDK.Error.UnsupportedProgram", "Unknown program")
+        appliance.selected_program = body["key"]
+        appliance.selected_options = appliance.program_options | {
+            option["key"]: option["value"] for option in body.get("options") or ()
+        }
+        self.emit(
+            appliance.ha_id,
+            EventType.NOTIFY,
+            {EventKey.BSH_COMMON_ROOT_SELECTED_PROGRAM: body["key"]},
+        )
+        return Response(204)
+
+    def _get_options(
+        self, appliance: VirtualAppliance, parts: list[str], _: Any
+    ) -> Response:
+        """Return the options of the active or the selected program."""
+        return _data({"options": _items(_program_options(appliance, parts[3]))})
+
+    def _set_options(
+        self, appliance: VirtualAppliance, parts: list[str], body: Any
+    ) -> Response:
+        """Set options of the active or the selected program."""
+        return self._update_options(
+            appliance,
+            parts[3],
+            {option["key"]: option["value"] for option in body["options"]},
+        )
+
+    def _get_option(
+        self, appliance: VirtualAppliance, parts: list[str], _: Any
+    ) -> Response:
+        """Return an option of the active or the selected program."""
+        options = _program_options(appliance, parts[3])
+        if (option_key := parts[-1]) not in options:
+            return _error(404, "SDK.Error.UnsupportedOption", "Unknown option")
+        return _data({"key": option_key, "value": options[option_key]})
+
+    def _set_option(
+        self, appliance: VirtualAppliance, parts: list[str], body: Any
+    ) -> Response:
+        """Set an option of the active or the selected program."""
+        return self._update_options(appliance, parts[3], {parts[-1]: body["value"]})
+
+    def _get_images(
+        self, appliance: VirtualAppliance, _: list[str], __: Any
+    ) -> Response:
+        """Return the available images."""
+        return _data(
+            {
+                "images": [
+                    {
+                        "key": "Cooking.Oven.Image.Camera",
+                        "imagekey": image_key,
+                        "previewimagekey": image_key,
+                        "timestamp": int(time.time()),
+                        "quality": "high",
+                    }
+                    for image_key in appliance.images
+                ]
+            }
+        )
+
+    def _get_image(
+        self, appliance: VirtualAppliance, parts: list[str], _: Any
+    ) -> Response:
+        """Return the content of an image."""
+        if (content := appliance.images.get(parts[-1])) is None:
+            return _error(404, "SDK.Error.ImageNotFound", "Unknown image")
+        return Response(200, headers={"content-type": "image/jpeg"}, content=content)
+
+    def _get_settings(
+        self, appliance: VirtualAppliance, _: list[str], __: Any
+    ) -> Response:
+        """Return the settings."""
+        return _data({"settings": _items(appliance.settings)})
+
+    def _set_settings(
+        self, appliance: VirtualAppliance, _: list[str], body: Any
+    ) -> Response:
+        """Set settings."""
+        items = body.get("settings") or body["data"]
+        return self._update_settings(
+            appliance, {item["key"]: item["value"] for item in items}
+        )
+
+    def _get_setting(
+        self, appliance: VirtualAppliance, parts: list[str], _: Any
+    ) -> Response:
+        """Return a setting."""
+        if (setting_key := parts[-1]) not in appliance.settings:
+            return _error(404, "SDK.Error.UnsupportedSetting", "Unknown setting")
+        return _data({"key": setting_key, "value": appliance.settings[setting_key]})
+
+    def _set_setting(
+        self, appliance: VirtualAppliance, parts: list[str], body: Any
+    ) -> Response:
+        """Set a setting."""
+        return self._update_settings(appliance, {parts[-1]: body["value"]})
+
+    def _get_status(
+        self, appliance: VirtualAppliance, _: list[str], __: Any
+    ) -> Response:
+        """Return the status."""
+        return _data({"status": _items(appliance.status)})
+
+    def _get_status_value(
+        self, appliance: VirtualAppliance, parts: list[str], _: Any
+    ) -> Response:
+        """Return a status value."""
+        if (status_key := parts[-1]) not in appliance.status:
+            return _error(404, "SDK.Error.UnsupportedStatus", "Unknown status")
+        return _data({"key": status_key, "value": appliance.status[status_key]})
+
+    def _get_commands(
+        self, appliance: VirtualAppliance, _: list[str], __: Any
+    ) -> Response:
+        """Return the available commands."""
+        return _data({"commands": [{"key": key} for key in appliance.commands]})
+
+    def _put_commands(
+        self, appliance: VirtualAppliance, _: list[str], body: Any
+    ) -> Response:
+        """Execute commands."""
+        items = body.get("commands") or body["data"]
+        if any(item["key"] not in appliance.commands for item in items):
+            return _error(409, "SDK.Error.UnsupportedCommand", "Unknown command")
+        return Response(204)
+
+    def _put_command(
+        self, appliance: VirtualAppliance, parts: list[str], _: Any
+    ) -> Response:
+        """Execute a command."""
+        if parts[-1] not in appliance.commands:
+            return _error(409, "SDK.Error.UnsupportedCommand", "Unknown command")
+        return Response(204)
+
+    def _update_options(
+        self, appliance: VirtualAppliance, which: str, values: dict[str, Any]
+    ) -> Response:
+        """Update program options and notify the event streams."""
+        _program_options(appliance, which).update(values)
+        self.emit(appliance.ha_id, EventType.NOTIFY, values)
+        return Response(204)
+
+    def _update_settings(
+        self, appliance: VirtualAppliance, values: dict[str, Any]
+    ) -> Response:
+        """Update settings and notify the event streams."""
+        if unknown := values.keys() - appliance.settings.keys():
+            return _error(
+                409, "SDK.Error.UnsupportedSetting", f"Unknown settings {unknown}"
+            )
+        appliance.settings.update(values)
+        self.emit(appliance.ha_id, EventType.NOTIFY, values)
+        return Response(204)
+
+    async def _run_program(self, appliance: VirtualAppliance) -> None:
+        """Run the script of the active program of an appliance."""
+        ha_id = appliance.ha_id
+        script = appliance.script
+        self.emit(
+            ha_id,
+            EventType.NOTIFY,
+            {EventKey.BSH_COMMON_ROOT_ACTIVE_PROGRAM: appliance.active_program},
+        )
+        self._set_operation_state(appliance, "Run")
+        for step in range(1, script.steps + 1):
+            await asyncio.sleep(script.interval)
+            self.emit(
+                ha_id,
+                EventType.NOTIFY,
+                {
+                    EventKey.BSH_COMMON_OPTION_PROGRAM_PROGRESS: (
+                        step * 100 // script.steps
+                    ),
+                    EventKey.BSH_COMMON_OPTION_REMAINING_PROGRAM_TIME: (
+                        script.duration - script.duration * step // script.steps
+                    ),
+                },
+            )
+        del self._program_tasks[ha_id]
+        self.emit(
+            ha_id,
+            EventType.EVENT,
+            {
+                EventKey.BSH_COMMON_EVENT_PROGRAM_FINISHED: (
+                    "BSH.Common.EnumType.EventPresentState.Present"
+                )
+            },
+        )
+        self._end_program(appliance, "Finished")
+
+    def _end_program(self, appliance: VirtualAppliance, operation_state: str) -> None:
+        """Clear the active program and notify the event streams."""
+        appliance.active_program = None
+        appliance.active_options = {}
+        self._set_operation_state(appliance, operation_state)
+        self.emit(
+            appliance.ha_id,
+            EventType.NOTIFY,
+            {EventKey.BSH_COMMON_ROOT_ACTIVE_PROGRAM: None},
+        )
+
+    def _set_operation_state(
+        self, appliance: VirtualAppliance, operation_state: str
+    ) -> None:
+        """Set the operation state and notify the event streams."""
+        value = f"{OPERATION_STATE}{operation_state}"
+        appliance.status[StatusKey.BSH_COMMON_OPERATION_STATE] = value
+        self.emit(
+            appliance.ha_id,
+            EventType.STATUS,
+            {EventKey.BSH_COMMON_STATUS_OPERATION_STATE: value},
+        )
+
+
+def _data(data: Any) -> Response:
+    """Return a response with the data envelope."""
+    return Response(
+        200, headers=JSON_HEADERS, content=json.dumps({"data": data}).encode()
+    )
+
+
+def _error(
+    status_code: int,
+    key: str,
+    description: str,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """Return an error response."""
+    return Response(
+        status_code,
+        headers={**JSON_HEADERS, **(headers or {})},
+        content=json.dumps(
+            {"error": {"key": key, "description": description}}
+        ).encode(),
+    )
+
+
+def _items(values: dict[str, Any]) -> list[dict[str, Any]]:
+    """Return values mapped from their key as a list of key and value items."""
+    return [{"key": key, "value": value} for key, value in values.items()]
+
+
+def _program_options(appliance: VirtualAppliance, which: str) -> dict[str, Any]:
+    """Return the options of the active or the selected program."""
+    if which == "active":
+        return appliance.active_options
+    return appliance.selected_options
@@ -18,6 +18,7 @@ from .event import (
     EventKey,
     EventMessage,
     EventType,
+    LazyEventMessage,
 )
 from .image import (
     ArrayOfImages,
@@ -63,6 +64,7 @@ __all__ = [
     "EventType",
     "GetSetting",
     "HomeAppliance",
+    "LazyEventMessage",
     "Option",
     "OptionKey",
     "Program",
@@ -115,3 +115,16 @@ class HomeConnectRequestError(HomeConnectError):
 
 class EventStreamInterruptedError(HomeConnectError):
     """Represent the error cause when the event stream ends abruptly."""
+
+
+class SlowConsumerError(HomeConnectError):
+    """Represent the error cause when a subscriber falls too far behind."""
+
+
+class ApplianceOfflineError(HomeConnectError):
+    """Represent the error cause when a request targets a disconnected appliance."""
+
+    def __init__(self, ha_id: str) -> None:
+        """Initialize the error."""
+        super().__init__(f"Appliance {ha_id} is disconnected")
+        self.ha_id = ha_id
@@ -5,17 +5,25 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from enum import StrEnum
 import json
+import re
+import sys
 
 from httpx_sse import ServerSentEvent
 from mashumaro import field_options
 from mashumaro.mixins.json import DataClassJSONMixin
 
 from aiohomeconnect.const import LOGGER
+from aiohomeconnect.model.key_resolver import KeyResolver
 from aiohomeconnect.model.program import OptionKey
 from aiohomeconnect.model.setting import SettingKey
 from aiohomeconnect.model.status import StatusKey
 
 
+def resolve_event_key(value: str) -> EventKey:
+    """Return the event key of a raw key."""
+    return _EVENT_KEYS(value)
+
+
 @dataclass
 class ArrayOfEvents(DataClassJSONMixin):
     """Represent ArrayOfEvents."""
@@ -23,11 +31,15 @@ class ArrayOfEvents(DataClassJSONMixin):
     items: list[Event]
 
 
-@dataclass
+@dataclass(slots=True)
 class Event(DataClassJSONMixin):
-    """Represent Event."""
+    """Represent Event.
+
+    Events are slotted and their raw key, level and handling strings are
+    interned, since long event histories are kept in memory.
+    """
 
-    key: EventKey
+    key: EventKey = field(metadata=field_options(deserialize=resolve_event_key))
     raw_key: str = field(metadata=field_options(alias="key"))
     timestamp: int
     level: str
@@ -40,6 +52,26 @@ class Event(DataClassJSONMixin):
     )
     unit: str | None = None
 
+    def __post_init__(self) -> None:
+        """Intern the strings that repeat across events."""
+        self.raw_key = sys.intern(self.raw_key)
+        self.level = sys.intern(self.level)
+        self.handling = sys.intern(self.handling)
+
+
+# Find the event keys in the raw data of a server sent event without decoding it.
+RAW_KEY_PATTERN = re.compile(r'"key"\s*:\s*"([^"]*)"')
+
+
+def decode_events(data: str) -> ArrayOfEvents:
+    """Decode the data of a server sent event."""
+    if not data:
+        return ArrayOfEvents([])
+    decoded = json.loads(data)
+    if "items" in decoded:
+        return ArrayOfEvents.from_dict(decoded)
+    return ArrayOfEvents([Event.from_dict(decoded)])
+
 
 @dataclass
 class EventMessage:
@@ -52,21 +84,71 @@ class EventMessage:
     @classmethod
     def from_server_sent_event(cls, sse: ServerSentEvent) -> EventMessage:
         """Create an EventMessage instance from a server sent event."""
-        if not sse.data:
-            return cls(
-                ha_id=sse.id,
-                type=EventType(sse.event),
-                data=ArrayOfEvents([]),
-            )
-        data = json.loads(sse.data)
-        if "items" in data:
-            events = ArrayOfEvents.from_dict(data)
-        else:
-            events = ArrayOfEvents([Event.from_dict(data)])
         return cls(
             ha_id=sse.id,
             type=EventType(sse.event),
-            data=events,
+            data=decode_events(sse.data),
+        )
+
+
+class LazyEventMessage(EventMessage):
+    """Represent an event message that decodes its items on first access.
+
+    The raw keys of the items can be peeked without decoding the message.
+    """
+
+    def __init__(self, ha_id: str, type: EventType, raw_data: str) -> None:  # noqa: A002
+        """Initialize the event message."""
+        self.ha_id = ha_id
+        self.type = type
+        self.raw_data = raw_data
+        self._data: ArrayOfEvents | None = None
+
+    @classmethod
+    def from_server_sent_event(cls, sse: ServerSentEvent) -> LazyEventMessage:
+        """Create a LazyEventMessage instance from a server sent event."""
+        return cls(sse.id, EventType(sse.event), sse.data)
+
+    @property
+    def data(self) -> ArrayOfEvents:  # type: ignore[override]
+        """Return the items, decoding them on first access."""
+        if self._data is None:
+            self._data = decode_events(self.raw_data)
+        return self._data
+
+    @property
+    def is_decoded(self) -> bool:
+        """Return True if the items have been decoded."""
+        return self._data is not None
+
+    @property
+    def raw_keys(self) -> list[str]:
+        """Return the raw keys of the items without decoding them."""
+        if self._data is not None:
+            return [event.raw_key for event in self._data.items]
+        return RAW_KEY_PATTERN.findall(self.raw_data)
+
+    def materialize(self) -> EventMessage:
+        """Return a fully decoded EventMessage."""
+        return EventMessage(self.ha_id, self.type, self.data)
+
+    def __eq__(self, other: object) -> bool:
+        """Return True if the other message has the same content."""
+        if not isinstance(other, EventMessage):
+            return NotImplemented
+        return (self.ha_id, self.type, self.data) == (
+            other.ha_id,
+            other.type,
+            other.data,
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Return the representation without decoding the items."""
+        return (
+            f"LazyEventMessage(ha_id={self.ha_id!r}, type={self.type!r}, "
+            f"raw_data={self.raw_data!r})"
         )
 
 
@@ -730,3 +812,6 @@ class EventType(StrEnum):
     DISCONNECTED = "DISCONNECTED"
     PAIRED = "PAIRED"
     DEPAIRED = "DEPAIRED"
+
+
+_EVENT_KEYS = KeyResolver(EventKey)
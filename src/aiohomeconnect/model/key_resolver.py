@@ -0,0 +1,36 @@
+"""Provide cached resolution of raw keys to key enum members."""
+
+from __future__ import annotations
+
+from enum import StrEnum
+
+# Limit how many unknown keys are remembered, in case an appliance sends
+# an unbounded number of them.
+MAX_UNKNOWN_KEYS = 4096
+
+
+class KeyResolver[KeyT: StrEnum]:
+    """Resolve raw keys to members of a key enum.
+
+    Known keys are looked up in a precomputed table. Unknown keys go through
+    the enum's _missing_ once and the result is remembered, so each unknown
+    key is only logged once.
+    """
+
+    def __init__(self, enum: type[KeyT]) -> None:
+        """Initialize the resolver."""
+        self._enum = enum
+        self._table: dict[str, KeyT] = {member.value: member for member in enum}
+        self._unknown = 0
+
+    def __call__(self, value: str) -> KeyT:
+        """Return the member of a raw key."""
+        try:
+            return self._table[value]
+        except KeyError:
+            pass
+        member = self._enum(value)
+        if self._unknown < MAX_UNKNOWN_KEYS:
+            self._table[value] = member
+            self._unknown += 1
+        return member
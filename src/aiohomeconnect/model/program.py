@@ -11,16 +11,35 @@ from mashumaro.config import BaseConfig
 from mashumaro.mixins.json import DataClassJSONMixin
 
 from aiohomeconnect.const import LOGGER
+from aiohomeconnect.model.key_resolver import KeyResolver
+
+
+def resolve_program_key(value: str) -> ProgramKey:
+    """Return the program key of a raw key."""
+    return _PROGRAM_KEYS(value)
+
+
+def resolve_option_key(value: str) -> OptionKey:
+    """Return the option key of a raw key."""
+    return _OPTION_KEYS(value)
 
 
 @dataclass
 class Program(DataClassJSONMixin):
     """Represent Program."""
 
-    key: ProgramKey | None = None
+    key: ProgramKey | None = field(
+        default=None, metadata=field_options(deserialize=resolve_program_key)
+    )
     name: str | None = None
     options: list[Option] | None = None
     constraints: ProgramConstraints | None = None
+    raw_key: str | None = field(
+        default=None,
+        kw_only=True,
+        compare=False,
+        metadata=field_options(alias="key", serialize="omit"),
+    )
 
     class Config(BaseConfig):
         """Config for mashumaro."""
@@ -53,7 +72,7 @@ class EnumerateAvailableProgramConstraints(DataClassJSONMixin):
 class EnumerateAvailableProgram(DataClassJSONMixin):
     """Represent EnumerateAvailableProgram."""
 
-    key: ProgramKey
+    key: ProgramKey = field(metadata=field_options(deserialize=resolve_program_key))
     raw_key: str = field(metadata=field_options(alias="key"))
     name: str | None = None
     constraints: EnumerateAvailableProgramConstraints | None = None
@@ -80,7 +99,7 @@ class EnumerateProgramConstraints(DataClassJSONMixin):
 class EnumerateProgram(DataClassJSONMixin):
     """Represent EnumerateProgram."""
 
-    key: ProgramKey
+    key: ProgramKey = field(metadata=field_options(deserialize=resolve_program_key))
     raw_key: str = field(metadata=field_options(alias="key"))
     name: str | None = None
     constraints: EnumerateProgramConstraints | None = None
@@ -99,7 +118,7 @@ class Execution(StrEnum):
 class ProgramDefinition(DataClassJSONMixin):
     """Represent ProgramDefinition."""
 
-    key: ProgramKey
+    key: ProgramKey = field(metadata=field_options(deserialize=resolve_program_key))
     name: str | None = None
     options: list[ProgramDefinitionOption] | None = None
 
@@ -129,7 +148,7 @@ class ProgramDefinitionConstraints(DataClassJSONMixin):
 class ProgramDefinitionOption(DataClassJSONMixin):
     """Represent ProgramDefinitionOption."""
 
-    key: OptionKey
+    key: OptionKey = field(metadata=field_options(deserialize=resolve_option_key))
     type: str
     name: str | None = None
     unit: str | None = None
@@ -140,13 +159,19 @@ class ProgramDefinitionOption(DataClassJSONMixin):
 class Option(DataClassJSONMixin):
     """Represent Option."""
 
-    key: OptionKey
+    key: OptionKey = field(metadata=field_options(deserialize=resolve_option_key))
     value: Any
     name: str | None = None
     display_value: str | None = field(
         default=None, metadata=field_options(alias="displayvalue")
     )
     unit: str | None = None
+    raw_key: str | None = field(
+        default=None,
+        kw_only=True,
+        compare=False,
+        metadata=field_options(alias="key", serialize="omit"),
+    )
 
     class Config(BaseConfig):
         """Config for mashumaro."""
@@ -985,3 +1010,7 @@ _mapped_program_keys = {
         ProgramKey.LAUNDRY_CARE_WASHER_DRYER_WOOL
     ),
 }
+
+
+_OPTION_KEYS = KeyResolver(OptionKey)
+_PROGRAM_KEYS = KeyResolver(ProgramKey)
@@ -10,13 +10,19 @@ from mashumaro import field_options
 from mashumaro.mixins.json import DataClassJSONMixin
 
 from aiohomeconnect.const import LOGGER
+from aiohomeconnect.model.key_resolver import KeyResolver
+
+
+def resolve_setting_key(value: str) -> SettingKey:
+    """Return the setting key of a raw key."""
+    return _SETTING_KEYS(value)
 
 
 @dataclass
 class GetSetting(DataClassJSONMixin):
     """Specific setting of the home appliance."""
 
-    key: SettingKey
+    key: SettingKey = field(metadata=field_options(deserialize=resolve_setting_key))
     raw_key: str = field(metadata=field_options(alias="key"))
     value: Any
     name: str | None = None
@@ -194,3 +200,6 @@ class SettingKey(StrEnum):
     REFRIGERATION_FRIDGE_FREEZER_SUPER_MODE_REFRIGERATOR = (
         "Refrigeration.FridgeFreezer.Setting.SuperModeRefrigerator"
     )
+
+
+_SETTING_KEYS = KeyResolver(SettingKey)
@@ -10,13 +10,19 @@ from mashumaro import field_options
 from mashumaro.mixins.json import DataClassJSONMixin
 
 from aiohomeconnect.const import LOGGER
+from aiohomeconnect.model.key_resolver import KeyResolver
+
+
+def resolve_status_key(value: str) -> StatusKey:
+    """Return the status key of a raw key."""
+    return _STATUS_KEYS(value)
 
 
 @dataclass
 class Status(DataClassJSONMixin):
     """Represent Status."""
 
-    key: StatusKey
+    key: StatusKey = field(metadata=field_options(deserialize=resolve_status_key))
     raw_key: str = field(metadata=field_options(alias="key"))
     value: Any
     name: str | None = None
@@ -147,3 +153,6 @@ class StatusKey(StrEnum):
     REFRIGERATION_COMMON_DOOR_WINE_COMPARTMENT = (
         "Refrigeration.Common.Status.Door.WineCompartment"
     )
+
+
+_STATUS_KEYS = KeyResolver(StatusKey)
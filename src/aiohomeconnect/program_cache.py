@@ -0,0 +1,126 @@
+"""Provide a persistent cache of program definitions per appliance model."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from pathlib import Path
+import re
+from typing import Any
+
+from .const import LOGGER
+from .json_backend import json_dumps, json_loads
+from .model import HomeAppliance, Language
+
+CACHE_VERSION = 1
+UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+
+
+@dataclass(frozen=True)
+class ApplianceModel:
+    """Represent the model of an appliance.
+
+    Program definitions and their constraints are static for a model.
+    """
+
+    vib: str
+    e_number: str
+
+    @classmethod
+    def from_appliance(cls, appliance: HomeAppliance) -> ApplianceModel:
+        """Return the model of an appliance."""
+        return cls(appliance.vib, appliance.e_number)
+
+
+class ProgramDefinitionCache:
+    """Store program definitions on disk per appliance model and language.
+
+    Each model and language is stored in one JSON file in the directory.
+    Files are read once and kept in memory. Disk access runs in a thread.
+    """
+
+    def __init__(self, directory: Path | str) -> None:
+        """Initialize the cache."""
+        self.directory = Path(directory)
+        self._files: dict[Path, dict[str, Any]] = {}
+        self._locks: dict[Path, asyncio.Lock] = {}
+
+    def _get_path(self, model: ApplianceModel, language: Language | None) -> Path:
+        """Return the path of the file of a model and language."""
+        name = f"{model.vib}_{model.e_number}_{language or 'default'}"
+        return self.directory / f"{UNSAFE_FILENAME_CHARS.sub('_', name)}.json"
+
+    async def _load(self, path: Path) -> dict[str, Any]:
+        """Return the program definitions of a file."""
+        if (programs := self._files.get(path)) is not None:
+            return programs
+        lock = self._locks.setdefault(path, asyncio.Lock())
+        async with lock:
+            if (programs := self._files.get(path)) is None:
+                programs = self._files[path] = await asyncio.to_thread(_read_file, path)
+        return programs
+
+    async def get(
+        self,
+        model: ApplianceModel,
+        language: Language | None,
+        program_key: str,
+    ) -> dict[str, Any] | None:
+        """Return the stored program definition data or None."""
+        programs = await self._load(self._get_path(model, language))
+        return programs.get(str(program_key))
+
+    async def set(
+        self,
+        model: ApplianceModel,
+        language: Language | None,
+        program_key: str,
+        data: dict[str, Any],
+    ) -> None:
+        """Store the program definition data and write it to disk."""
+        path = self._get_path(model, language)
+        programs = await self._load(path)
+        programs[str(program_key)] = data
+        content = json_dumps({"version": CACHE_VERSION, "programs": programs})
+        async with self._locks[path]:
+            try:
+                await asyncio.to_thread(_write_file, path, content)
+            except OSError as err:
+                LOGGER.warning("Failed to write program definitions %s: %s", path, err)
+
+    async def clear(self) -> None:
+        """Remove all stored program definitions."""
+        self._files.clear()
+        await asyncio.to_thread(_remove_files, self.directory)
+
+
+def _read_file(path: Path) -> dict[str, Any]:
+    """Read a file of program definitions.
+
+    Missing, unreadable and outdated files are treated as empty.
+    """
+    try:
+        content = json_loads(path.read_bytes())
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as err:
+        LOGGER.warning("Ignoring invalid program definitions %s: %s", path, err)
+        return {}
+    if not isinstance(content, dict) or content.get("version") != CACHE_VERSION:
+        return {}
+    programs = content.get("programs")
+    return programs if isinstance(programs, dict) else {}
+
+
+def _write_file(path: Path, content: bytes) -> None:
+    """Write a file atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_bytes(content)
+    tmp_path.replace(path)
+
+
+def _remove_files(directory: Path) -> None:
+    """Remove the files of program definitions in a directory."""
+    for path in directory.glob("*.json"):
+        path.unlink(missing_ok=True)
@@ -0,0 +1,150 @@
+"""Provide a client side rate limiter for Home Connect API."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from enum import StrEnum
+import time
+
+from .const import LOGGER
+from .endpoint import get_ha_id, split_path
+
+
+class EndpointClass(StrEnum):
+    """Represent a class of endpoints sharing a request budget."""
+
+    READ = "read"
+    WRITE = "write"
+    PROGRAM_START = "program_start"
+    EVENT_STREAM = "event_stream"
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Represent a budget of requests per period.
+
+    Burst is the number of requests that can be sent at once
+    and defaults to the whole budget.
+    """
+
+    requests: int
+    period: float
+    burst: int | None = None
+
+
+# The Home Connect API allows 50 requests per minute per client and account.
+DEFAULT_ACCOUNT_LIMIT = RateLimit(50, 60, burst=10)
+DEFAULT_APPLIANCE_LIMIT = RateLimit(20, 60, burst=5)
+DEFAULT_ENDPOINT_LIMITS: Mapping[EndpointClass, RateLimit] = {
+    EndpointClass.PROGRAM_START: RateLimit(5, 60, burst=2),
+    EndpointClass.EVENT_STREAM: RateLimit(5, 60, burst=2),
+}
+
+
+class TokenBucket:
+    """Represent a token bucket.
+
+    Tokens are reserved up front and the bucket may go into debt,
+    so callers are served in the order they reserve.
+    """
+
+    def __init__(
+        self, limit: RateLimit, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """Initialize the bucket."""
+        self._clock = clock
+        self.capacity = float(limit.burst or limit.requests)
+        self.rate = limit.requests / limit.period
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        """Refill the bucket with the tokens earned since the last update."""
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Reserve a token and return the seconds to wait before using it."""
+        self._refill()
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def pause(self, seconds: float) -> None:
+        """Empty the bucket so no token is available for the given seconds."""
+        self._refill()
+        self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+class RateLimiter:
+    """Queue requests to stay within the request budgets of an account.
+
+    Each request takes a token from the account budget, the budget of the
+    appliance it targets and the budget of its endpoint class.
+    """
+
+    def __init__(
+        self,
+        *,
+        account: RateLimit | None = DEFAULT_ACCOUNT_LIMIT,
+        appliance: RateLimit | None = DEFAULT_APPLIANCE_LIMIT,
+        endpoints: Mapping[EndpointClass, RateLimit] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the rate limiter."""
+        self._clock = clock
+        self._account = TokenBucket(account, clock) if account else None
+        self._appliance_limit = appliance
+        self._appliances: dict[str, TokenBucket] = {}
+        self._endpoints = {
+            endpoint_class: TokenBucket(limit, clock)
+            for endpoint_class, limit in (
+                DEFAULT_ENDPOINT_LIMITS if endpoints is None else endpoints
+            ).items()
+        }
+
+    def reserve(self, method: str, url: str) -> float:
+        """Reserve the tokens for a request and return the seconds to wait."""
+        ha_id, endpoint_class = classify_request(method, url)
+        buckets = [self._account, self._endpoints.get(endpoint_class)]
+        if ha_id is not None and self._appliance_limit is not None:
+            if (bucket := self._appliances.get(ha_id)) is None:
+                bucket = self._appliances[ha_id] = TokenBucket(
+                    self._appliance_limit, self._clock
+                )
+            buckets.append(bucket)
+        return max(
+            (bucket.reserve() for bucket in buckets if bucket is not None),
+            default=0.0,
+        )
+
+    async def acquire(self, method: str, url: str) -> None:
+        """Wait until the request can be sent within the budgets."""
+        if delay := self.reserve(method, url):
+            LOGGER.debug("Rate limited, delaying %s %s by %.2fs", method, url, delay)
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Hold all requests of the account for the given seconds."""
+        if self._account is not None:
+            self._account.pause(seconds)
+
+
+def classify_request(method: str, url: str) -> tuple[str | None, EndpointClass]:
+    """Return the appliance id and endpoint class of a request.
+
+    The url is the path below the api prefix, e.g. /homeappliances/{haId}/status.
+    """
+    parts = split_path(url)
+    ha_id = get_ha_id(url)
+    if parts[-1] == "events":
+        return ha_id, EndpointClass.EVENT_STREAM
+    if method == "GET":
+        return ha_id, EndpointClass.READ
+    if method == "PUT" and parts[2:] == ["programs", "active"]:
+        return ha_id, EndpointClass.PROGRAM_START
+    return ha_id, EndpointClass.WRITE
@@ -0,0 +1,75 @@
+"""Provide a retry policy for Home Connect API requests."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import random
+
+from .model.error import (
+    HomeConnectError,
+    HomeConnectRequestError,
+    InternalServerError,
+    RequestTimeoutError,
+    TooManyRequestsError,
+)
+
+RETRYABLE_ERRORS = (
+    HomeConnectRequestError,
+    InternalServerError,
+    RequestTimeoutError,
+    TooManyRequestsError,
+)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Represent when and how long to wait before retrying a request.
+
+    GET requests are retried on rate limiting, server errors, request
+    timeouts and transport errors. PUT requests are only retried if
+    retry_put is set, since the appliance may have applied the change.
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    retry_put: bool = False
+
+    def should_retry(self, method: str, error: HomeConnectError, attempt: int) -> bool:
+        """Return True if the failed attempt should be retried.
+
+        The attempt is counted from zero.
+        """
+        return (
+            attempt + 1 < self.max_attempts
+            and (method == "GET" or (method == "PUT" and self.retry_put))
+            and isinstance(error, RETRYABLE_ERRORS)
+        )
+
+    def delay(self, error: HomeConnectError, attempt: int) -> float:
+        """Return the seconds to wait before the next attempt.
+
+        The server's Retry-After is honored and a capped exponential
+        backoff with full jitter is added, so clients recovering from
+        the same outage do not retry in lockstep.
+        """
+        return backoff_delay(
+            error, attempt, base_delay=self.base_delay, max_delay=self.max_delay
+        )
+
+
+def backoff_delay(
+    error: HomeConnectError | None,
+    attempt: int,
+    *,
+    base_delay: float,
+    max_delay: float,
+) -> float:
+    """Return the seconds to wait after a failed attempt.
+
+    The attempt is counted from zero. The server's Retry-After is honored
+    and a capped exponential backoff with full jitter is added.
+    """
+    backoff = min(max_delay, base_delay * 2**attempt)
+    retry_after = error.retry_after if isinstance(error, TooManyRequestsError) else None
+    return (retry_after or 0) + random.uniform(0, backoff)  # noqa: S311
@@ -0,0 +1,52 @@
+"""Provide a way to share one in-flight call between concurrent callers."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+
+
+class SingleFlight[KeyT: Hashable, ResultT]:
+    """Share one in-flight call per key between concurrent callers.
+
+    The first caller makes the call itself and concurrent callers with the
+    same key wait for its result, so the common uncontended case does not
+    pay for creating a task.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the single flight."""
+        self._in_flight: dict[KeyT, asyncio.Future[ResultT]] = {}
+
+    def __contains__(self, key: KeyT) -> bool:
+        """Return True if a call for the key is in flight."""
+        return key in self._in_flight
+
+    async def run(self, key: KeyT, func: Callable[[], Awaitable[ResultT]]) -> ResultT:
+        """Return the result of the in-flight call for the key or make the call."""
+        if (future := self._in_flight.get(key)) is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if not future.cancelled() or (task and task.cancelling()):
+                    raise
+                # The caller making the call was cancelled, make a new call.
+                return await self.run(key, func)
+
+        future = self._in_flight[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as err:
+            future.set_exception(err)
+            # Mark the exception as retrieved in case no one else is waiting.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
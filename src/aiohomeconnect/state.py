@@ -0,0 +1,231 @@
+"""Provide an in-memory mirror of the state of Home Connect appliances."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .bulk import (
+    DEFAULT_MAX_CONCURRENCY,
+    ApplianceResult,
+    BulkResource,
+    fetch_appliances,
+)
+from .const import LOGGER
+from .model import EventKey, EventMessage, EventType, HomeAppliance, Language
+from .model.error import HomeConnectError
+from .stream import SupervisedEventStream
+
+if TYPE_CHECKING:
+    from .client import Client
+
+STATE_RESOURCES = (
+    BulkResource.STATUS,
+    BulkResource.SETTINGS,
+    BulkResource.ACTIVE_PROGRAM,
+    BulkResource.SELECTED_PROGRAM,
+)
+# The program of an appliance that cannot run programs is left unset.
+REQUIRED_RESOURCES = frozenset((BulkResource.STATUS, BulkResource.SETTINGS))
+
+
+@dataclass
+class ApplianceState:
+    """Represent the current state of an appliance.
+
+    Status, settings, program options and events are mapped from the raw key
+    to the latest value.
+    """
+
+    info: HomeAppliance
+    connected: bool
+    status: dict[str, Any] = field(default_factory=dict)
+    settings: dict[str, Any] = field(default_factory=dict)
+    options: dict[str, Any] = field(default_factory=dict)
+    events: dict[str, Any] = field(default_factory=dict)
+    active_program: str | None = None
+    selected_program: str | None = None
+
+    @property
+    def ha_id(self) -> str:
+        """Return the appliance id."""
+        return self.info.ha_id
+
+    def apply_event(self, event_message: EventMessage) -> None:
+        """Apply the items of an event message to the state."""
+        match event_message.type:
+            case EventType.STATUS:
+                for event in event_message.data.items:
+                    self.status[event.raw_key] = event.value
+            case EventType.EVENT:
+                for event in event_message.data.items:
+                    self.events[event.raw_key] = event.value
+            case EventType.NOTIFY:
+                for event in event_message.data.items:
+                    self._apply_notify(event.key, event.raw_key, event.value)
+            case EventType.CONNECTED:
+                self.connected = True
+            case EventType.DISCONNECTED:
+                self.connected = False
+
+    def _apply_notify(self, key: EventKey, raw_key: str, value: Any) -> None:
+        """Apply a notify event item to the state."""
+        if key is EventKey.BSH_COMMON_ROOT_ACTIVE_PROGRAM:
+            self.active_program = value
+        elif key is EventKey.BSH_COMMON_ROOT_SELECTED_PROGRAM:
+            self.selected_program = value
+        elif ".Option." in raw_key:
+            self.options[raw_key] = value
+        else:
+            self.settings[raw_key] = value
+
+
+class ApplianceStateStore:
+    """Mirror the state of the appliances of an account in memory.
+
+    Each appliance is fetched from the REST endpoints once and is then kept
+    up to date from the event stream. Reads do not make any request.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        *,
+        accept_language: Language | None = Language.EN,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
+        """Initialize the store."""
+        self._client = client
+        self._accept_language = accept_language
+        self._max_concurrency = max_concurrency
+        self._states: dict[str, ApplianceState] = {}
+
+    def __contains__(self, ha_id: str) -> bool:
+        """Return True if the appliance is in the store."""
+        return ha_id in self._states
+
+    def __getitem__(self, ha_id: str) -> ApplianceState:
+        """Return the state of an appliance."""
+        return self._states[ha_id]
+
+    def __iter__(self) -> Iterator[ApplianceState]:
+        """Iterate over the states of the appliances."""
+        return iter(self._states.values())
+
+    def __len__(self) -> int:
+        """Return the number of appliances."""
+        return len(self._states)
+
+    def get(self, ha_id: str) -> ApplianceState | None:
+        """Return the state of an appliance or None."""
+        return self._states.get(ha_id)
+
+    async def bootstrap(self) -> None:
+        """Fetch the state of all paired appliances.
+
+        An appliance whose status or settings fail is kept with the
+        resources that could be fetched.
+        """
+        result = await fetch_appliances(
+            self._client,
+            resources=STATE_RESOURCES,
+            max_concurrency=self._max_concurrency,
+            accept_language=self._accept_language,
+        )
+        states = {
+            appliance.ha_id: ApplianceState(appliance, connected=False)
+            for appliance in result.skipped
+        }
+        for ha_id, appliance_result in result.appliances.items():
+            for resource in REQUIRED_RESOURCES & appliance_result.errors.keys():
+                LOGGER.warning(
+                    "Failed to fetch the %s of %s: %s",
+                    resource,
+                    ha_id,
+                    appliance_result.errors[resource],
+                )
+            states[ha_id] = _create_state(appliance_result)
+        self._states = states
+
+    async def refresh(self, ha_id: str) -> ApplianceState:
+        """Fetch the info and state of an appliance."""
+        return await self.refresh_appliance(
+            await self._client.get_specific_appliance(ha_id)
+        )
+
+    async def refresh_appliance(self, appliance: HomeAppliance) -> ApplianceState:
+        """Fetch the state of an appliance whose info was already fetched."""
+        ha_id = appliance.ha_id
+        result = await fetch_appliances(
+            self._client,
+            [appliance],
+            STATE_RESOURCES,
+            accept_language=self._accept_language,
+        )
+        if (appliance_result := result.appliances.get(ha_id)) is None:
+            # Only the appliance info is available while it is disconnected.
+            state = ApplianceState(appliance, connected=False)
+        else:
+            for resource in REQUIRED_RESOURCES:
+                if (err := appliance_result.errors.get(resource)) is not None:
+                    raise err
+            state = _create_state(appliance_result)
+        self._states[ha_id] = state
+        return state
+
+    async def handle_event(self, event_message: EventMessage) -> None:
+        """Apply an event message from the event stream.
+
+        Paired and reconnected appliances are fetched again,
+        since events may have been missed while they were away.
+        """
+        ha_id = event_message.ha_id
+        match event_message.type:
+            case EventType.DEPAIRED:
+                self._states.pop(ha_id, None)
+                return
+            case EventType.PAIRED | EventType.CONNECTED:
+                try:
+                    await self.refresh(ha_id)
+                except HomeConnectError as err:
+                    LOGGER.warning("Failed to fetch the state of %s: %s", ha_id, err)
+                else:
+                    return
+        if (state := self._states.get(ha_id)) is not None:
+            state.apply_event(event_message)
+
+    async def run(self) -> None:
+        """Bootstrap the store and apply the events of all appliances.
+
+        The event stream reconnects after interruptions and the appliances
+        that may have changed during the gap are fetched again.
+        """
+        await self.bootstrap()
+        async for event_message in SupervisedEventStream(
+            self._client,
+            accept_language=self._accept_language,
+            appliances=[state.info for state in self._states.values()],
+            resync=self.refresh_appliance,
+        ):
+            await self.handle_event(event_message)
+
+
+def _create_state(appliance_result: ApplianceResult) -> ApplianceState:
+    """Create the state of a connected appliance from its fetched resources."""
+    state = ApplianceState(appliance_result.appliance, connected=True)
+    if (status := appliance_result.status) is not None:
+        state.status = {item.raw_key: item.value for item in status.status}
+    if (settings := appliance_result.settings) is not None:
+        state.settings = {item.raw_key: item.value for item in settings.settings}
+    active = appliance_result.active_program
+    selected = appliance_result.selected_program
+    for program in (selected, active):
+        if program is not None and program.options:
+            state.options.update(
+                (option.raw_key or option.key, option.value)
+                for option in program.options
+            )
+    state.active_program = (active.raw_key or active.key) if active else None
+    state.selected_program = (selected.raw_key or selected.key) if selected else None
+    return state
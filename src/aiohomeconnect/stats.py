@@ -0,0 +1,226 @@
+"""Provide in-process request statistics for Home Connect API."""
+
+from __future__ import annotations
+
+from collections import Counter, deque
+from collections.abc import Callable
+from dataclasses import dataclass
+import math
+import time
+
+from httpx import codes
+from mashumaro.mixins.json import DataClassJSONMixin
+
+# The Home Connect API allows 1000 requests per client and account per day.
+DEFAULT_DAILY_QUOTA = 1000
+QUOTA_WINDOW = 86400.0
+QUOTA_RESOLUTION = 60.0
+# Latencies keep 7 significant bits, a relative error below 1 %.
+SIGNIFICANT_BITS = 7
+
+
+class LatencyHistogram:
+    """Record latencies in logarithmic buckets like an HDR histogram.
+
+    Latencies are counted in microseconds rounded down to SIGNIFICANT_BITS
+    significant bits, so the number of buckets only grows with the
+    magnitude of the latencies and not with the number of requests.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the histogram."""
+        self._counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Record a latency in seconds."""
+        value = int(seconds * 1_000_000)
+        shift = max(value.bit_length() - SIGNIFICANT_BITS, 0)
+        bucket = value >> shift << shift
+        self._counts[bucket] = self._counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self) -> float:
+        """Return the mean latency in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        """Return the latency in seconds below which the percentile falls.
+
+        The latency is the highest value of its bucket, limited to the
+        recorded range.
+        """
+        if not self.count:
+            return 0.0
+        rank = max(math.ceil(percentile / 100 * self.count), 1)
+        seen = 0
+        for bucket in sorted(self._counts):
+            seen += self._counts[bucket]
+            if seen >= rank:
+                break
+        shift = max(bucket.bit_length() - SIGNIFICANT_BITS, 0)
+        highest = (bucket + (1 << shift) - 1) / 1_000_000
+        return min(max(highest, self.min), self.max)
+
+
+class QuotaWindow:
+    """Count the requests sent within a rolling window.
+
+    Requests are counted in slots of resolution seconds, so a request
+    leaves the window at most resolution seconds late.
+    """
+
+    def __init__(
+        self,
+        limit: int = DEFAULT_DAILY_QUOTA,
+        window: float = QUOTA_WINDOW,
+        resolution: float = QUOTA_RESOLUTION,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the window."""
+        self.limit = limit
+        self.window = window
+        self.resolution = resolution
+        self._clock = clock
+        self._slot_count = math.ceil(window / resolution)
+        self._slots: deque[list[int]] = deque()
+        self._used = 0
+
+    def _expire(self) -> int:
+        """Drop the slots that left the window and return the current slot."""
+        slot = int(self._clock() // self.resolution)
+        oldest = slot - self._slot_count + 1
+        while self._slots and self._slots[0][0] < oldest:
+            self._used -= self._slots.popleft()[1]
+        return slot
+
+    def add(self) -> None:
+        """Count a request."""
+        slot = self._expire()
+        if self._slots and self._slots[-1][0] == slot:
+            self._slots[-1][1] += 1
+        else:
+            self._slots.append([slot, 1])
+        self._used += 1
+
+    @property
+    def used(self) -> int:
+        """Return the number of requests within the window."""
+        self._expire()
+        return self._used
+
+
+@dataclass(frozen=True)
+class EndpointSnapshot(DataClassJSONMixin):
+    """Represent the statistics of an endpoint.
+
+    Latencies are in seconds.
+    """
+
+    requests: int
+    too_many_requests: int
+    min: float
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+
+@dataclass(frozen=True)
+class QuotaSnapshot(DataClassJSONMixin):
+    """Represent the use of the daily request quota."""
+
+    limit: int
+    used: int
+    window: float
+
+    @property
+    def remaining(self) -> int:
+        """Return the number of requests left within the window."""
+        return max(self.limit - self.used, 0)
+
+    @property
+    def usage(self) -> float:
+        """Return the used share of the quota."""
+        return self.used / self.limit
+
+
+@dataclass(frozen=True)
+class StatsSnapshot(DataClassJSONMixin):
+    """Represent the request statistics at a point in time.
+
+    Endpoints are keyed by their endpoint template,
+    e.g. /homeappliances/{haId}/status. A long-running client can dump the
+    snapshot with to_json, so the statistics can be read without making
+    requests.
+    """
+
+    endpoints: dict[str, EndpointSnapshot]
+    quota: QuotaSnapshot
+    too_many_requests: int
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests to all endpoints."""
+        return sum(endpoint.requests for endpoint in self.endpoints.values())
+
+
+class ClientStats:
+    """Keep statistics of the responses received from the API.
+
+    Every response counts against the daily quota, including error
+    responses, retries and event stream connections. Requests that
+    received no response are not counted.
+    """
+
+    def __init__(
+        self,
+        *,
+        daily_quota: int = DEFAULT_DAILY_QUOTA,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the statistics."""
+        self.quota = QuotaWindow(daily_quota, clock=clock)
+        self._latencies: dict[str, LatencyHistogram] = {}
+        self._too_many_requests: Counter[str] = Counter()
+
+    def record(self, endpoint: str, status_code: int, duration: float) -> None:
+        """Record a response of an endpoint template."""
+        if (latency := self._latencies.get(endpoint)) is None:
+            latency = self._latencies[endpoint] = LatencyHistogram()
+        latency.record(duration)
+        self.quota.add()
+        if status_code == codes.TOO_MANY_REQUESTS:
+            self._too_many_requests[endpoint] += 1
+
+    def snapshot(self) -> StatsSnapshot:
+        """Return the current statistics."""
+        return StatsSnapshot(
+            endpoints={
+                endpoint: EndpointSnapshot(
+                    requests=latency.count,
+                    too_many_requests=self._too_many_requests[endpoint],
+                    min=latency.min,
+                    mean=latency.mean,
+                    p50=latency.percentile(50),
+                    p90=latency.percentile(90),
+                    p99=latency.percentile(99),
+                    max=latency.max,
+                )
+                for endpoint, latency in self._latencies.items()
+            },
+            quota=QuotaSnapshot(
+                limit=self.quota.limit,
+                used=self.quota.used,
+                window=self.quota.window,
+            ),
+            too_many_requests=self._too_many_requests.total(),
+        )
@@ -0,0 +1,242 @@
+"""Provide a supervised event stream that reconnects and resyncs after gaps."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from dataclasses import dataclass
+import math
+import time
+from typing import TYPE_CHECKING, Any
+
+from .const import LOGGER
+from .event_filter import EventFilter
+from .model import ArrayOfEvents, EventMessage, EventType, HomeAppliance, Language
+from .model.error import (
+    EventStreamInterruptedError,
+    HomeConnectError,
+    HomeConnectRequestError,
+    InternalServerError,
+    RequestTimeoutError,
+    TooManyRequestsError,
+)
+from .retry import backoff_delay
+
+if TYPE_CHECKING:
+    from .client import Client
+
+RECONNECT_ERRORS = (
+    EventStreamInterruptedError,
+    HomeConnectRequestError,
+    InternalServerError,
+    RequestTimeoutError,
+    TooManyRequestsError,
+)
+
+
+@dataclass(frozen=True)
+class ReconnectPolicy:
+    """Represent how long to wait before reconnecting the event stream.
+
+    The backoff is reset when a connection stayed up for stable_after seconds.
+    """
+
+    base_delay: float = 1.0
+    max_delay: float = 300.0
+    stable_after: float = 60.0
+
+    def delay(self, error: HomeConnectError | None, attempt: int) -> float:
+        """Return the seconds to wait before the next connection attempt.
+
+        The delay is computed like the delay of RetryPolicy.
+        """
+        return backoff_delay(
+            error, attempt, base_delay=self.base_delay, max_delay=self.max_delay
+        )
+
+
+class SupervisedEventStream:
+    """Stream the events of all appliances and reconnect after interruptions.
+
+    Transient errors reconnect with backoff instead of ending the stream.
+    After a gap, the appliance list is fetched once and connection changes
+    that were missed are yielded as CONNECTED, DISCONNECTED, PAIRED and
+    DEPAIRED messages. The API does not replay missed events, so appliances
+    that stayed connected and may have changed during the gap are passed to
+    the resync callback with their fetched info, with at most
+    max_concurrent_resyncs callbacks running at a time.
+
+    An appliance may have changed if it sent an event within active_window
+    seconds before the gap, e.g. while running a program, or if the gap
+    lasted at least full_resync_after seconds. Idle appliances are not
+    resynced after shorter gaps, so a change made on such an appliance
+    during the gap is only seen with its next event. Appliances that stayed
+    disconnected are skipped. The connection states before the first gap
+    are taken from the given appliances. Without them, all connected
+    appliances are resynced after the first gap.
+
+    The event filter is applied to the missed messages as well.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        *,
+        accept_language: Language | None = Language.EN,
+        event_filter: EventFilter | None = None,
+        lazy: bool = False,
+        policy: ReconnectPolicy | None = None,
+        appliances: Iterable[HomeAppliance] | None = None,
+        resync: Callable[[HomeAppliance], Awaitable[Any]] | None = None,
+        max_concurrent_resyncs: int = 4,
+        active_window: float = 600.0,
+        full_resync_after: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the stream."""
+        self._client = client
+        self._accept_language = accept_language
+        self._event_filter = event_filter
+        self._lazy = lazy
+        self._policy = policy or ReconnectPolicy()
+        self._resync = resync
+        self._max_concurrent_resyncs = max_concurrent_resyncs
+        self._active_window = active_window
+        self._full_resync_after = full_resync_after
+        self._clock = clock
+        self._connected: dict[str, bool] | None = (
+            None
+            if appliances is None
+            else {appliance.ha_id: appliance.connected for appliance in appliances}
+        )
+        self.last_event_at: dict[str, float] = {}
+
+    async def __aiter__(self) -> AsyncIterator[EventMessage]:
+        """Yield the events of all appliances until the iteration is stopped."""
+        attempt = 0
+        gap_started_at: float | None = None
+        while True:
+            connected_at = self._clock()
+            error: HomeConnectError | None = None
+            try:
+                if gap_started_at is not None:
+                    for event_message in await self._resync_gap(gap_started_at):
+                        if self._event_filter is None or (
+                            self._event_filter.apply(event_message) is not None
+                        ):
+                            yield event_message
+                    gap_started_at = None
+                async for event_message in self._client.stream_all_events(
+                    accept_language=self._accept_language,
+                    event_filter=self._event_filter,
+                    lazy=self._lazy,
+                ):
+                    self._track(event_message)
+                    yield event_message
+            except RECONNECT_ERRORS as err:
+                error = err
+            if self._clock() - connected_at >= self._policy.stable_after:
+                attempt = 0
+            if gap_started_at is None:
+                gap_started_at = self._clock()
+            delay = self._policy.delay(error, attempt)
+            LOGGER.warning(
+                "Event stream interrupted (%s), reconnecting in %.1fs",
+                f"{type(error).__name__}: {error}" if error else "stream ended",
+                delay,
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _track(self, event_message: EventMessage) -> None:
+        """Track the last event time and connection state of an appliance."""
+        ha_id = event_message.ha_id
+        self.last_event_at[ha_id] = self._clock()
+        if self._connected is None:
+            return
+        match event_message.type:
+            case EventType.CONNECTED | EventType.PAIRED:
+                self._connected[ha_id] = True
+            case EventType.DISCONNECTED:
+                self._connected[ha_id] = False
+            case EventType.DEPAIRED:
+                self._connected.pop(ha_id, None)
+                self.last_event_at.pop(ha_id, None)
+
+    async def _resync_gap(self, gap_started_at: float) -> list[EventMessage]:
+        """Fetch what changed during a gap and return the missed messages."""
+        if (cache := self._client.cache) is not None:
+            cache.invalidate()
+        appliances = {
+            appliance.ha_id: appliance
+            for appliance in (await self._client.get_home_appliances()).homeappliances
+        }
+        current = {
+            ha_id: appliance.connected for ha_id, appliance in appliances.items()
+        }
+        previous = self._connected
+        self._connected = current
+        gap = self._clock() - gap_started_at
+        if previous is None:
+            # Nothing is known from before the gap, so everything may have changed.
+            missed: list[EventMessage] = []
+            stale = [ha_id for ha_id, connected in current.items() if connected]
+        else:
+            missed = _missed_messages(previous, current)
+            active_since = gap_started_at - self._active_window
+            stale = [
+                ha_id
+                for ha_id, connected in current.items()
+                if connected
+                and previous.get(ha_id)
+                and (
+                    gap >= self._full_resync_after
+                    or self.last_event_at.get(ha_id, -math.inf) >= active_since
+                )
+            ]
+        LOGGER.debug(
+            "Resyncing %s of %s appliances after a %.1fs gap",
+            len(stale),
+            len(current),
+            gap,
+        )
+        if self._resync is not None and stale:
+            await self._run_resyncs(
+                self._resync, [appliances[ha_id] for ha_id in stale]
+            )
+        return missed
+
+    async def _run_resyncs(
+        self,
+        resync: Callable[[HomeAppliance], Awaitable[Any]],
+        appliances: list[HomeAppliance],
+    ) -> None:
+        """Run the resync callback for the appliances with bounded concurrency."""
+        semaphore = asyncio.Semaphore(self._max_concurrent_resyncs)
+
+        async def run(appliance: HomeAppliance) -> None:
+            """Run the resync callback for one appliance."""
+            async with semaphore:
+                try:
+                    await resync(appliance)
+                except HomeConnectError as err:
+                    LOGGER.warning("Failed to resync %s: %s", appliance.ha_id, err)
+
+        await asyncio.gather(*(run(appliance) for appliance in appliances))
+
+
+def _missed_messages(
+    previous: dict[str, bool], current: dict[str, bool]
+) -> list[EventMessage]:
+    """Return the connection messages missed between two appliance lists."""
+    missed = [
+        EventMessage(ha_id, EventType.DEPAIRED, ArrayOfEvents([]))
+        for ha_id in previous.keys() - current.keys()
+    ]
+    for ha_id, connected in current.items():
+        if ha_id not in previous:
+            missed.append(EventMessage(ha_id, EventType.PAIRED, ArrayOfEvents([])))
+        elif connected != previous[ha_id]:
+            event_type = EventType.CONNECTED if connected else EventType.DISCONNECTED
+            missed.append(EventMessage(ha_id, event_type, ArrayOfEvents([])))
+    return missed
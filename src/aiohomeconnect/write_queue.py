@@ -0,0 +1,116 @@
+"""Provide ordered queues of the writes to each appliance."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from .endpoint import endpoint_template
+
+# Writes to these endpoints set a single value and may replace each other.
+MERGEABLE_PLACEHOLDERS = ("{settingKey}", "{optionKey}")
+
+
+@dataclass
+class _Write:
+    """Represent a pending write and the callers waiting for it."""
+
+    path: str
+    call: Callable[[], Awaitable[Any]]
+    mergeable: bool
+    futures: list[asyncio.Future[Any]]
+
+    async def send(self) -> None:
+        """Send the write and pass its result to the waiting callers.
+
+        The write is skipped if all of its callers are gone.
+        """
+        if all(future.done() for future in self.futures):
+            return
+        try:
+            result = await self.call()
+        except Exception as err:  # noqa: BLE001
+            for future in self.futures:
+                if not future.done():
+                    future.set_exception(err)
+        else:
+            for future in self.futures:
+                if not future.done():
+                    future.set_result(result)
+
+
+class WriteQueue:
+    """Send the writes to each appliance one at a time and in order.
+
+    Writes to different appliances are sent in parallel. A pending write of
+    a setting or an option is replaced by a newer write of the same key, so
+    only the last value is sent and all callers receive its result. Writes
+    are only merged across other pending setting and option writes, which
+    keeps their order relative to writes like starting a program.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the queue."""
+        self._pending: dict[str, deque[_Write]] = {}
+        self._workers: dict[str, asyncio.Task[None]] = {}
+        self.merged = 0
+
+    def pending(self, ha_id: str) -> int:
+        """Return the number of writes to an appliance waiting to be sent."""
+        return len(self._pending.get(ha_id, ()))
+
+    async def submit(
+        self,
+        ha_id: str,
+        method: str,
+        path: str,
+        call: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Queue a write to an appliance and return its result once sent."""
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        queue = self._pending.setdefault(ha_id, deque())
+        mergeable = method == "PUT" and endpoint_template(path).endswith(
+            MERGEABLE_PLACEHOLDERS
+        )
+        if not mergeable or not self._merge(queue, path, call, future):
+            queue.append(_Write(path, call, mergeable, [future]))
+        if ha_id not in self._workers:
+            self._workers[ha_id] = asyncio.create_task(self._run(ha_id, queue))
+        return await future
+
+    def _merge(
+        self,
+        queue: deque[_Write],
+        path: str,
+        call: Callable[[], Awaitable[Any]],
+        future: asyncio.Future[Any],
+    ) -> bool:
+        """Replace a pending write of the same key and return True if found."""
+        for write in reversed(queue):
+            if not write.mergeable:
+                return False
+            if write.path == path:
+                write.call = call
+                write.futures.append(future)
+                self.merged += 1
+                return True
+        return False
+
+    async def _run(self, ha_id: str, queue: deque[_Write]) -> None:
+        """Send the queued writes to an appliance until the queue is empty."""
+        writes: list[_Write] = []
+        try:
+            while queue:
+                write = queue.popleft()
+                writes = [write]
+                await write.send()
+        finally:
+            del self._workers[ha_id]
+            del self._pending[ha_id]
+            # Callers are not left waiting if the worker is cancelled.
+            for write in (*writes, *queue):
+                for future in write.futures:
+                    future.cancel()
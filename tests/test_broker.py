@@ -0,0 +1,218 @@
+"""Test the event broker."""
+
+import asyncio
+from collections.abc import AsyncIterator
+
+from httpx_sse import ServerSentEvent
+import pytest
+
+from aiohomeconnect.broker import EventBroker, SlowConsumerPolicy
+from aiohomeconnect.event_filter import EventFilter
+from aiohomeconnect.model import (
+    ArrayOfEvents,
+    Event,
+    EventKey,
+    EventMessage,
+    EventType,
+)
+from aiohomeconnect.model.error import (
+    EventStreamInterruptedError,
+    HomeConnectError,
+    SlowConsumerError,
+)
+
+from .test_client import OTHER_HA_ID, TEST_HA_ID
+
+
+def make_message(
+    ha_id: str = TEST_HA_ID,
+    event_type: EventType = EventType.STATUS,
+    keys: tuple[EventKey, ...] = (EventKey.BSH_COMMON_STATUS_DOOR_STATE,),
+) -> EventMessage:
+    """Return an event message with an item per key."""
+    return EventMessage(
+        ha_id,
+        event_type,
+        ArrayOfEvents(
+            [
+                Event(
+                    key=key,
+                    raw_key=key.value,
+                    timestamp=0,
+                    level="hint",
+                    handling="none",
+                    value=None,
+                )
+                for key in keys
+            ]
+        ),
+    )
+
+
+class QueueSource:
+    """Represent an event source fed by the test."""
+
+    def __init__(self) -> None:
+        """Initialize the source."""
+        self.queue: asyncio.Queue[EventMessage | Exception] = asyncio.Queue()
+        self.iterations = 0
+
+    async def __aiter__(self) -> AsyncIterator[EventMessage]:
+        """Yield the queued messages and raise queued errors."""
+        self.iterations += 1
+        while True:
+            item = await self.queue.get()
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+
+def test_event_filter() -> None:
+    """Test filtering messages and items."""
+    message = make_message(
+        keys=(
+            EventKey.BSH_COMMON_STATUS_DOOR_STATE,
+            EventKey.BSH_COMMON_STATUS_OPERATION_STATE,
+        )
+    )
+    connected = make_message(event_type=EventType.CONNECTED, keys=())
+
+    assert EventFilter().apply(message) is message
+    assert EventFilter.create(ha_ids=[OTHER_HA_ID]).apply(message) is None
+    assert EventFilter.create(event_types=[EventType.NOTIFY]).apply(message) is None
+    key_filter = EventFilter.create(
+        event_keys=[EventKey.BSH_COMMON_STATUS_OPERATION_STATE]
+    )
+    filtered = key_filter.apply(message)
+    assert filtered is not None
+    assert [event.key for event in filtered.data.items] == [
+        EventKey.BSH_COMMON_STATUS_OPERATION_STATE
+    ]
+    assert len(message.data.items) == 2
+    assert key_filter.apply(connected) is connected
+    assert (
+        EventFilter.create(event_keys=[EventKey.BSH_COMMON_ROOT_ACTIVE_PROGRAM]).apply(
+            message
+        )
+        is None
+    )
+
+
+async def test_fan_out() -> None:
+    """Test that one source is shared by filtered subscribers."""
+    source = QueueSource()
+    async with EventBroker(source) as broker:
+        all_events = broker.subscribe()
+        other = broker.subscribe(EventFilter.create(ha_ids=[OTHER_HA_ID]))
+        message = make_message()
+        other_message = make_message(OTHER_HA_ID)
+        source.queue.put_nowait(message)
+        source.queue.put_nowait(other_message)
+
+        assert await anext(all_events) is message
+        assert await anext(all_events) is other_message
+        assert await anext(other) is other_message
+
+        other.close()
+        assert broker.subscriptions == (all_events,)
+        with pytest.raises(StopAsyncIteration):
+            await anext(other)
+
+    assert source.iterations == 1
+    assert not broker.subscriptions
+    assert [message async for message in all_events] == []
+
+
+@pytest.mark.parametrize(
+    ("policy", "expected", "dropped"),
+    [
+        (SlowConsumerPolicy.DROP_OLDEST, [1, 2], 1),
+        (SlowConsumerPolicy.DROP_NEWEST, [0, 1], 1),
+    ],
+)
+async def test_drop_policy(
+    policy: SlowConsumerPolicy, expected: list[int], dropped: int
+) -> None:
+    """Test that a slow subscriber drops messages according to the policy."""
+    broker = EventBroker(QueueSource())
+    subscription = broker.subscribe(maxsize=2, policy=policy)
+    messages = [make_message(str(index)) for index in range(3)]
+    for message in messages:
+        broker.publish(message)
+    subscription.close()
+
+    assert [message async for message in subscription] == [
+        messages[index] for index in expected
+    ]
+    assert subscription.dropped == dropped
+
+
+async def test_disconnect_policy() -> None:
+    """Test that a slow subscriber is disconnected."""
+    broker = EventBroker(QueueSource())
+    subscription = broker.subscribe(maxsize=1, policy=SlowConsumerPolicy.DISCONNECT)
+    message = make_message()
+    broker.publish(message)
+    broker.publish(make_message())
+
+    assert subscription.closed
+    assert not broker.subscriptions
+    assert await anext(subscription) is message
+    with pytest.raises(SlowConsumerError):
+        await anext(subscription)
+
+
+async def test_source_error() -> None:
+    """Test that a failing source closes the subscriptions with the error."""
+    source = QueueSource()
+    broker = EventBroker(source)
+    subscription = broker.subscribe()
+    broker.start()
+    source.queue.put_nowait(EventStreamInterruptedError("interrupted"))
+
+    with pytest.raises(EventStreamInterruptedError):
+        await anext(subscription)
+    await broker.stop()
+
+
+async def test_unexpected_source_error(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that an unexpected source error closes the subscriptions."""
+    source = QueueSource()
+    broker = EventBroker(source)
+    subscriptions = [broker.subscribe(), broker.subscribe()]
+    broker.start()
+    source.queue.put_nowait(make_message())
+    source.queue.put_nowait(ValueError("malformed payload"))
+
+    for subscription in subscriptions:
+        assert await anext(subscription) is not None
+        with pytest.raises(HomeConnectError, match="malformed payload") as exc_info:
+            await anext(subscription)
+        assert isinstance(exc_info.value.__cause__, ValueError)
+    assert not broker.subscriptions
+    assert "Event broker source failed unexpectedly" in caplog.text
+    await broker.stop()
+
+
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    [
+        ("", True),
+        ('{"key": "BSH.Common.Option.ProgramProgress", "value": 10}', False),
+        ('{"items": [{"key": "BSH.Common.Status.DoorState"}]}', True),
+        ('{"items": [{"key":"Cooking.Oven.Status.CurrentCavityTemperature"}]}', True),
+    ],
+)
+def test_event_filter_server_sent_event(data: str, *, expected: bool) -> None:
+    """Test filtering raw server sent events by key prefix."""
+    event_filter = EventFilter.create(
+        key_prefixes=["BSH.Common.Status.*"],
+        event_keys=[EventKey.COOKING_OVEN_STATUS_CURRENT_CAVITY_TEMPERATURE],
+    )
+
+    assert (
+        event_filter.matches_server_sent_event(
+            ServerSentEvent(EventType.STATUS, data, TEST_HA_ID)
+        )
+        is expected
+    )
@@ -0,0 +1,129 @@
+"""Test fetching the resources of many appliances."""
+
+import asyncio
+
+from httpx import AsyncClient, Request, Response
+from pytest_httpx import HTTPXMock
+
+from aiohomeconnect.bulk import BulkResource, fetch_appliances
+from aiohomeconnect.client import Client
+from aiohomeconnect.model import HomeAppliance, ProgramKey
+from aiohomeconnect.model.error import HomeConnectError, InternalServerError
+
+from .test_client import OTHER_HA_ID, TEST_APPLIANCE, TEST_HA_ID, AuthClient
+
+
+def make_appliance(ha_id: str, *, connected: bool = True) -> HomeAppliance:
+    """Return an appliance."""
+    return HomeAppliance.from_dict(
+        TEST_APPLIANCE | {"haId": ha_id, "connected": connected}
+    )
+
+
+async def test_fetch_appliances(
+    httpx_client: AsyncClient, httpx_mock: HTTPXMock
+) -> None:
+    """Test partial results, per appliance errors and skipped appliances."""
+    httpx_mock.add_response(
+        url="https://example.com/api/homeappliances",
+        json={
+            "data": {
+                "homeappliances": [
+                    TEST_APPLIANCE,
+                    TEST_APPLIANCE | {"haId": OTHER_HA_ID, "connected": False},
+                ]
+            }
+        },
+    )
+    base_url = f"https://example.com/api/homeappliances/{TEST_HA_ID}"
+    httpx_mock.add_response(url=f"{base_url}/status", json={"data": {"status": []}})
+    httpx_mock.add_response(
+        url=f"{base_url}/settings",
+        status_code=500,
+        json={"error": {"key": "500"}},
+    )
+    httpx_mock.add_response(
+        url=f"{base_url}/programs/active",
+        status_code=404,
+        json={"error": {"key": "SDK.Error.NoProgramActive"}},
+    )
+    httpx_mock.add_response(
+        url=f"{base_url}/programs/selected",
+        json={"data": {"key": ProgramKey.DISHCARE_DISHWASHER_ECO_50.value}},
+    )
+    client = Client(AuthClient(httpx_client, "https://example.com"))
+
+    result = await fetch_appliances(
+        client,
+        resources=[
+            BulkResource.STATUS,
+            BulkResource.SETTINGS,
+            BulkResource.ACTIVE_PROGRAM,
+            BulkResource.SELECTED_PROGRAM,
+        ],
+    )
+
+    assert [appliance.ha_id for appliance in result.skipped] == [OTHER_HA_ID]
+    assert list(result.appliances) == [TEST_HA_ID]
+    appliance_result = result.appliances[TEST_HA_ID]
+    assert appliance_result.status is not None
+    assert appliance_result.settings is None
+    assert appliance_result.active_program is None
+    assert appliance_result.selected_program is not None
+    assert appliance_result.selected_program.key is (
+        ProgramKey.DISHCARE_DISHWASHER_ECO_50
+    )
+    assert list(result.errors) == [TEST_HA_ID]
+    assert isinstance(
+        result.errors[TEST_HA_ID][BulkResource.SETTINGS], InternalServerError
+    )
+
+
+async def test_fetch_appliances_unexpected_error(
+    httpx_client: AsyncClient, httpx_mock: HTTPXMock
+) -> None:
+    """Test that an undecodable response only fails its resource."""
+    base_url = f"https://example.com/api/homeappliances/{TEST_HA_ID}"
+    httpx_mock.add_response(url=f"{base_url}/status", json={"data": {"status": []}})
+    httpx_mock.add_response(
+        url=f"{base_url}/settings", json={"data": {"settings": "invalid"}}
+    )
+    client = Client(AuthClient(httpx_client, "https://example.com"))
+
+    result = await fetch_appliances(client, [make_appliance(TEST_HA_ID)])
+
+    appliance_result = result.appliances[TEST_HA_ID]
+    assert appliance_result.status is not None
+    assert appliance_result.settings is None
+    error = appliance_result.errors[BulkResource.SETTINGS]
+    assert type(error) is HomeConnectError
+    assert error.__cause__ is not None
+
+
+async def test_fetch_appliances_concurrency(
+    httpx_client: AsyncClient, httpx_mock: HTTPXMock
+) -> None:
+    """Test that the number of requests in flight is limited."""
+    in_flight = 0
+    max_in_flight = 0
+
+    async def respond(request: Request) -> Response:  # noqa: ARG001
+        """Return an empty status after letting other requests start."""
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return Response(200, json={"data": {"status": []}})
+
+    httpx_mock.add_callback(respond, is_reusable=True)
+    client = Client(AuthClient(httpx_client, "https://example.com"))
+    appliances = [make_appliance(f"{TEST_HA_ID}-{index}") for index in range(10)]
+
+    result = await fetch_appliances(
+        client, appliances, [BulkResource.STATUS], max_concurrency=3
+    )
+
+    assert len(result.appliances) == 10
+    assert not result.errors
+    assert max_in_flight == 3
@@ -0,0 +1,251 @@
+"""Test the response cache."""
+
+from httpx import AsyncClient, Request, Response
+import pytest
+from pytest_httpx import HTTPXMock, IteratorStream
+
+from aiohomeconnect.cache import (
+    ALL_PROGRAMS,
+    AVAILABLE_COMMANDS,
+    HOME_APPLIANCES,
+    TTLResponseCache,
+)
+from aiohomeconnect.client import Client
+from aiohomeconnect.connectivity import ConnectivityGate
+from aiohomeconnect.endpoint import endpoint_template
+from aiohomeconnect.model import (
+    ArrayOfEvents,
+    Event,
+    EventKey,
+    EventMessage,
+    EventType,
+    Language,
+)
+
+from .test_client import TEST_APPLIANCE, TEST_HA_ID, AuthClient
+
+APPLIANCES_PATH = "/homeappliances"
+PROGRAMS_PATH = f"/homeappliances/{TEST_HA_ID}/programs"
+COMMANDS_PATH = f"/homeappliances/{TEST_HA_ID}/commands"
+
+
+class FakeClock:
+    """Represent a manually advanced clock."""
+
+    def __init__(self) -> None:
+        """Initialize the clock."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        ("/homeappliances", "/homeappliances"),
+        ("/homeappliances/events", "/homeappliances/events"),
+        (f"/homeappliances/{TEST_HA_ID}", "/homeappliances/{haId}"),
+        (f"/homeappliances/{TEST_HA_ID}/status", "/homeappliances/{haId}/status"),
+        (
+            f"/homeappliances/{TEST_HA_ID}/status/BSH.Common.Status.DoorState",
+            "/homeappliances/{haId}/status/{statusKey}",
+        ),
+        (
+            f"/homeappliances/{TEST_HA_ID}/programs/available/Dishcare.Dishwasher.Program.Eco50",
+            "/homeappliances/{haId}/programs/available/{programKey}",
+        ),
+        (
+            f"/homeappliances/{TEST_HA_ID}/programs/active/options/BSH.Common.Option.Duration",
+            "/homeappliances/{haId}/programs/active/options/{optionKey}",
+        ),
+        (
+            f"/homeappliances/{TEST_HA_ID}/images/image_key",
+            "/homeappliances/{haId}/images/{imageKey}",
+        ),
+    ],
+)
+def test_endpoint_template(path: str, expected: str) -> None:
+    """Test the endpoint template of a path."""
+    assert endpoint_template(path) == expected
+
+
+def test_ttl_and_stats() -> None:
+    """Test that entries expire and hits and misses are counted."""
+    clock = FakeClock()
+    cache = TTLResponseCache({ALL_PROGRAMS: 10}, clock=clock)
+
+    assert cache.get(ALL_PROGRAMS, PROGRAMS_PATH, Language.EN) is None
+    cache.set(ALL_PROGRAMS, PROGRAMS_PATH, Language.EN, "programs")
+    cache.set(AVAILABLE_COMMANDS, COMMANDS_PATH, Language.EN, "commands")
+    assert cache.get(ALL_PROGRAMS, PROGRAMS_PATH, Language.EN) == "programs"
+    assert cache.get(ALL_PROGRAMS, PROGRAMS_PATH, Language.DE) is None
+    assert cache.get(AVAILABLE_COMMANDS, COMMANDS_PATH, Language.EN) is None
+
+    clock.now = 10
+    assert cache.get(ALL_PROGRAMS, PROGRAMS_PATH, Language.EN) is None
+    assert cache.stats.hits == {ALL_PROGRAMS: 1}
+    assert cache.stats.total_misses == 3
+    assert len(cache) == 0
+
+
+def test_lru_eviction() -> None:
+    """Test that the least recently used entry is evicted."""
+    cache = TTLResponseCache({ALL_PROGRAMS: 10}, max_size=2)
+    cache.set(ALL_PROGRAMS, "/homeappliances/1/programs", None, 1)
+    cache.set(ALL_PROGRAMS, "/homeappliances/2/programs", None, 2)
+    cache.get(ALL_PROGRAMS, "/homeappliances/1/programs", None)
+    cache.set(ALL_PROGRAMS, "/homeappliances/3/programs", None, 3)
+
+    assert cache.get(ALL_PROGRAMS, "/homeappliances/1/programs", None) == 1
+    assert cache.get(ALL_PROGRAMS, "/homeappliances/2/programs", None) is None
+    assert cache.stats.evictions == 1
+
+
+@pytest.mark.parametrize(
+    ("event_message", "remaining"),
+    [
+        (
+            EventMessage(TEST_HA_ID, EventType.DEPAIRED, ArrayOfEvents([])),
+            {"/homeappliances/other/programs"},
+        ),
+        (
+            EventMessage(TEST_HA_ID, EventType.DISCONNECTED, ArrayOfEvents([])),
+            {"/homeappliances/other/programs"},
+        ),
+        (
+            EventMessage(
+                TEST_HA_ID,
+                EventType.NOTIFY,
+                ArrayOfEvents(
+                    [
+                        Event(
+                            key=EventKey.BSH_COMMON_ROOT_SELECTED_PROGRAM,
+                            raw_key=EventKey.BSH_COMMON_ROOT_SELECTED_PROGRAM.value,
+                            timestamp=0,
+                            level="hint",
+                            handling="none",
+                            value="Dishcare.Dishwasher.Program.Eco50",
+                        )
+                    ]
+                ),
+            ),
+            {APPLIANCES_PATH, "/homeappliances/other/programs"},
+        ),
+        (
+            EventMessage(TEST_HA_ID, EventType.NOTIFY, ArrayOfEvents([])),
+            {APPLIANCES_PATH, PROGRAMS_PATH, "/homeappliances/other/programs"},
+        ),
+    ],
+)
+def test_event_invalidation(event_message: EventMessage, remaining: set[str]) -> None:
+    """Test that events invalidate the stale entries."""
+    cache = TTLResponseCache()
+    paths = (APPLIANCES_PATH, PROGRAMS_PATH, "/homeappliances/other/programs")
+    for path in paths:
+        cache.set(endpoint_template(path), path, None, path)
+
+    cache.handle_event(event_message)
+
+    assert {
+        path for path in paths if cache.get(endpoint_template(path), path, None)
+    } == remaining
+
+
+async def test_client_cache(httpx_client: AsyncClient, httpx_mock: HTTPXMock) -> None:
+    """Test that the client serves cached responses until invalidated."""
+    appliances = {"data": {"homeappliances": []}}
+    httpx_mock.add_response(
+        url=f"https://example.com/api{APPLIANCES_PATH}",
+        json=appliances,
+        is_reusable=True,
+    )
+    httpx_mock.add_response(
+        url="https://example.com/api/homeappliances/events",
+        stream=IteratorStream(
+            [
+                "\n".join(
+                    [
+                        f"id: {TEST_HA_ID}",
+                        "data: ",
+                        f"event: {EventType.PAIRED}",
+                        "\n",
+                    ]
+                ).encode()
+            ]
+        ),
+        headers={"Content-Type": "text/event-stream"},
+    )
+    cache = TTLResponseCache()
+    client = Client(AuthClient(httpx_client, "https://example.com"), cache=cache)
+
+    first = await client.get_home_appliances()
+    assert await client.get_home_appliances() is first
+    assert len(httpx_mock.get_requests()) == 1
+    assert cache.stats.hits[HOME_APPLIANCES] == 1
+
+    await anext(client.stream_all_events())
+    await client.get_home_appliances()
+
+    assert len(httpx_mock.get_requests()) == 3
+    assert cache.stats.invalidations == 1
+
+
+def test_set_after_invalidation() -> None:
+    """Test that a value fetched before an invalidation is not stored."""
+    cache = TTLResponseCache()
+    generation = cache.generation
+
+    cache.invalidate(ha_id=TEST_HA_ID)
+    cache.set(ALL_PROGRAMS, PROGRAMS_PATH, None, "stale", generation=generation)
+    assert cache.get(ALL_PROGRAMS, PROGRAMS_PATH, None) is None
+
+    cache.set(ALL_PROGRAMS, PROGRAMS_PATH, None, "fresh", generation=cache.generation)
+    assert cache.get(ALL_PROGRAMS, PROGRAMS_PATH, None) == "fresh"
+
+
+async def test_client_cache_invalidated_in_flight(
+    httpx_client: AsyncClient, httpx_mock: HTTPXMock
+) -> None:
+    """Test that an invalidation during a fetch keeps the result uncached."""
+    cache = TTLResponseCache()
+
+    def invalidate(request: Request) -> Response:
+        """Invalidate the cache while the request is in flight."""
+        cache.invalidate(endpoints=frozenset({HOME_APPLIANCES}))
+        return Response(200, json={"data": {"homeappliances": []}}, request=request)
+
+    httpx_mock.add_callback(
+        invalidate, url=f"https://example.com/api{APPLIANCES_PATH}", is_reusable=True
+    )
+    client = Client(AuthClient(httpx_client, "https://example.com"), cache=cache)
+
+    await client.get_home_appliances()
+    await client.get_home_appliances()
+
+    assert len(httpx_mock.get_requests()) == 2
+    assert not cache.stats.hits
+
+
+async def test_client_cache_hit_keeps_connectivity(
+    httpx_client: AsyncClient, httpx_mock: HTTPXMock
+) -> None:
+    """Test that a cached appliance list does not override newer states."""
+    httpx_mock.add_response(
+        url=f"https://example.com/api{APPLIANCES_PATH}",
+        json={"data": {"homeappliances": [TEST_APPLIANCE]}},
+    )
+    gate = ConnectivityGate()
+    client = Client(
+        AuthClient(httpx_client, "https://example.com"),
+        cache=TTLResponseCache(),
+        connectivity_gate=gate,
+    )
+
+    await client.get_home_appliances()
+    assert gate.is_connected(TEST_HA_ID)
+    gate.set_connected(TEST_HA_ID, connected=False)
+    await client.get_home_appliances()
+
+    assert not gate.is_connected(TEST_HA_ID)
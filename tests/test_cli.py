@@ -1,8 +1,17 @@
 """Tests for the CLI."""
 
+import asyncio
+import json
+from pathlib import Path
+import time
+from unittest.mock import patch
+
+from httpx import AsyncClient, codes
 from typer.testing import CliRunner
 
 from aiohomeconnect.cli import cli
+from aiohomeconnect.cli.client import Auth, TokenManager
+from aiohomeconnect.stats import ClientStats
 
 runner = CliRunner()
 
@@ -12,3 +21,87 @@ def test_help() -> None:
     result = runner.invoke(cli, ["authorize", "--help"])
     assert result.exit_code == 0
     assert "Authorize the client" in result.stdout
+
+
+async def test_concurrent_token_refresh(httpx_client: AsyncClient) -> None:
+    """Test that concurrent callers share one token refresh."""
+    token_manager = TokenManager("client_id", "client_secret")
+    token_manager.access_token = "expired"
+    token_manager._token = {"expires_at": time.time(), "expires_in": 3600}  # noqa: SLF001
+
+    async def refresh_access_token() -> None:
+        """Refresh the token."""
+        await asyncio.sleep(0)
+        token_manager.access_token = "refreshed"
+        token_manager._token = {  # noqa: SLF001
+            "expires_at": time.time() + 3600,
+            "expires_in": 3600,
+        }
+
+    auth = Auth(httpx_client, "https://example.com", token_manager)
+    with (
+        patch.object(
+            token_manager, "refresh_access_token", side_effect=refresh_access_token
+        ) as refresh,
+        patch.object(token_manager, "save_access_token") as save,
+    ):
+        tokens = await asyncio.gather(
+            *(auth._get_access_token() for _ in range(10)),  # noqa: SLF001
+            *(auth.async_get_access_token() for _ in range(10)),
+        )
+
+    assert set(tokens) == {"refreshed"}
+    refresh.assert_awaited_once()
+    save.assert_awaited_once()
+    assert auth._refresh_task is not None  # noqa: SLF001
+    await auth.aclose()
+    assert auth._refresh_task is None  # noqa: SLF001
+
+
+async def test_failed_token_refresh_backoff(httpx_client: AsyncClient) -> None:
+    """Test that a failed background refresh is not retried on every request."""
+    token_manager = TokenManager("client_id", "client_secret")
+    token_manager.access_token = "token"
+    token_manager._token = {"expires_at": time.time() + 100, "expires_in": 3600}  # noqa: SLF001
+    auth = Auth(httpx_client, "https://example.com", token_manager)
+
+    with patch.object(
+        token_manager, "refresh_access_token", side_effect=ValueError("failed")
+    ) as refresh:
+        assert await auth.async_get_access_token() == "token"
+        failed_task = auth._refresh_task  # noqa: SLF001
+        assert failed_task is not None
+        await failed_task
+        refresh.assert_awaited_once()
+
+        assert await auth.async_get_access_token() == "token"
+        task = auth._refresh_task  # noqa: SLF001
+        assert task is not None
+        assert task is not failed_task
+        await asyncio.sleep(0)
+
+        assert not task.done()
+        refresh.assert_awaited_once()
+
+    await auth.aclose()
+    assert task.cancelled()
+
+
+def test_get_stats(tmp_path: Path) -> None:
+    """Test that the request statistics of a dump are shown."""
+    stats = ClientStats()
+    stats.record("/homeappliances", codes.OK, 0.25)
+    path = tmp_path / "stats.json"
+    path.write_text(json.dumps(stats.snapshot().to_dict()))
+
+    result = runner.invoke(cli, ["get-stats", str(path)])
+
+    assert result.exit_code == 0, result.output
+    assert "/homeappliances" in result.stdout
+    assert "250.0" in result.stdout
+    assert "1 of 1000 requests used" in result.stdout
+
+    result = runner.invoke(cli, ["get-stats", str(tmp_path / "missing.json")])
+
+    assert result.exit_code == 0, result.output
+    assert "FileNotFoundError" in result.output
@@ -1,14 +1,27 @@
 """Test the client."""
 
+import asyncio
 import json
+from unittest.mock import patch
 
-from httpx import AsyncClient, ReadTimeout, RequestError, codes
+from httpx import AsyncClient, ReadTimeout, Request, RequestError, Response, codes
 import pytest
 from pytest_httpx import HTTPXMock, IteratorStream
 
-from aiohomeconnect.client import AbstractAuth, Client
-from aiohomeconnect.model import ArrayOfEvents, Event, EventKey, EventMessage, EventType
+from aiohomeconnect.client import REQUEST_BODY_HEADERS, AbstractAuth, Client
+from aiohomeconnect.event_filter import EventFilter
+from aiohomeconnect.model import (
+    ArrayOfEvents,
+    Event,
+    EventKey,
+    EventMessage,
+    EventType,
+    LazyEventMessage,
+    SettingKey,
+)
 from aiohomeconnect.model.error import (
+    Conflict,
+    ConflictError,
     EventStreamInterruptedError,
     ForbiddenError,
     HomeConnectApiError,
@@ -23,6 +36,16 @@ from aiohomeconnect.model.error import (
 
 TEST_ACCESS_TOKEN = "1234"
 TEST_HA_ID = "SIEMENS-HCS02DWH1-6BE58C26DCC1"
+OTHER_HA_ID = "BOSCH-HCS06COM1-D70390681C2C"
+TEST_APPLIANCE = {
+    "haId": TEST_HA_ID,
+    "name": "Dishwasher",
+    "type": "Dishwasher",
+    "brand": "SIEMENS",
+    "vib": "HCS02DWH1",
+    "enumber": "SN53ES02AE/03",
+    "connected": True,
+}
 TEST_EVENT_TYPE = EventType.NOTIFY
 
 STREAM_EVENT_CASES = [
@@ -173,6 +196,26 @@ async def test_abstract_auth_request(
     assert request.url.query.decode(encoding="utf-8") == "key1=value1&key2=value2"
 
 
+async def test_abstract_auth_headers(httpx_client: AsyncClient) -> None:
+    """Test that headers are built from caller headers, body and access token."""
+    client = AuthClient(httpx_client, "https://example.com")
+    headers = {"Accept-Language": "en-US", "Other": None}
+
+    first = await client._get_headers(headers)  # noqa: SLF001
+    assert first == {
+        "Accept-Language": "en-US",
+        "authorization": f"Bearer {TEST_ACCESS_TOKEN}",
+    }
+    with_body = await client._get_headers(  # noqa: SLF001
+        headers, REQUEST_BODY_HEADERS
+    )
+    assert with_body["content-type"] == "application/vnd.bsh.sdk.v1+json"
+
+    with patch.object(client, "async_get_access_token", return_value="5678"):
+        refreshed = await client._get_headers(headers)  # noqa: SLF001
+    assert refreshed["authorization"] == "Bearer 5678"
+
+
 async def test_abstract_auth_sse(
     httpx_client: AsyncClient, httpx_mock: HTTPXMock
 ) -> None:
@@ -294,6 +337,114 @@ async def test_request_error(
         await client.get_home_appliances()
 
 
+async def test_endpoint_specific_error(
+    httpx_client: AsyncClient,
+    httpx_mock: HTTPXMock,
+) -> None:
+    """Test that endpoint specific errors are raised from the decoded body."""
+    httpx_mock.add_response(
+        url=f"https://example.com/api/homeappliances/{TEST_HA_ID}/programs",
+        status_code=codes.CONFLICT,
+        json={
+            "error": {"key": "some_error_key", "description": "some_error_description"}
+        },
+    )
+
+    client = Client(AuthClient(httpx_client, "https://example.com"))
+
+    with pytest.raises(Conflict) as exc_info:
+        await client.get_all_programs(TEST_HA_ID)
+
+    assert exc_info.value.key == "some_error_key"
+
+
+async def test_put_request_body(
+    httpx_client: AsyncClient,
+    httpx_mock: HTTPXMock,
+) -> None:
+    """Test that the request data is sent in the data envelope."""
+    setting_key = SettingKey.BSH_COMMON_POWER_STATE
+    httpx_mock.add_response(
+        method="PUT",
+        url=f"https://example.com/api/homeappliances/{TEST_HA_ID}/settings/{setting_key}",
+        status_code=codes.NO_CONTENT,
+    )
+
+    client = Client(AuthClient(httpx_client, "https://example.com"))
+    await client.set_setting(
+        TEST_HA_ID,
+        setting_key=setting_key,
+        value="BSH.Common.EnumType.PowerState.On",
+    )
+
+    request = httpx_mock.get_request()
+    assert request
+    assert request.headers["content-type"] == "application/vnd.bsh.sdk.v1+json"
+    assert json.loads(request.content) == {
+        "data": {
+            "key": setting_key.value,
+            "value": "BSH.Common.EnumType.PowerState.On",
+        }
+    }
+
+
+async def test_put_request_error(
+    httpx_client: AsyncClient,
+    httpx_mock: HTTPXMock,
+) -> None:
+    """Test that endpoint specific errors are raised for put requests."""
+    setting_key = SettingKey.BSH_COMMON_POWER_STATE
+    httpx_mock.add_response(
+        method="PUT",
+        url=f"https://example.com/api/homeappliances/{TEST_HA_ID}/settings/{setting_key}",
+        status_code=codes.CONFLICT,
+        json={
+            "error": {"key": "some_error_key", "description": "some_error_description"}
+        },
+    )
+
+    client = Client(AuthClient(httpx_client, "https://example.com"))
+
+    with pytest.raises(ConflictError):
+        await client.set_setting(TEST_HA_ID, setting_key=setting_key, value="value")
+
+
+@pytest.mark.parametrize(
+    ("coalesce_requests", "expected_requests"),
+    [(True, 1), (False, 3)],
+)
+async def test_coalesce_requests(
+    httpx_client: AsyncClient,
+    httpx_mock: HTTPXMock,
+    coalesce_requests: bool,
+    expected_requests: int,
+) -> None:
+    """Test that concurrent identical GET requests share one round trip."""
+
+    async def respond(_: Request) -> Response:
+        """Respond after yielding to the event loop like a real round trip."""
+        await asyncio.sleep(0)
+        return Response(codes.OK, json={"data": {"status": []}})
+
+    httpx_mock.add_callback(
+        respond,
+        url=f"https://example.com/api/homeappliances/{TEST_HA_ID}/status",
+        is_reusable=True,
+    )
+    client = Client(
+        AuthClient(httpx_client, "https://example.com"),
+        coalesce_requests=coalesce_requests,
+    )
+
+    results = await asyncio.gather(*(client.get_status(TEST_HA_ID) for _ in range(3)))
+
+    assert len(httpx_mock.get_requests()) == expected_requests
+    assert (results[0] is results[2]) is coalesce_requests
+
+    await client.get_status(TEST_HA_ID)
+    assert len(httpx_mock.get_requests()) == expected_requests + 1
+
+
 @pytest.mark.parametrize(
     ("event_data", "event_message"),
     STREAM_EVENT_CASES,
@@ -327,6 +478,42 @@ async def test_stream_all_events(
     assert await anext(client.stream_all_events()) == event_message
 
 
+@pytest.mark.parametrize(
+    ("event_data", "event_message"),
+    STREAM_EVENT_CASES,
+)
+async def test_stream_all_events_lazy(
+    httpx_client: AsyncClient,
+    httpx_mock: HTTPXMock,
+    event_data: str,
+    event_message: EventMessage,
+) -> None:
+    """Test stream all events with lazy decoding."""
+    httpx_mock.add_response(
+        url="https://example.com/api/homeappliances/events",
+        stream=IteratorStream(
+            [
+                "\n".join(
+                    [
+                        f"id: {TEST_HA_ID}",
+                        f"data: {event_data}",
+                        f"event: {TEST_EVENT_TYPE}",
+                        "\n",
+                    ]
+                ).encode()
+            ]
+        ),
+        headers={"Content-Type": "text/event-stream"},
+    )
+
+    client = Client(AuthClient(httpx_client, "https://example.com"))
+    lazy_message = await anext(client.stream_all_events(lazy=True))
+
+    assert isinstance(lazy_message, LazyEventMessage)
+    assert not lazy_message.is_decoded
+    assert lazy_message == event_message
+
+
 @pytest.mark.parametrize(
     ("status_code", "exception"),
     [
@@ -359,6 +546,70 @@ async def test_stream_all_events_http_error(
         await anext(client.stream_all_events())
 
 
+async def test_stream_all_events_filter(
+    httpx_client: AsyncClient,
+    httpx_mock: HTTPXMock,
+) -> None:
+    """Test that filtered out events are not decoded."""
+    event_data, _ = STREAM_EVENT_CASES[0]
+    door_data = json.dumps(
+        {
+            "items": [
+                {
+                    "handling": "none",
+                    "key": EventKey.BSH_COMMON_STATUS_DOOR_STATE.value,
+                    "level": "hint",
+                    "timestamp": 1733611453,
+                    "value": "BSH.Common.EnumType.DoorState.Open",
+                }
+            ]
+        }
+    )
+    httpx_mock.add_response(
+        url="https://example.com/api/homeappliances/events",
+        stream=IteratorStream(
+            [
+                "\n".join(
+                    [
+                        f"id: {ha_id}",
+                        f"data: {data}",
+                        f"event: {event_type}",
+                        "\n",
+                    ]
+                ).encode()
+                for ha_id, event_type, data in (
+                    (TEST_HA_ID, EventType.NOTIFY, event_data),
+                    ("other", EventType.STATUS, door_data),
+                    (TEST_HA_ID, EventType.STATUS, door_data),
+                )
+            ]
+        ),
+        headers={"Content-Type": "text/event-stream"},
+    )
+    client = Client(AuthClient(httpx_client, "https://example.com"))
+    event_filter = EventFilter.create(
+        ha_ids=[TEST_HA_ID], key_prefixes=["BSH.Common.Status.*"]
+    )
+
+    with patch.object(
+        EventMessage,
+        "from_server_sent_event",
+        wraps=EventMessage.from_server_sent_event,
+    ) as from_server_sent_event:
+        event_messages = [
+            event_message
+            async for event_message in client.stream_all_events(
+                event_filter=event_filter
+            )
+        ]
+
+    assert from_server_sent_event.call_count == 1
+    assert [
+        (event_message.ha_id, event_message.data.items[0].key)
+        for event_message in event_messages
+    ] == [(TEST_HA_ID, EventKey.BSH_COMMON_STATUS_DOOR_STATE)]
+
+
 @pytest.mark.parametrize(
     ("event_data", "event_message"),
     STREAM_EVENT_CASES,
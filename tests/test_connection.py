@@ -0,0 +1,44 @@
+"""Test the connection module."""
+
+from unittest.mock import patch
+
+from httpx import AsyncHTTPTransport
+
+from aiohomeconnect.connection import (
+    ConnectionConfig,
+    create_httpx_client,
+    shared_ssl_context,
+)
+
+
+async def test_create_httpx_client() -> None:
+    """Test that the client uses the configured pool."""
+    config = ConnectionConfig(max_connections=5, max_keepalive_connections=2)
+
+    with patch(
+        "aiohomeconnect.connection.AsyncHTTPTransport", wraps=AsyncHTTPTransport
+    ) as transport:
+        client = create_httpx_client(config)
+
+    async with client:
+        kwargs = transport.call_args.kwargs
+        assert kwargs["limits"] == config.limits
+        assert kwargs["limits"].max_connections == 5
+        assert kwargs["limits"].max_keepalive_connections == 2
+        assert kwargs["limits"].keepalive_expiry == config.keepalive_expiry
+        assert kwargs["verify"] is shared_ssl_context()
+        assert kwargs["retries"] == config.connect_retries
+
+
+async def test_http2_fallback() -> None:
+    """Test that HTTP/1.1 is used when HTTP/2 dependencies are missing."""
+    with (
+        patch("aiohomeconnect.connection.http2_available", return_value=False),
+        patch(
+            "aiohomeconnect.connection.AsyncHTTPTransport", wraps=AsyncHTTPTransport
+        ) as transport,
+    ):
+        client = create_httpx_client(ConnectionConfig(http2=True))
+
+    async with client:
+        assert transport.call_args.kwargs["http2"] is False
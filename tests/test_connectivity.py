@@ -0,0 +1,67 @@
+"""Test the connectivity gate."""
+
+from httpx import AsyncClient
+import pytest
+from pytest_httpx import HTTPXMock, IteratorStream
+
+from aiohomeconnect.client import Client
+from aiohomeconnect.connectivity import ConnectivityGate
+from aiohomeconnect.event_filter import EventFilter
+from aiohomeconnect.model import EventType
+from aiohomeconnect.model.error import ApplianceOfflineError
+
+from .test_client import TEST_APPLIANCE, TEST_HA_ID, AuthClient
+
+BASE_URL = f"https://example.com/api/homeappliances/{TEST_HA_ID}"
+DISCONNECTED_APPLIANCE = TEST_APPLIANCE | {"connected": False}
+
+
+async def test_connectivity_gate(
+    httpx_client: AsyncClient, httpx_mock: HTTPXMock
+) -> None:
+    """Test that requests to disconnected appliances fail locally."""
+    httpx_mock.add_response(
+        url="https://example.com/api/homeappliances",
+        json={"data": {"homeappliances": [DISCONNECTED_APPLIANCE]}},
+    )
+    httpx_mock.add_response(url=BASE_URL, json={"data": DISCONNECTED_APPLIANCE})
+    httpx_mock.add_response(
+        url="https://example.com/api/homeappliances/events",
+        stream=IteratorStream(
+            [
+                "\n".join(
+                    [
+                        f"id: {TEST_HA_ID}",
+                        "data: ",
+                        f"event: {EventType.CONNECTED}",
+                        "\n",
+                    ]
+                ).encode()
+            ]
+        ),
+        headers={"Content-Type": "text/event-stream"},
+    )
+    httpx_mock.add_response(url=f"{BASE_URL}/status", json={"data": {"status": []}})
+    gate = ConnectivityGate()
+    client = Client(
+        AuthClient(httpx_client, "https://example.com"), connectivity_gate=gate
+    )
+
+    await client.get_home_appliances()
+
+    assert gate.offline == {TEST_HA_ID}
+    with pytest.raises(ApplianceOfflineError) as exc_info:
+        await client.get_status(TEST_HA_ID)
+    assert exc_info.value.ha_id == TEST_HA_ID
+    await client.get_specific_appliance(TEST_HA_ID)
+
+    # The connection event is seen even if the filter drops it.
+    event_filter = EventFilter.create(event_types=[EventType.STATUS])
+    assert [
+        event_message
+        async for event_message in client.stream_all_events(event_filter=event_filter)
+    ] == []
+
+    assert gate.is_connected(TEST_HA_ID)
+    await client.get_status(TEST_HA_ID)
+    assert len(httpx_mock.get_requests()) == 4
@@ -0,0 +1,117 @@
+"""Test the diagnostics module."""
+
+import logging
+from typing import Any
+from unittest.mock import patch
+
+from httpx import Request, Response
+import pytest
+
+from aiohomeconnect.diagnostics import REDACTED, BodyLogMode, RequestLogger
+
+from .test_client import TEST_HA_ID
+
+TEST_BODY = {"data": {"haId": TEST_HA_ID, "name": "Dishwasher"}}
+
+
+def _response(**kwargs: Any) -> Response:
+    """Return a response bound to a request."""
+    return Response(
+        200,
+        request=Request("GET", "https://example.com/api/homeappliances"),
+        **kwargs,
+    )
+
+
+def test_no_body_access_when_debug_disabled(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that the body is not read when debug logging is disabled."""
+    caplog.set_level(logging.INFO, logger="aiohomeconnect")
+    response = _response(json=TEST_BODY)
+    request_logger = RequestLogger()
+
+    with patch.object(RequestLogger, "format_body") as format_body:
+        request_logger.log_request("GET", "/homeappliances", None)
+        request_logger.log_response(response)
+
+    format_body.assert_not_called()
+    assert not caplog.records
+
+
+@pytest.mark.parametrize(
+    ("mode", "expected", "unexpected"),
+    [
+        (BodyLogMode.FULL, "Dishwasher", REDACTED),
+        (BodyLogMode.REDACTED, REDACTED, "SIEMENS"),
+        (BodyLogMode.NONE, "bytes", "Dishwasher"),
+    ],
+)
+def test_body_log_modes(
+    caplog: pytest.LogCaptureFixture,
+    mode: BodyLogMode,
+    expected: str,
+    unexpected: str,
+) -> None:
+    """Test the body log modes."""
+    caplog.set_level(logging.DEBUG, logger="aiohomeconnect")
+    RequestLogger(mode=mode).log_response(_response(json=TEST_BODY))
+
+    assert expected in caplog.text
+    assert unexpected not in caplog.text
+
+
+@pytest.mark.parametrize(
+    ("mode", "expected"),
+    [
+        (BodyLogMode.FULL, f"/homeappliances/{TEST_HA_ID}/status"),
+        (BodyLogMode.REDACTED, "/homeappliances/{haId}/status"),
+    ],
+)
+def test_path_log_modes(
+    caplog: pytest.LogCaptureFixture, mode: BodyLogMode, expected: str
+) -> None:
+    """Test that the appliance id of the path is redacted."""
+    caplog.set_level(logging.DEBUG, logger="aiohomeconnect")
+    request_logger = RequestLogger(mode=mode)
+    url = f"https://example.com/api/homeappliances/{TEST_HA_ID}/status"
+
+    request_logger.log_request("GET", f"/homeappliances/{TEST_HA_ID}/status", None)
+    request_logger.log_response(Response(200, request=Request("GET", url)))
+
+    assert [record.getMessage().split("\n")[0] for record in caplog.records] == [
+        f"Request: GET {expected} | Data: None",
+        f"Response: 200 /api{expected}",
+    ]
+
+
+def test_truncated_body() -> None:
+    """Test that long bodies are truncated."""
+    request_logger = RequestLogger(mode=BodyLogMode.TRUNCATED, max_body_length=10)
+
+    body = request_logger.format_body(_response(text="a" * 100))
+
+    assert body.startswith("a" * 10 + "...")
+    assert "100 bytes" in body
+
+
+@pytest.mark.parametrize(
+    ("sample_rate", "sampled"),
+    [(0.0, False), (1.0, True)],
+)
+def test_sampled_body(sample_rate: float, sampled: bool) -> None:
+    """Test that bodies are only logged when sampled."""
+    request_logger = RequestLogger(mode=BodyLogMode.SAMPLED, sample_rate=sample_rate)
+
+    body = request_logger.format_body(_response(json=TEST_BODY))
+
+    assert ("Dishwasher" in body) is sampled
+
+
+def test_binary_body() -> None:
+    """Test that binary bodies are never decoded."""
+    request_logger = RequestLogger()
+
+    body = request_logger.format_body(
+        _response(content=b"\xff\xd8\xff", headers={"content-type": "image/jpeg"})
+    )
+
+    assert body == "<3 bytes of image/jpeg>"
@@ -0,0 +1,126 @@
+"""Test the image downloads."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+import io
+from pathlib import Path
+
+from httpx import AsyncClient
+import pytest
+from pytest_httpx import HTTPXMock
+
+from aiohomeconnect.client import Client
+from aiohomeconnect.images import download_images
+from aiohomeconnect.mock import MockHomeConnect, VirtualAppliance
+from aiohomeconnect.model.error import NotFoundError
+from aiohomeconnect.model.image import Image
+
+from .test_client import TEST_HA_ID, AuthClient
+
+CAMERA_IMAGE = bytes(range(256)) * 1024
+
+
+@pytest.fixture
+async def client() -> AsyncGenerator[Client]:
+    """Return a client of a mock API with an appliance with images."""
+    mock_api = MockHomeConnect(
+        [
+            VirtualAppliance(
+                TEST_HA_ID,
+                images={"camera": CAMERA_IMAGE, "preview": b"preview"},
+            )
+        ]
+    )
+    async with AsyncClient(transport=mock_api) as httpx_client:
+        yield Client(AuthClient(httpx_client, "https://example.com"))
+    await mock_api.aclose()
+
+
+async def test_stream_image(client: Client) -> None:
+    """Test that an image is streamed in chunks."""
+    chunks = [
+        chunk
+        async for chunk in client.stream_image(
+            TEST_HA_ID, image_key="camera", chunk_size=4096
+        )
+    ]
+
+    assert max(len(chunk) for chunk in chunks) == 4096
+    assert b"".join(chunks) == CAMERA_IMAGE
+
+    with pytest.raises(NotFoundError):
+        async for _ in client.stream_image(TEST_HA_ID, image_key="unknown"):
+            pass
+
+
+async def test_download_image(client: Client, tmp_path: Path) -> None:
+    """Test that an image is written to a path or a file object."""
+    path = tmp_path / "camera.jpg"
+    size = await client.download_image(TEST_HA_ID, image_key="camera", destination=path)
+    assert size == len(CAMERA_IMAGE)
+    assert path.read_bytes() == CAMERA_IMAGE
+
+    file = io.BytesIO()
+    await client.download_image(TEST_HA_ID, image_key="preview", destination=file)
+    assert file.getvalue() == b"preview"
+
+    path = tmp_path / "unknown.jpg"
+    with pytest.raises(NotFoundError):
+        await client.download_image(
+            TEST_HA_ID, image_key="unknown", destination=str(path)
+        )
+    assert not path.exists()
+
+
+async def test_download_images(client: Client, tmp_path: Path) -> None:
+    """Test that all images of an appliance are downloaded."""
+    result = await download_images(
+        client, TEST_HA_ID, tmp_path / "images", max_concurrency=1
+    )
+
+    assert not result.errors
+    assert result.paths["camera"].read_bytes() == CAMERA_IMAGE
+    assert result.paths["preview"].read_bytes() == b"preview"
+
+
+async def test_download_images_error(client: Client, tmp_path: Path) -> None:
+    """Test that a failed image does not fail the batch."""
+    images = [
+        Image(key="camera", image_key=image_key, timestamp=0, quality="high")
+        for image_key in ("camera", "unknown")
+    ]
+
+    result = await download_images(client, TEST_HA_ID, tmp_path, images)
+
+    assert list(result.paths) == ["camera"]
+    assert isinstance(result.errors["unknown"], NotFoundError)
+
+
+async def test_download_images_file_error(client: Client, tmp_path: Path) -> None:
+    """Test that a file that cannot be written does not fail the batch."""
+    directory = tmp_path / "images"
+    # A directory in place of the file makes opening the file fail.
+    await asyncio.to_thread((directory / "camera.jpg").mkdir, parents=True)
+
+    result = await download_images(client, TEST_HA_ID, directory)
+
+    assert list(result.paths) == ["preview"]
+    assert result.paths["preview"].read_bytes() == b"preview"
+    assert isinstance(result.errors["camera"], OSError)
+
+
+async def test_download_images_unsafe_key(
+    httpx_client: AsyncClient, httpx_mock: HTTPXMock, tmp_path: Path
+) -> None:
+    """Test that an image key cannot write outside the directory."""
+    httpx_mock.add_response(content=b"image")
+    client = Client(AuthClient(httpx_client, "https://example.com"))
+    directory = tmp_path / "images"
+    images = [Image(key="camera", image_key="../escape", timestamp=0, quality="high")]
+
+    result = await download_images(client, TEST_HA_ID, directory, images)
+
+    path = result.paths["../escape"]
+    assert path.parent == directory
+    assert path.read_bytes() == b"image"
+    assert not (tmp_path / "escape.jpg").exists()
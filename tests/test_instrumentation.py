@@ -0,0 +1,258 @@
+"""Test the instrumentation hooks."""
+
+from typing import Any, override
+from unittest.mock import patch
+
+from httpx import AsyncClient, RequestError, codes
+import pytest
+from pytest_httpx import HTTPXMock, IteratorStream
+
+from aiohomeconnect.client import Client
+from aiohomeconnect.instrumentation import (
+    Instrumentation,
+    InstrumentationGroup,
+    RequestRecord,
+)
+from aiohomeconnect.model import EventType
+from aiohomeconnect.model.error import HomeConnectRequestError, InternalServerError
+from aiohomeconnect.retry import RetryPolicy
+
+from .test_client import STREAM_EVENT_CASES, TEST_HA_ID, AuthClient
+
+STATUS_URL = f"https://example.com/api/homeappliances/{TEST_HA_ID}/status"
+
+
+class RecordingInstrumentation(Instrumentation):
+    """Record the calls of the hooks."""
+
+    def __init__(self) -> None:
+        """Initialize the recorder."""
+        self.calls: list[tuple[str, Any]] = []
+        self.records: list[RequestRecord] = []
+
+    @override
+    def request_start(self, record: RequestRecord) -> str:
+        """Record the start of a request."""
+        self.calls.append(("request_start", record.endpoint))
+        return "request context"
+
+    @override
+    def request_end(self, record: RequestRecord, context: Any) -> None:
+        """Record the end of a request."""
+        assert context == "request context"
+        assert record.duration >= 0
+        self.records.append(record)
+        self.calls.append(("request_end", (record.status_code, type(record.error))))
+
+    @override
+    def request_retry(self, record: RequestRecord, attempt: int, delay: float) -> None:
+        """Record a retry."""
+        self.calls.append(("request_retry", (type(record.error), attempt)))
+
+    @override
+    def token_refresh(self, duration: float, error: BaseException | None) -> None:
+        """Record a token refresh."""
+        self.calls.append(("token_refresh", error))
+
+    @override
+    def stream_connect(self, endpoint: str) -> str:
+        """Record a connected stream."""
+        self.calls.append(("stream_connect", endpoint))
+        return "stream context"
+
+    @override
+    def stream_disconnect(
+        self,
+        endpoint: str,
+        duration: float,
+        error: BaseException | None,
+        context: Any,
+    ) -> None:
+        """Record a closed stream."""
+        assert context == "stream context"
+        self.calls.append(("stream_disconnect", endpoint))
+
+    @override
+    def event_received(self, ha_id: str, event_type: str) -> None:
+        """Record a received event."""
+        self.calls.append(("event_received", (ha_id, event_type)))
+
+    @override
+    def event_decoded(self, event_type: str, duration: float) -> None:
+        """Record a decoded event."""
+        self.calls.append(("event_decoded", event_type))
+
+
+async def test_request_hooks(httpx_client: AsyncClient, httpx_mock: HTTPXMock) -> None:
+    """Test the hooks of a retried request."""
+    httpx_mock.add_exception(RequestError("some error"), url=STATUS_URL)
+    httpx_mock.add_response(
+        url=STATUS_URL,
+        status_code=codes.INTERNAL_SERVER_ERROR,
+        json={"error": {"key": "500"}},
+    )
+    httpx_mock.add_response(url=STATUS_URL, json={"data": {"status": []}})
+    first = RecordingInstrumentation()
+    second = RecordingInstrumentation()
+    client = Client(
+        AuthClient(
+            httpx_client,
+            "https://example.com",
+            instrumentation=InstrumentationGroup([first, second]),
+        ),
+        retry_policy=RetryPolicy(max_attempts=3),
+    )
+
+    with patch("aiohomeconnect.client.asyncio.sleep"):
+        await client.get_status(TEST_HA_ID)
+
+    endpoint = "/homeappliances/{haId}/status"
+    assert first.calls == [
+        ("request_start", endpoint),
+        ("token_refresh", None),
+        ("request_end", (None, HomeConnectRequestError)),
+        ("request_retry", (HomeConnectRequestError, 0)),
+        ("request_start", endpoint),
+        ("request_end", (500, type(None))),
+        ("request_retry", (InternalServerError, 1)),
+        ("request_start", endpoint),
+        ("request_end", (200, type(None))),
+    ]
+    assert second.calls == first.calls
+
+
+async def test_streamed_request_hooks(
+    httpx_client: AsyncClient, httpx_mock: HTTPXMock
+) -> None:
+    """Test the hooks of a streamed image download."""
+    httpx_mock.add_response(
+        url=f"https://example.com/api/homeappliances/{TEST_HA_ID}/images/camera",
+        content=b"image" * 100,
+    )
+    instrumentation = RecordingInstrumentation()
+    client = Client(
+        AuthClient(httpx_client, "https://example.com", instrumentation=instrumentation)
+    )
+
+    chunks = [
+        chunk
+        async for chunk in client.stream_image(
+            TEST_HA_ID, image_key="camera", chunk_size=100
+        )
+    ]
+
+    assert len(chunks) == 5
+    assert instrumentation.calls == [
+        ("token_refresh", None),
+        ("request_start", "/homeappliances/{haId}/images/{imageKey}"),
+        ("request_end", (200, type(None))),
+    ]
+    assert instrumentation.records[0].response_bytes == 500
+
+
+async def test_stream_hooks(httpx_client: AsyncClient, httpx_mock: HTTPXMock) -> None:
+    """Test the hooks of an event stream."""
+    event_data, _ = STREAM_EVENT_CASES[0]
+    httpx_mock.add_response(
+        url="https://example.com/api/homeappliances/events",
+        stream=IteratorStream(
+            [
+                "\n".join(
+                    [
+                        f"id: {TEST_HA_ID}",
+                        f"data: {event_data}",
+                        f"event: {event_type}",
+                        "\n",
+                    ]
+                ).encode()
+                for event_type in (EventType.KEEP_ALIVE, EventType.NOTIFY)
+            ]
+        ),
+        headers={"Content-Type": "text/event-stream"},
+    )
+    instrumentation = RecordingInstrumentation()
+    client = Client(
+        AuthClient(httpx_client, "https://example.com", instrumentation=instrumentation)
+    )
+
+    assert len([message async for message in client.stream_all_events()]) == 1
+
+    assert instrumentation.calls == [
+        ("token_refresh", None),
+        ("stream_connect", "/homeappliances/events"),
+        ("event_received", (TEST_HA_ID, EventType.KEEP_ALIVE)),
+        ("event_received", (TEST_HA_ID, EventType.NOTIFY)),
+        ("event_decoded", EventType.NOTIFY),
+        ("stream_disconnect", "/homeappliances/events"),
+    ]
+
+
+async def test_opentelemetry(httpx_client: AsyncClient, httpx_mock: HTTPXMock) -> None:
+    """Test that the OpenTelemetry adapter records request spans."""
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider  # noqa: PLC0415
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: PLC0415
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (  # noqa: PLC0415
+        InMemorySpanExporter,
+    )
+    from opentelemetry.trace import SpanKind  # noqa: PLC0415
+
+    from aiohomeconnect.instrumentation.opentelemetry import (  # noqa: PLC0415
+        OpenTelemetryInstrumentation,
+    )
+
+    httpx_mock.add_response(url=STATUS_URL, json={"data": {"status": []}})
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    client = Client(
+        AuthClient(
+            httpx_client,
+            "https://example.com",
+            instrumentation=OpenTelemetryInstrumentation(provider.get_tracer("test")),
+        )
+    )
+
+    await client.get_status(TEST_HA_ID)
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    # The first access token is reported as a token refresh.
+    assert spans.keys() == {"access token refresh", "GET /homeappliances/{haId}/status"}
+    span = spans["GET /homeappliances/{haId}/status"]
+    assert span.kind is SpanKind.CLIENT
+    assert span.attributes is not None
+    assert span.attributes["http.request.method"] == "GET"
+    assert span.attributes["url.template"] == "/homeappliances/{haId}/status"
+    assert span.attributes["http.response.status_code"] == 200
+
+
+async def test_prometheus(httpx_client: AsyncClient, httpx_mock: HTTPXMock) -> None:
+    """Test that the Prometheus adapter counts requests."""
+    prometheus_client = pytest.importorskip("prometheus_client")
+    from aiohomeconnect.instrumentation.prometheus import (  # noqa: PLC0415
+        PrometheusInstrumentation,
+    )
+
+    httpx_mock.add_response(url=STATUS_URL, json={"data": {"status": []}})
+    registry = prometheus_client.CollectorRegistry()
+    client = Client(
+        AuthClient(
+            httpx_client,
+            "https://example.com",
+            instrumentation=PrometheusInstrumentation(registry),
+        )
+    )
+
+    await client.get_status(TEST_HA_ID)
+
+    assert (
+        registry.get_sample_value(
+            "aiohomeconnect_requests_total",
+            {
+                "method": "GET",
+                "endpoint": "/homeappliances/{haId}/status",
+                "status": "200",
+            },
+        )
+        == 1
+    )
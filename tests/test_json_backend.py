@@ -0,0 +1,50 @@
+"""Test the JSON backend."""
+
+from collections.abc import Generator
+
+import pytest
+
+from aiohomeconnect.json_backend import (
+    JsonBackend,
+    get_json_backend,
+    json_dumps,
+    json_loads,
+    set_json_backend,
+)
+
+
+@pytest.fixture(autouse=True)
+def restore_backend() -> Generator[None]:
+    """Restore the JSON backend after each test."""
+    backend = get_json_backend()
+    yield
+    set_json_backend(backend)
+
+
+def test_stdlib_backend() -> None:
+    """Test the standard library backend."""
+    backend = set_json_backend("json")
+
+    assert backend.name == "json"
+    assert json_dumps({"data": {"key": "value"}}) == b'{"data":{"key":"value"}}'
+    assert json_loads(b'{"data": 1}') == {"data": 1}
+    with pytest.raises(ValueError, match="Expecting value"):
+        json_loads(b"not json")
+
+
+def test_custom_backend() -> None:
+    """Test that a custom backend can be plugged in."""
+    backend = JsonBackend("custom", lambda _: {"custom": True}, lambda _: b"{}")
+    set_json_backend(backend)
+
+    assert get_json_backend() is backend
+    assert json_loads(b"{}") == {"custom": True}
+    assert json_dumps({}) == b"{}"
+
+
+def test_auto_backend() -> None:
+    """Test that the fastest installed backend is selected."""
+    backend = set_json_backend()
+
+    assert json_loads(json_dumps({"data": [1, "a", None]})) == {"data": [1, "a", None]}
+    assert backend.name in {"orjson", "msgspec", "json"}
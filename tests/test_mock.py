@@ -0,0 +1,213 @@
+"""Test the mock Home Connect API."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
+
+from httpx import AsyncClient
+import pytest
+
+from aiohomeconnect.client import Client
+from aiohomeconnect.mock import (
+    FaultInjection,
+    MockHomeConnect,
+    ProgramScript,
+    VirtualAppliance,
+)
+from aiohomeconnect.model import (
+    ArrayOfOptions,
+    CommandKey,
+    EventKey,
+    EventMessage,
+    EventType,
+    Option,
+    OptionKey,
+    ProgramKey,
+    PutCommand,
+    PutCommands,
+    PutSetting,
+    PutSettings,
+    SettingKey,
+    StatusKey,
+)
+from aiohomeconnect.model.error import (
+    ConflictError,
+    NoProgramActiveError,
+    TooManyRequestsError,
+)
+
+from .test_client import OTHER_HA_ID, TEST_HA_ID, AuthClient
+
+
+@pytest.fixture
+def mock_api() -> MockHomeConnect:
+    """Return a mock API with two appliances."""
+    return MockHomeConnect(
+        [
+            VirtualAppliance(
+                TEST_HA_ID,
+                images={"camera": b"image"},
+                script=ProgramScript(steps=2),
+            ),
+            VirtualAppliance(OTHER_HA_ID, connected=False),
+        ]
+    )
+
+
+@pytest.fixture
+async def client(mock_api: MockHomeConnect) -> AsyncGenerator[Client]:
+    """Return a client of the mock API."""
+    async with AsyncClient(transport=mock_api) as httpx_client:
+        yield Client(AuthClient(httpx_client, "https://example.com"))
+    await mock_api.aclose()
+
+
+async def test_endpoints(client: Client) -> None:
+    """Test that the client endpoints are served from the appliance state."""
+    appliances = await client.get_home_appliances()
+    assert [appliance.connected for appliance in appliances.homeappliances] == [
+        True,
+        False,
+    ]
+    assert not (await client.get_specific_appliance(OTHER_HA_ID)).connected
+    with pytest.raises(ConflictError):
+        await client.get_status(OTHER_HA_ID)
+
+    assert len((await client.get_all_programs(TEST_HA_ID)).programs) == 3
+    assert len((await client.get_available_programs(TEST_HA_ID)).programs) == 3
+    definition = await client.get_available_program(
+        TEST_HA_ID, program_key=ProgramKey.DISHCARE_DISHWASHER_ECO_50
+    )
+    assert definition.options is not None
+    assert len(definition.options) == 2
+    with pytest.raises(NoProgramActiveError):
+        await client.get_active_program(TEST_HA_ID)
+
+    await client.set_selected_program(
+        TEST_HA_ID, program_key=ProgramKey.DISHCARE_DISHWASHER_ECO_50
+    )
+    await client.set_selected_program_option(
+        TEST_HA_ID, option_key=OptionKey.DISHCARE_DISHWASHER_HALF_LOAD, value=True
+    )
+    await client.set_selected_program_options(
+        TEST_HA_ID,
+        array_of_options=ArrayOfOptions(
+            [Option(OptionKey.BSH_COMMON_START_IN_RELATIVE, 60)]
+        ),
+    )
+    selected = await client.get_selected_program(TEST_HA_ID)
+    assert selected.key is ProgramKey.DISHCARE_DISHWASHER_ECO_50
+    assert {option.key: option.value for option in selected.options or ()} == {
+        OptionKey.BSH_COMMON_START_IN_RELATIVE: 60,
+        OptionKey.DISHCARE_DISHWASHER_HALF_LOAD: True,
+    }
+    assert len((await client.get_selected_program_options(TEST_HA_ID)).options) == 2
+    option = await client.get_selected_program_option(
+        TEST_HA_ID, option_key=OptionKey.DISHCARE_DISHWASHER_HALF_LOAD
+    )
+    assert option.value is True
+
+    await client.set_setting(
+        TEST_HA_ID, setting_key=SettingKey.BSH_COMMON_CHILD_LOCK, value=True
+    )
+    await client.set_settings(
+        TEST_HA_ID,
+        put_settings=PutSettings(
+            [
+                PutSetting(
+                    SettingKey.BSH_COMMON_POWER_STATE,
+                    "BSH.Common.EnumType.PowerState.Standby",
+                )
+            ]
+        ),
+    )
+    settings = await client.get_settings(TEST_HA_ID)
+    assert {setting.key: setting.value for setting in settings.settings} == {
+        SettingKey.BSH_COMMON_POWER_STATE: "BSH.Common.EnumType.PowerState.Standby",
+        SettingKey.BSH_COMMON_CHILD_LOCK: True,
+    }
+    setting = await client.get_setting(
+        TEST_HA_ID, setting_key=SettingKey.BSH_COMMON_CHILD_LOCK
+    )
+    assert setting.value is True
+
+    assert len((await client.get_status(TEST_HA_ID)).status) == 3
+    status = await client.get_status_value(
+        TEST_HA_ID, status_key=StatusKey.BSH_COMMON_DOOR_STATE
+    )
+    assert status.value == "BSH.Common.EnumType.DoorState.Closed"
+
+    assert len((await client.get_available_commands(TEST_HA_ID)).commands) == 2
+    await client.put_command(
+        TEST_HA_ID, command_key=CommandKey.BSH_COMMON_PAUSE_PROGRAM, value=True
+    )
+    await client.put_commands(
+        TEST_HA_ID,
+        put_commands=PutCommands(
+            [PutCommand(CommandKey.BSH_COMMON_RESUME_PROGRAM, value=True)]
+        ),
+    )
+
+    images = await client.get_images(TEST_HA_ID)
+    assert [image.image_key for image in images.images] == ["camera"]
+    assert await client.get_image(TEST_HA_ID, image_key="camera") == b"image"
+
+
+async def test_program_lifecycle(mock_api: MockHomeConnect, client: Client) -> None:
+    """Test that a started program streams its lifecycle events."""
+    received: list[EventMessage] = []
+
+    async def listen() -> None:
+        """Collect the events until the program has finished."""
+        async with aclosing(client.stream_events(TEST_HA_ID)) as events:
+            async for event_message in events:
+                received.append(event_message)
+                if event_message.type is EventType.EVENT:
+                    return
+
+    task = asyncio.create_task(listen())
+    await mock_api.wait_streams()
+    await client.start_program(
+        TEST_HA_ID, program_key=ProgramKey.DISHCARE_DISHWASHER_ECO_50
+    )
+    with pytest.raises(ConflictError):
+        await client.start_program(
+            TEST_HA_ID, program_key=ProgramKey.DISHCARE_DISHWASHER_ECO_50
+        )
+    await task
+
+    assert [
+        (event_message.type, [event.key for event in event_message.data.items])
+        for event_message in received
+    ] == [
+        (EventType.NOTIFY, [EventKey.BSH_COMMON_ROOT_ACTIVE_PROGRAM]),
+        (EventType.STATUS, [EventKey.BSH_COMMON_STATUS_OPERATION_STATE]),
+        *[
+            (
+                EventType.NOTIFY,
+                [
+                    EventKey.BSH_COMMON_OPTION_PROGRAM_PROGRESS,
+                    EventKey.BSH_COMMON_OPTION_REMAINING_PROGRAM_TIME,
+                ],
+            )
+        ]
+        * 2,
+        (EventType.EVENT, [EventKey.BSH_COMMON_EVENT_PROGRAM_FINISHED]),
+    ]
+    assert received[3].data.items[0].value == 100
+    assert not mock_api.streams
+    assert not mock_api.appliances[TEST_HA_ID].active_program
+
+
+async def test_fault_injection() -> None:
+    """Test injected rate limit errors."""
+    mock_api = MockHomeConnect.create(
+        1, faults=FaultInjection(rate_limit_rate=1, retry_after=5)
+    )
+    async with AsyncClient(transport=mock_api) as httpx_client:
+        client = Client(AuthClient(httpx_client, "https://example.com"))
+        with pytest.raises(TooManyRequestsError) as exc_info:
+            await client.get_home_appliances()
+
+    assert exc_info.value.retry_after == 5
+    assert mock_api.fault_count == 1
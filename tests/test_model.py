@@ -1,8 +1,25 @@
 """Tests for the model module."""
 
+import json
+import logging
+
+from httpx_sse import ServerSentEvent
 import pytest
 
-from aiohomeconnect.model import EventKey, OptionKey, ProgramKey, SettingKey, StatusKey
+from aiohomeconnect.model import (
+    Event,
+    EventKey,
+    EventMessage,
+    EventType,
+    LazyEventMessage,
+    Option,
+    OptionKey,
+    Program,
+    ProgramKey,
+    SettingKey,
+    Status,
+    StatusKey,
+)
 
 
 def test_unknown_enum_values() -> None:
@@ -79,3 +96,80 @@ async def test_options_settings_status_references_at_events() -> None:
 async def test_mapped_program_keys(str_key: str, expected_enum_key: ProgramKey) -> None:
     """Test that the string keys are correctly mapped to the enum keys."""
     assert ProgramKey(str_key) is expected_enum_key
+
+
+def test_lazy_event_message() -> None:
+    """Test that a lazy event message decodes its items on first access."""
+    data = (
+        '{"items": [{"key": "BSH.Common.Status.DoorState", "level": "hint",'
+        ' "handling": "none", "timestamp": 0,'
+        ' "value": "BSH.Common.EnumType.DoorState.Open"}]}'
+    )
+    sse = ServerSentEvent(EventType.STATUS, data, "ha_id")
+
+    lazy = LazyEventMessage.from_server_sent_event(sse)
+
+    assert lazy.ha_id == "ha_id"
+    assert lazy.type is EventType.STATUS
+    assert lazy.raw_keys == ["BSH.Common.Status.DoorState"]
+    assert "raw_data" in repr(lazy)
+    assert not lazy.is_decoded
+    assert lazy == EventMessage.from_server_sent_event(sse)
+    assert lazy.is_decoded
+    assert lazy.data.items[0].key is EventKey.BSH_COMMON_STATUS_DOOR_STATE
+    materialized = lazy.materialize()
+    assert type(materialized) is EventMessage
+    assert materialized.data is lazy.data
+
+
+def test_event_is_compact() -> None:
+    """Test that events are slotted and share repeated strings."""
+    events = [
+        Event.from_dict(
+            json.loads(
+                '{"key": "BSH.Common.Status.DoorState", "level": "hint",'
+                ' "handling": "none", "timestamp": 0, "value": null}'
+            )
+        )
+        for _ in range(2)
+    ]
+
+    assert not hasattr(events[0], "__dict__")
+    assert events[0].raw_key is events[1].raw_key
+    assert events[0].level is events[1].level
+    assert events[0].handling is events[1].handling
+
+
+def test_unknown_key_logged_once(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that decoded unknown keys are resolved and logged once."""
+    caplog.set_level(logging.DEBUG)
+    raw_key = "Vendor.Status.LoggedOnce"
+
+    statuses = [Status.from_dict({"key": raw_key, "value": 1}) for _ in range(3)]
+
+    assert [status.key for status in statuses] == [StatusKey.UNKNOWN] * 3
+    assert [status.raw_key for status in statuses] == [raw_key] * 3
+    assert caplog.text.count(f"Unknown status key: {raw_key}") == 1
+    assert (
+        Status.from_dict({"key": "BSH.Common.Status.DoorState", "value": 1}).key
+        is StatusKey.BSH_COMMON_DOOR_STATE
+    )
+
+
+def test_program_raw_keys() -> None:
+    """Test that programs and options keep their raw key without changing them."""
+    raw_key = "Vendor.Dishwasher.Option.Unknown"
+    option = Option.from_dict({"key": raw_key, "value": 5})
+    program = Program.from_dict(
+        {
+            "key": ProgramKey.DISHCARE_DISHWASHER_ECO_50.value,
+            "options": [{"key": raw_key, "value": 5}],
+        }
+    )
+
+    assert option.raw_key == raw_key
+    assert option == Option(OptionKey.UNKNOWN, 5)
+    assert json.loads(option.to_json()) == {"key": OptionKey.UNKNOWN, "value": 5}
+    assert program == Program(ProgramKey.DISHCARE_DISHWASHER_ECO_50, options=[option])
+    assert program.raw_key == ProgramKey.DISHCARE_DISHWASHER_ECO_50.value
+    assert Option(OptionKey.BSH_COMMON_DURATION, 5, "Duration").name == "Duration"
@@ -0,0 +1,108 @@
+"""Test the program definition cache."""
+
+from pathlib import Path
+
+from httpx import AsyncClient
+import pytest
+from pytest_httpx import HTTPXMock
+
+from aiohomeconnect.client import Client
+from aiohomeconnect.model import Language, ProgramKey
+from aiohomeconnect.program_cache import ApplianceModel, ProgramDefinitionCache
+
+from .test_client import TEST_HA_ID, AuthClient
+
+PROGRAM_KEY = ProgramKey.DISHCARE_DISHWASHER_ECO_50
+MODEL = ApplianceModel("HCS02DWH1", "SN53ES02AE/03")
+PROGRAM_DATA = {
+    "key": PROGRAM_KEY.value,
+    "options": [
+        {
+            "key": "BSH.Common.Option.StartInRelative",
+            "type": "Int",
+            "unit": "seconds",
+            "constraints": {"min": 0, "max": 86340, "stepsize": 60},
+        }
+    ],
+}
+
+
+def list_files(directory: Path) -> list[str]:
+    """Return the names of the files in a directory."""
+    return [path.name for path in directory.iterdir()]
+
+
+async def test_persist_program_definitions(tmp_path: Path) -> None:
+    """Test that program definitions survive a new cache instance."""
+    cache = ProgramDefinitionCache(tmp_path)
+    assert await cache.get(MODEL, Language.EN, PROGRAM_KEY) is None
+    await cache.set(MODEL, Language.EN, PROGRAM_KEY, PROGRAM_DATA)
+
+    new_cache = ProgramDefinitionCache(tmp_path)
+    assert await new_cache.get(MODEL, Language.EN, PROGRAM_KEY) == PROGRAM_DATA
+    assert await new_cache.get(MODEL, Language.DE, PROGRAM_KEY) is None
+    assert await new_cache.get(MODEL, None, PROGRAM_KEY) is None
+    assert list_files(tmp_path) == ["HCS02DWH1_SN53ES02AE_03_en-US.json"]
+
+    await new_cache.clear()
+    assert await new_cache.get(MODEL, Language.EN, PROGRAM_KEY) is None
+    assert not list_files(tmp_path)
+
+
+@pytest.mark.parametrize(
+    "content", [b"not json", b"[]", b'{"version": 0, "programs": {}}']
+)
+async def test_invalid_file(tmp_path: Path, content: bytes) -> None:
+    """Test that invalid files are ignored."""
+    (tmp_path / "HCS02DWH1_SN53ES02AE_03_en-US.json").write_bytes(content)
+    cache = ProgramDefinitionCache(tmp_path)
+
+    assert await cache.get(MODEL, Language.EN, PROGRAM_KEY) is None
+
+
+async def test_client_program_definition_cache(
+    tmp_path: Path, httpx_client: AsyncClient, httpx_mock: HTTPXMock
+) -> None:
+    """Test that the client reuses stored program definitions after a restart."""
+    httpx_mock.add_response(
+        url=f"https://example.com/api/homeappliances/{TEST_HA_ID}",
+        json={
+            "data": {
+                "haId": TEST_HA_ID,
+                "name": "Dishwasher",
+                "type": "Dishwasher",
+                "brand": "SIEMENS",
+                "vib": MODEL.vib,
+                "enumber": MODEL.e_number,
+                "connected": True,
+            }
+        },
+        is_reusable=True,
+    )
+    httpx_mock.add_response(
+        url=(
+            f"https://example.com/api/homeappliances/{TEST_HA_ID}"
+            f"/programs/available/{PROGRAM_KEY}"
+        ),
+        json={"data": PROGRAM_DATA},
+    )
+    auth = AuthClient(httpx_client, "https://example.com")
+
+    client = Client(auth, program_definition_cache=ProgramDefinitionCache(tmp_path))
+    await client.get_specific_appliance(TEST_HA_ID)
+    definition = await client.get_available_program(TEST_HA_ID, program_key=PROGRAM_KEY)
+
+    restarted_client = Client(
+        auth, program_definition_cache=ProgramDefinitionCache(tmp_path)
+    )
+    await restarted_client.get_specific_appliance(TEST_HA_ID)
+    assert (
+        await restarted_client.get_available_program(
+            TEST_HA_ID, program_key=PROGRAM_KEY
+        )
+        == definition
+    )
+    assert definition.options
+    assert definition.options[0].constraints
+    assert definition.options[0].constraints.step_size == 60
+    assert len(httpx_mock.get_requests()) == 3
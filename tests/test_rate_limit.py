@@ -0,0 +1,134 @@
+"""Test the rate limiter."""
+
+from unittest.mock import patch
+
+from httpx import AsyncClient, codes
+import pytest
+from pytest_httpx import HTTPXMock
+
+from aiohomeconnect.client import Client
+from aiohomeconnect.model.error import TooManyRequestsError
+from aiohomeconnect.rate_limit import (
+    EndpointClass,
+    RateLimit,
+    RateLimiter,
+    TokenBucket,
+    classify_request,
+)
+
+from .test_client import TEST_HA_ID, AuthClient
+
+
+class FakeClock:
+    """Represent a manually advanced clock."""
+
+    def __init__(self) -> None:
+        """Initialize the clock."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@pytest.mark.parametrize(
+    ("method", "url", "expected"),
+    [
+        ("GET", "/homeappliances", (None, EndpointClass.READ)),
+        ("GET", "/homeappliances/events", (None, EndpointClass.EVENT_STREAM)),
+        (
+            "GET",
+            f"/homeappliances/{TEST_HA_ID}/events",
+            (TEST_HA_ID, EndpointClass.EVENT_STREAM),
+        ),
+        (
+            "GET",
+            f"/homeappliances/{TEST_HA_ID}/status",
+            (TEST_HA_ID, EndpointClass.READ),
+        ),
+        (
+            "PUT",
+            f"/homeappliances/{TEST_HA_ID}/programs/active",
+            (TEST_HA_ID, EndpointClass.PROGRAM_START),
+        ),
+        (
+            "DELETE",
+            f"/homeappliances/{TEST_HA_ID}/programs/active",
+            (TEST_HA_ID, EndpointClass.WRITE),
+        ),
+    ],
+)
+def test_classify_request(
+    method: str, url: str, expected: tuple[str | None, EndpointClass]
+) -> None:
+    """Test that requests are classified by appliance and endpoint class."""
+    assert classify_request(method, url) == expected
+
+
+def test_token_bucket() -> None:
+    """Test that the bucket allows a burst and then spaces requests."""
+    clock = FakeClock()
+    bucket = TokenBucket(RateLimit(60, 60, burst=2), clock)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(1)
+    assert bucket.reserve() == pytest.approx(2)
+
+    clock.now = 10
+    assert bucket.reserve() == 0
+
+
+def test_separate_budgets() -> None:
+    """Test that appliances and endpoint classes have separate budgets."""
+    clock = FakeClock()
+    rate_limiter = RateLimiter(
+        account=None,
+        appliance=RateLimit(1, 10),
+        endpoints={EndpointClass.PROGRAM_START: RateLimit(1, 60)},
+        clock=clock,
+    )
+    status_url = f"/homeappliances/{TEST_HA_ID}/status"
+
+    assert rate_limiter.reserve("GET", status_url) == 0
+    assert rate_limiter.reserve("GET", status_url) == pytest.approx(10)
+    assert rate_limiter.reserve("GET", "/homeappliances/other/status") == 0
+
+    clock.now = 100
+    program_url = "/homeappliances/other/programs/active"
+    assert rate_limiter.reserve("PUT", program_url) == 0
+    clock.now = 110
+    assert rate_limiter.reserve("PUT", program_url) == pytest.approx(50)
+
+
+async def test_pause_after_too_many_requests(
+    httpx_client: AsyncClient, httpx_mock: HTTPXMock
+) -> None:
+    """Test that requests are held after a rate limit response."""
+    httpx_mock.add_response(
+        url="https://example.com/api/homeappliances",
+        status_code=codes.TOO_MANY_REQUESTS,
+        json={
+            "error": {"key": "some_error_key", "description": "some_error_description"}
+        },
+        headers={"Retry-After": "30"},
+    )
+    httpx_mock.add_response(
+        url="https://example.com/api/homeappliances",
+        json={"data": {"homeappliances": []}},
+    )
+    clock = FakeClock()
+    rate_limiter = RateLimiter(clock=clock)
+    client = Client(
+        AuthClient(httpx_client, "https://example.com", rate_limiter=rate_limiter)
+    )
+
+    with pytest.raises(TooManyRequestsError):
+        await client.get_home_appliances()
+
+    with patch("aiohomeconnect.rate_limit.asyncio.sleep") as sleep:
+        await client.get_home_appliances()
+
+    sleep.assert_awaited_once()
+    assert sleep.await_args
+    assert sleep.await_args.args[0] >= 30
@@ -0,0 +1,112 @@
+"""Test the retry policy."""
+
+from unittest.mock import patch
+
+from httpx import AsyncClient, RequestError, codes
+import pytest
+from pytest_httpx import HTTPXMock
+
+from aiohomeconnect.client import Client
+from aiohomeconnect.model import SettingKey
+from aiohomeconnect.model.error import (
+    ConflictError,
+    HomeConnectError,
+    HomeConnectRequestError,
+    InternalServerError,
+    TooManyRequestsError,
+)
+from aiohomeconnect.retry import RetryPolicy
+
+from .test_client import TEST_HA_ID, AuthClient
+
+ERROR_BODY = {
+    "error": {"key": "some_error_key", "description": "some_error_description"}
+}
+
+
+@pytest.mark.parametrize(
+    ("method", "error", "attempt", "retry_put", "expected"),
+    [
+        ("GET", TooManyRequestsError("key"), 0, False, True),
+        ("GET", InternalServerError("key"), 1, False, True),
+        ("GET", HomeConnectRequestError("error"), 0, False, True),
+        ("GET", InternalServerError("key"), 2, False, False),
+        ("GET", ConflictError("key"), 0, False, False),
+        ("PUT", InternalServerError("key"), 0, False, False),
+        ("PUT", InternalServerError("key"), 0, True, True),
+        ("DELETE", InternalServerError("key"), 0, True, False),
+    ],
+)
+def test_should_retry(
+    method: str,
+    error: HomeConnectError,
+    attempt: int,
+    retry_put: bool,
+    expected: bool,
+) -> None:
+    """Test which failures are retried."""
+    policy = RetryPolicy(max_attempts=3, retry_put=retry_put)
+
+    assert policy.should_retry(method, error, attempt) is expected
+
+
+def test_delay() -> None:
+    """Test that the delay honors Retry-After and caps the backoff."""
+    policy = RetryPolicy(base_delay=1, max_delay=4)
+
+    with patch("aiohomeconnect.retry.random.uniform", side_effect=max) as uniform:
+        assert policy.delay(InternalServerError("key"), 5) == 4
+        assert policy.delay(TooManyRequestsError("key", retry_after=10), 0) == 11
+
+    assert uniform.call_count == 2
+
+
+async def test_client_retries_get(
+    httpx_client: AsyncClient, httpx_mock: HTTPXMock
+) -> None:
+    """Test that the client retries failed GET requests."""
+    url = "https://example.com/api/homeappliances"
+    httpx_mock.add_response(
+        url=url,
+        status_code=codes.TOO_MANY_REQUESTS,
+        json=ERROR_BODY,
+        headers={"Retry-After": "2"},
+    )
+    httpx_mock.add_exception(RequestError("some error"), url=url)
+    httpx_mock.add_response(url=url, json={"data": {"homeappliances": []}})
+    client = Client(
+        AuthClient(httpx_client, "https://example.com"),
+        retry_policy=RetryPolicy(max_attempts=3),
+    )
+
+    with patch("aiohomeconnect.client.asyncio.sleep") as sleep:
+        appliances = await client.get_home_appliances()
+
+    assert appliances.homeappliances == []
+    assert sleep.await_count == 2
+    assert sleep.await_args_list[0].args[0] >= 2
+
+
+async def test_client_does_not_retry_put_by_default(
+    httpx_client: AsyncClient, httpx_mock: HTTPXMock
+) -> None:
+    """Test that PUT requests are not retried unless opted in."""
+    setting_key = SettingKey.BSH_COMMON_POWER_STATE
+    httpx_mock.add_response(
+        method="PUT",
+        url=f"https://example.com/api/homeappliances/{TEST_HA_ID}/settings/{setting_key}",
+        status_code=codes.INTERNAL_SERVER_ERROR,
+        json=ERROR_BODY,
+    )
+    client = Client(
+        AuthClient(httpx_client, "https://example.com"),
+        retry_policy=RetryPolicy(),
+    )
+
+    with (
+        patch("aiohomeconnect.client.asyncio.sleep") as sleep,
+        pytest.raises(InternalServerError),
+    ):
+        await client.set_setting(TEST_HA_ID, setting_key=setting_key, value="value")
+
+    sleep.assert_not_awaited()
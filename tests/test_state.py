@@ -0,0 +1,264 @@
+"""Test the appliance state store."""
+
+from httpx import AsyncClient
+from pytest_httpx import HTTPXMock
+
+from aiohomeconnect.client import Client
+from aiohomeconnect.model import (
+    ArrayOfEvents,
+    Event,
+    EventKey,
+    EventMessage,
+    EventType,
+    HomeAppliance,
+    OptionKey,
+    ProgramKey,
+    SettingKey,
+    StatusKey,
+)
+from aiohomeconnect.state import ApplianceStateStore
+
+from .test_client import OTHER_HA_ID, TEST_APPLIANCE, TEST_HA_ID, AuthClient
+
+BASE_URL = f"https://example.com/api/homeappliances/{TEST_HA_ID}"
+OTHER_APPLIANCE = TEST_APPLIANCE | {"haId": OTHER_HA_ID, "connected": False}
+
+
+def make_event(key: EventKey, value: str | int | bool | None) -> Event:
+    """Return an event item."""
+    return Event(
+        key=key,
+        raw_key=key.value,
+        timestamp=0,
+        level="hint",
+        handling="none",
+        value=value,
+    )
+
+
+def add_state_responses(httpx_mock: HTTPXMock) -> None:
+    """Add the responses used to fetch the state of the test appliance."""
+    httpx_mock.add_response(
+        url=f"{BASE_URL}/status",
+        json={
+            "data": {
+                "status": [
+                    {
+                        "key": StatusKey.BSH_COMMON_DOOR_STATE.value,
+                        "value": "BSH.Common.EnumType.DoorState.Closed",
+                    }
+                ]
+            }
+        },
+    )
+    httpx_mock.add_response(
+        url=f"{BASE_URL}/settings",
+        json={
+            "data": {
+                "settings": [
+                    {
+                        "key": SettingKey.BSH_COMMON_POWER_STATE.value,
+                        "value": "BSH.Common.EnumType.PowerState.On",
+                    }
+                ]
+            }
+        },
+    )
+    httpx_mock.add_response(
+        url=f"{BASE_URL}/programs/active",
+        status_code=404,
+        json={"error": {"key": "SDK.Error.NoProgramActive"}},
+    )
+    httpx_mock.add_response(
+        url=f"{BASE_URL}/programs/selected",
+        json={
+            "data": {
+                "key": ProgramKey.DISHCARE_DISHWASHER_ECO_50.value,
+                "options": [
+                    {
+                        "key": OptionKey.DISHCARE_DISHWASHER_HALF_LOAD.value,
+                        "value": False,
+                    }
+                ],
+            }
+        },
+    )
+
+
+async def test_state_store(httpx_client: AsyncClient, httpx_mock: HTTPXMock) -> None:
+    """Test bootstrapping the store and applying events."""
+    httpx_mock.add_response(
+        url="https://example.com/api/homeappliances",
+        json={"data": {"homeappliances": [TEST_APPLIANCE, OTHER_APPLIANCE]}},
+    )
+    add_state_responses(httpx_mock)
+    store = ApplianceStateStore(Client(AuthClient(httpx_client, "https://example.com")))
+
+    await store.bootstrap()
+
+    assert len(store) == 2
+    state = store[TEST_HA_ID]
+    assert state.connected
+    assert state.status == {
+        StatusKey.BSH_COMMON_DOOR_STATE: "BSH.Common.EnumType.DoorState.Closed"
+    }
+    assert state.settings == {
+        SettingKey.BSH_COMMON_POWER_STATE: "BSH.Common.EnumType.PowerState.On"
+    }
+    assert state.options == {OptionKey.DISHCARE_DISHWASHER_HALF_LOAD: False}
+    assert state.active_program is None
+    assert state.selected_program == ProgramKey.DISHCARE_DISHWASHER_ECO_50
+    other_state = store.get(OTHER_HA_ID)
+    assert other_state is not None
+    assert not other_state.connected
+    assert not other_state.status
+
+    for event_message in (
+        EventMessage(
+            TEST_HA_ID,
+            EventType.STATUS,
+            ArrayOfEvents(
+                [
+                    make_event(
+                        EventKey.BSH_COMMON_STATUS_DOOR_STATE,
+                        "BSH.Common.EnumType.DoorState.Open",
+                    )
+                ]
+            ),
+        ),
+        EventMessage(
+            TEST_HA_ID,
+            EventType.NOTIFY,
+            ArrayOfEvents(
+                [
+                    make_event(
+                        EventKey.BSH_COMMON_ROOT_ACTIVE_PROGRAM,
+                        ProgramKey.DISHCARE_DISHWASHER_ECO_50.value,
+                    ),
+                    make_event(
+                        EventKey.DISHCARE_DISHWASHER_OPTION_HALF_LOAD, value=True
+                    ),
+                    make_event(
+                        EventKey.BSH_COMMON_SETTING_POWER_STATE,
+                        "BSH.Common.EnumType.PowerState.Standby",
+                    ),
+                ]
+            ),
+        ),
+        EventMessage(
+            TEST_HA_ID,
+            EventType.EVENT,
+            ArrayOfEvents(
+                [
+                    make_event(
+                        EventKey.BSH_COMMON_EVENT_PROGRAM_FINISHED,
+                        "BSH.Common.EnumType.EventPresentState.Present",
+                    )
+                ]
+            ),
+        ),
+        EventMessage(TEST_HA_ID, EventType.DISCONNECTED, ArrayOfEvents([])),
+        EventMessage(OTHER_HA_ID, EventType.DEPAIRED, ArrayOfEvents([])),
+    ):
+        await store.handle_event(event_message)
+
+    assert not state.connected
+    assert state.status[StatusKey.BSH_COMMON_DOOR_STATE] == (
+        "BSH.Common.EnumType.DoorState.Open"
+    )
+    assert state.settings[SettingKey.BSH_COMMON_POWER_STATE] == (
+        "BSH.Common.EnumType.PowerState.Standby"
+    )
+    assert state.options[OptionKey.DISHCARE_DISHWASHER_HALF_LOAD] is True
+    assert state.active_program == ProgramKey.DISHCARE_DISHWASHER_ECO_50
+    assert state.events == {
+        EventKey.BSH_COMMON_EVENT_PROGRAM_FINISHED: (
+            "BSH.Common.EnumType.EventPresentState.Present"
+        )
+    }
+    assert OTHER_HA_ID not in store
+    assert len(httpx_mock.get_requests()) == 5
+
+
+async def test_refresh_on_connected(
+    httpx_client: AsyncClient, httpx_mock: HTTPXMock
+) -> None:
+    """Test that a reconnected appliance is fetched again."""
+    httpx_mock.add_response(url=BASE_URL, json={"data": TEST_APPLIANCE})
+    add_state_responses(httpx_mock)
+    store = ApplianceStateStore(Client(AuthClient(httpx_client, "https://example.com")))
+
+    await store.handle_event(
+        EventMessage(TEST_HA_ID, EventType.CONNECTED, ArrayOfEvents([]))
+    )
+
+    assert store[TEST_HA_ID].connected
+    assert store[TEST_HA_ID].selected_program == ProgramKey.DISHCARE_DISHWASHER_ECO_50
+
+
+async def test_refresh_appliance(
+    httpx_client: AsyncClient, httpx_mock: HTTPXMock
+) -> None:
+    """Test that an appliance with known info only fetches its state."""
+    add_state_responses(httpx_mock)
+    store = ApplianceStateStore(Client(AuthClient(httpx_client, "https://example.com")))
+
+    state = await store.refresh_appliance(HomeAppliance.from_dict(TEST_APPLIANCE))
+
+    assert store[TEST_HA_ID] is state
+    assert state.selected_program == ProgramKey.DISHCARE_DISHWASHER_ECO_50
+    assert len(httpx_mock.get_requests()) == 4
+
+
+async def test_unknown_keys(httpx_client: AsyncClient, httpx_mock: HTTPXMock) -> None:
+    """Test that unknown keys are stored under their raw key."""
+    unknown_program = "Vendor.Dishwasher.Program.Unknown"
+    unknown_option = "Vendor.Dishwasher.Option.Unknown"
+    httpx_mock.add_response(url=BASE_URL, json={"data": TEST_APPLIANCE})
+    httpx_mock.add_response(url=f"{BASE_URL}/status", json={"data": {"status": []}})
+    httpx_mock.add_response(url=f"{BASE_URL}/settings", json={"data": {"settings": []}})
+    httpx_mock.add_response(
+        url=f"{BASE_URL}/programs/active",
+        json={
+            "data": {
+                "key": unknown_program,
+                "options": [
+                    {"key": unknown_option, "value": 1},
+                    {"key": "Vendor.Dishwasher.Option.Other", "value": 2},
+                ],
+            }
+        },
+    )
+    httpx_mock.add_response(
+        url=f"{BASE_URL}/programs/selected",
+        status_code=404,
+        json={"error": {"key": "SDK.Error.NoProgramSelected"}},
+    )
+    store = ApplianceStateStore(Client(AuthClient(httpx_client, "https://example.com")))
+
+    await store.refresh(TEST_HA_ID)
+    state = store[TEST_HA_ID]
+
+    assert state.active_program == unknown_program
+    assert state.options == {unknown_option: 1, "Vendor.Dishwasher.Option.Other": 2}
+
+    state.apply_event(
+        EventMessage(
+            TEST_HA_ID,
+            EventType.NOTIFY,
+            ArrayOfEvents(
+                [
+                    Event(
+                        key=EventKey.UNKNOWN,
+                        raw_key=unknown_option,
+                        timestamp=0,
+                        level="hint",
+                        handling="none",
+                        value=3,
+                    )
+                ]
+            ),
+        )
+    )
+
+    assert state.options == {unknown_option: 3, "Vendor.Dishwasher.Option.Other": 2}
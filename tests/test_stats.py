@@ -0,0 +1,108 @@
+"""Test the request statistics."""
+
+from httpx import AsyncClient, codes
+import pytest
+from pytest_httpx import HTTPXMock
+
+from aiohomeconnect.client import Client
+from aiohomeconnect.model.error import TooManyRequestsError
+from aiohomeconnect.stats import ClientStats, LatencyHistogram, QuotaWindow
+
+from .test_client import TEST_HA_ID, AuthClient
+
+
+class FakeClock:
+    """Represent a manually advanced clock."""
+
+    def __init__(self) -> None:
+        """Initialize the clock."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+def test_latency_histogram() -> None:
+    """Test the percentiles of the latency histogram."""
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50) == 0
+    assert histogram.mean == 0
+
+    for millis in range(1, 101):
+        histogram.record(millis / 1000)
+
+    assert histogram.count == 100
+    assert histogram.min == 0.001
+    assert histogram.max == 0.1
+    assert histogram.mean == pytest.approx(0.0505)
+    assert histogram.percentile(50) == pytest.approx(0.050, rel=0.01)
+    assert histogram.percentile(99) == pytest.approx(0.099, rel=0.01)
+    assert histogram.percentile(100) == 0.1
+    assert histogram.percentile(0) == pytest.approx(0.001, rel=0.01)
+
+
+def test_quota_window() -> None:
+    """Test that requests leave the quota window after a day."""
+    clock = FakeClock()
+    quota = QuotaWindow(limit=10, clock=clock)
+
+    quota.add()
+    clock.now = 3600
+    quota.add()
+    quota.add()
+    assert quota.used == 3
+
+    clock.now = 86400
+    assert quota.used == 2
+
+    clock.now = 86400 + 3600
+    assert quota.used == 0
+
+
+def test_snapshot() -> None:
+    """Test the snapshot of the statistics."""
+    stats = ClientStats(daily_quota=4, clock=FakeClock())
+    endpoint = "/homeappliances/{haId}/status"
+    stats.record(endpoint, codes.OK, 0.2)
+    stats.record(endpoint, codes.TOO_MANY_REQUESTS, 0.1)
+    stats.record("/homeappliances", codes.OK, 0.3)
+    stats.record("/homeappliances", codes.OK, 0.3)
+    stats.record("/homeappliances", codes.OK, 0.3)
+
+    snapshot = stats.snapshot()
+
+    assert snapshot.requests == 5
+    assert snapshot.too_many_requests == 1
+    assert snapshot.endpoints[endpoint].requests == 2
+    assert snapshot.endpoints[endpoint].too_many_requests == 1
+    assert snapshot.endpoints[endpoint].max == 0.2
+    assert snapshot.quota.used == 5
+    assert snapshot.quota.remaining == 0
+    assert snapshot.quota.usage == 1.25
+
+
+async def test_client_stats(httpx_client: AsyncClient, httpx_mock: HTTPXMock) -> None:
+    """Test that the client records the responses."""
+    httpx_mock.add_response(
+        url=f"https://example.com/api/homeappliances/{TEST_HA_ID}/status",
+        json={"data": {"status": []}},
+    )
+    httpx_mock.add_response(
+        url=f"https://example.com/api/homeappliances/{TEST_HA_ID}/settings",
+        status_code=codes.TOO_MANY_REQUESTS,
+        json={"error": {"key": "429", "description": "Too many requests"}},
+    )
+    client = Client(AuthClient(httpx_client, "https://example.com"))
+
+    await client.get_status(TEST_HA_ID)
+    with pytest.raises(TooManyRequestsError):
+        await client.get_settings(TEST_HA_ID)
+
+    snapshot = client.stats_snapshot()
+    assert snapshot.requests == 2
+    assert snapshot.quota.used == 2
+    assert snapshot.too_many_requests == 1
+    assert snapshot.endpoints["/homeappliances/{haId}/settings"].too_many_requests
+    assert not snapshot.endpoints["/homeappliances/{haId}/status"].too_many_requests
+    assert client.stats is client.stats
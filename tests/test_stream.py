@@ -0,0 +1,168 @@
+"""Test the supervised event stream."""
+
+from httpx import AsyncClient, ReadTimeout, Request, Response
+import pytest
+from pytest_httpx import HTTPXMock, IteratorStream
+
+from aiohomeconnect.client import Client
+from aiohomeconnect.model import (
+    ArrayOfHomeAppliances,
+    EventMessage,
+    EventType,
+    HomeAppliance,
+)
+from aiohomeconnect.model.error import HomeConnectApiError, TooManyRequestsError
+from aiohomeconnect.stream import ReconnectPolicy, SupervisedEventStream
+
+from .test_client import TEST_APPLIANCE, AuthClient
+from .test_stats import FakeClock
+
+EVENTS_URL = "https://example.com/api/homeappliances/events"
+APPLIANCES_URL = "https://example.com/api/homeappliances"
+
+
+def appliances_response(appliances: dict[str, bool]) -> dict:
+    """Return a home appliances response with the connection states."""
+    return {
+        "data": {
+            "homeappliances": [
+                TEST_APPLIANCE | {"haId": ha_id, "connected": connected}
+                for ha_id, connected in appliances.items()
+            ]
+        }
+    }
+
+
+def add_event_stream(httpx_mock: HTTPXMock, ha_id: str) -> None:
+    """Add an event stream response with one status message."""
+    httpx_mock.add_response(
+        url=EVENTS_URL,
+        stream=IteratorStream(
+            [
+                "\n".join(
+                    [
+                        f"id: {ha_id}",
+                        "data: ",
+                        f"event: {EventType.STATUS}",
+                        "\n",
+                    ]
+                ).encode()
+            ]
+        ),
+        headers={"Content-Type": "text/event-stream"},
+    )
+
+
+async def test_reconnect_and_resync(
+    httpx_client: AsyncClient, httpx_mock: HTTPXMock
+) -> None:
+    """Test that the stream reconnects and resyncs after gaps."""
+    httpx_mock.add_exception(ReadTimeout("timeout"), url=EVENTS_URL)
+    httpx_mock.add_response(
+        url=APPLIANCES_URL, json=appliances_response({"A": True, "B": True})
+    )
+    add_event_stream(httpx_mock, "A")
+    httpx_mock.add_response(
+        url=APPLIANCES_URL,
+        json=appliances_response({"A": True, "C": False, "D": True}),
+    )
+    resynced: list[str] = []
+
+    async def resync(appliance: HomeAppliance) -> None:
+        """Record the resynced appliance."""
+        resynced.append(appliance.ha_id)
+
+    stream = SupervisedEventStream(
+        Client(AuthClient(httpx_client, "https://example.com")),
+        policy=ReconnectPolicy(base_delay=0),
+        resync=resync,
+        max_concurrent_resyncs=1,
+    )
+
+    messages: list[EventMessage] = []
+    async for event_message in stream:
+        messages.append(event_message)
+        if len(messages) == 4:
+            break
+
+    assert [(message.ha_id, message.type) for message in messages] == [
+        ("A", EventType.STATUS),
+        ("B", EventType.DEPAIRED),
+        ("C", EventType.PAIRED),
+        ("D", EventType.PAIRED),
+    ]
+    # Nothing is known before the first gap, so all connected appliances are
+    # resynced. After the second gap only the appliance that stayed connected.
+    assert resynced == ["A", "B", "A"]
+    assert set(stream.last_event_at) == {"A"}
+
+
+async def test_resync_active_appliances(
+    httpx_client: AsyncClient, httpx_mock: HTTPXMock
+) -> None:
+    """Test that short gaps only resync the appliances that sent events."""
+    clock = FakeClock()
+    appliances = appliances_response({"A": True, "B": True, "C": True})
+
+    def long_gap(_: Request) -> Response:
+        """Return the appliances after a long gap."""
+        clock.now += 600
+        return Response(200, json=appliances)
+
+    add_event_stream(httpx_mock, "A")
+    httpx_mock.add_response(url=APPLIANCES_URL, json=appliances)
+    add_event_stream(httpx_mock, "B")
+    httpx_mock.add_callback(long_gap, url=APPLIANCES_URL)
+    add_event_stream(httpx_mock, "C")
+    resynced: list[str] = []
+
+    async def resync(appliance: HomeAppliance) -> None:
+        """Record the resynced appliance."""
+        resynced.append(appliance.ha_id)
+
+    stream = SupervisedEventStream(
+        Client(AuthClient(httpx_client, "https://example.com")),
+        policy=ReconnectPolicy(base_delay=0),
+        appliances=ArrayOfHomeAppliances.from_dict(appliances["data"]).homeappliances,
+        resync=resync,
+        max_concurrent_resyncs=1,
+        clock=clock,
+    )
+
+    messages: list[EventMessage] = []
+    async for event_message in stream:
+        messages.append(event_message)
+        if len(messages) == 3:
+            break
+
+    assert [message.ha_id for message in messages] == ["A", "B", "C"]
+    # After the short gap only the appliance that sent an event is resynced.
+    # The long gap resyncs all appliances that stayed connected.
+    assert resynced == ["A", "A", "B", "C"]
+
+
+def test_reconnect_delay() -> None:
+    """Test the reconnect delay honors Retry-After and is capped."""
+    policy = ReconnectPolicy(base_delay=1, max_delay=4)
+
+    assert 0 <= policy.delay(None, 0) <= 1
+    assert 0 <= policy.delay(None, 10) <= 4
+    assert 30 <= policy.delay(TooManyRequestsError("429", retry_after=30), 0) <= 31
+
+
+@pytest.mark.parametrize("status_code", [401, 403])
+async def test_fatal_error(
+    httpx_client: AsyncClient, httpx_mock: HTTPXMock, status_code: int
+) -> None:
+    """Test that non transient errors end the stream."""
+    httpx_mock.add_response(
+        url=EVENTS_URL,
+        status_code=status_code,
+        json={"error": {"key": "error"}},
+    )
+    stream = SupervisedEventStream(
+        Client(AuthClient(httpx_client, "https://example.com"))
+    )
+
+    with pytest.raises(HomeConnectApiError):
+        await anext(aiter(stream))
@@ -0,0 +1,166 @@
+"""Test the per appliance write queue."""
+
+import asyncio
+import json
+
+from httpx import AsyncClient, Request, Response
+import pytest
+from pytest_httpx import HTTPXMock
+
+from aiohomeconnect.client import Client
+from aiohomeconnect.model import ProgramKey, SettingKey
+from aiohomeconnect.model.error import InternalServerError
+from aiohomeconnect.write_queue import WriteQueue
+
+from .test_client import OTHER_HA_ID, TEST_HA_ID, AuthClient
+
+SETTINGS_PATH = f"/homeappliances/{TEST_HA_ID}/settings"
+CHILD_LOCK_PATH = f"{SETTINGS_PATH}/{SettingKey.BSH_COMMON_CHILD_LOCK}"
+POWER_STATE_PATH = f"{SETTINGS_PATH}/{SettingKey.BSH_COMMON_POWER_STATE}"
+ACTIVE_PROGRAM_PATH = f"/homeappliances/{TEST_HA_ID}/programs/active"
+
+
+async def test_write_queue(httpx_client: AsyncClient, httpx_mock: HTTPXMock) -> None:
+    """Test that writes are ordered per appliance and merged per key."""
+    sent: list[tuple[str, str, object]] = []
+    in_flight: dict[str, int] = {}
+    max_in_flight = 0
+
+    async def respond(request: Request) -> Response:
+        """Record the write while letting other requests start."""
+        nonlocal max_in_flight
+        ha_id = request.url.path.split("/")[3]
+        in_flight[ha_id] = in_flight.get(ha_id, 0) + 1
+        assert in_flight[ha_id] == 1
+        max_in_flight = max(max_in_flight, sum(in_flight.values()))
+        await asyncio.sleep(0)
+        in_flight[ha_id] -= 1
+        sent.append(
+            (
+                ha_id,
+                request.url.path.rsplit("/", 1)[-1],
+                json.loads(request.content)["data"].get("value"),
+            )
+        )
+        return Response(204)
+
+    httpx_mock.add_callback(respond, is_reusable=True)
+    client = Client(
+        AuthClient(httpx_client, "https://example.com"), serialize_writes=True
+    )
+    child_lock = SettingKey.BSH_COMMON_CHILD_LOCK
+
+    await asyncio.gather(
+        client.set_setting(TEST_HA_ID, setting_key=child_lock, value=False),
+        client.start_program(
+            TEST_HA_ID, program_key=ProgramKey.DISHCARE_DISHWASHER_ECO_50
+        ),
+        client.set_setting(TEST_HA_ID, setting_key=child_lock, value=False),
+        client.set_setting(
+            TEST_HA_ID,
+            setting_key=SettingKey.BSH_COMMON_POWER_STATE,
+            value="BSH.Common.EnumType.PowerState.On",
+        ),
+        client.set_setting(TEST_HA_ID, setting_key=child_lock, value=True),
+        client.set_setting(OTHER_HA_ID, setting_key=child_lock, value=True),
+    )
+
+    assert client.write_queue is not None
+    assert client.write_queue.merged == 1
+    assert client.write_queue.pending(TEST_HA_ID) == 0
+    assert max_in_flight == 2
+    assert [item[1:] for item in sent if item[0] == TEST_HA_ID] == [
+        (child_lock, False),
+        ("active", None),
+        (child_lock, True),
+        (SettingKey.BSH_COMMON_POWER_STATE, "BSH.Common.EnumType.PowerState.On"),
+    ]
+    assert (OTHER_HA_ID, child_lock, True) in sent
+
+
+async def test_write_queue_error() -> None:
+    """Test that a failed write raises the error to all merged callers."""
+    queue = WriteQueue()
+    release = asyncio.Event()
+    sent: list[str] = []
+
+    async def block() -> None:
+        """Hold the queue until released."""
+        await release.wait()
+
+    async def write(name: str) -> None:
+        """Record the write and fail it."""
+        sent.append(name)
+        raise InternalServerError(name)
+
+    first = asyncio.create_task(
+        queue.submit(TEST_HA_ID, "PUT", POWER_STATE_PATH, block)
+    )
+    callers = [
+        asyncio.create_task(
+            queue.submit(
+                TEST_HA_ID, "PUT", CHILD_LOCK_PATH, lambda name=name: write(name)
+            )
+        )
+        for name in ("old", "new")
+    ]
+    await asyncio.sleep(0)
+    assert queue.merged == 1
+    release.set()
+
+    await first
+    for caller in callers:
+        with pytest.raises(InternalServerError, match="new"):
+            await caller
+    assert sent == ["new"]
+    assert queue.pending(TEST_HA_ID) == 0
+
+
+async def test_write_queue_cancelled_caller() -> None:
+    """Test that a cancelled caller leaves the queue and other callers intact."""
+    queue = WriteQueue()
+    release = asyncio.Event()
+    sent: list[str] = []
+
+    async def block() -> str:
+        """Hold the queue until released."""
+        await release.wait()
+        return "power"
+
+    async def write(name: str) -> str:
+        """Record the write."""
+        sent.append(name)
+        return name
+
+    first = asyncio.create_task(
+        queue.submit(TEST_HA_ID, "PUT", POWER_STATE_PATH, block)
+    )
+    cancelled, merged = (
+        asyncio.create_task(
+            queue.submit(
+                TEST_HA_ID, "PUT", CHILD_LOCK_PATH, lambda name=name: write(name)
+            )
+        )
+        for name in ("old", "new")
+    )
+    start = asyncio.create_task(
+        queue.submit(TEST_HA_ID, "PUT", ACTIVE_PROGRAM_PATH, lambda: write("start"))
+    )
+    await asyncio.sleep(0)
+    assert queue.merged == 1
+    cancelled.cancel()
+    release.set()
+
+    assert await first == "power"
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert await merged == "new"
+    assert await start == "start"
+    assert sent == ["new", "start"]
+    assert queue.pending(TEST_HA_ID) == 0
+
+    assert (
+        await queue.submit(TEST_HA_ID, "PUT", CHILD_LOCK_PATH, lambda: write("later"))
+        == "later"
+    )
+    assert sent == ["new", "start", "later"]